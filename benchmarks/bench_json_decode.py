@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Times decoding an expanded page of eventdevices and converting it with
+get_paged_response_from_json, for every available JSON decoder and several
+page sizes.
+
+Usage:
+    python benchmarks/bench_json_decode.py [repeat]
+
+repeat defaults to 200 decodes per page size and decoder.
+"""
+import json
+import sys
+import time
+from podium_api.jsondecode import DECODERS
+from podium_api.transport import decode_result
+from podium_api.types.paged_response import get_paged_response_from_json
+
+PAGE_SIZES = (10, 50, 100)
+
+
+def make_page(size):
+    eventdevices = []
+    for i in range(size):
+        eventdevices.append({
+            'id': i,
+            'URI': '/api/v1/events/1/devices/{}'.format(i),
+            'channels': [{'name': 'Channel{}'.format(c), 'units': 'mph',
+                          'min': 0, 'max': 150, 'sample_rate': 10}
+                         for c in range(40)],
+            'name': 'Car {}'.format(i),
+            'comp_number': str(i),
+            'device_uri': '/api/v1/devices/{}'.format(i),
+            'laps_uri': '/api/v1/events/1/devices/{}/laps'.format(i),
+            'user_uri': '/api/v1/users/{}'.format(i),
+            'event_uri': '/api/v1/events/1',
+            'avatar_url': None,
+            'user_avatar_url': None,
+            'event_title': 'Test Event',
+            'device_id': i,
+            'event_id': 1,
+        })
+    return json.dumps({'eventdevices': eventdevices, 'total': size,
+                       'nextURI': None, 'prevURI': None}).encode('utf-8')
+
+
+def bench(body, decoder, repeat):
+    decode = 0.0
+    convert = 0.0
+    for i in range(repeat):
+        start = time.perf_counter()
+        result = decode_result('application/json', body, decoder)
+        decoded = time.perf_counter()
+        get_paged_response_from_json(result, 'eventdevices')
+        convert += time.perf_counter() - decoded
+        decode += decoded - start
+    return decode / repeat * 1000, convert / repeat * 1000
+
+
+def main(repeat):
+    print('{:>6} {:>8} {:>9} {:>12} {:>12}'.format(
+        'size', 'decoder', 'kbytes', 'decode ms', 'convert ms'))
+    for size in PAGE_SIZES:
+        body = make_page(size)
+        for name, decoder in sorted(DECODERS.items()):
+            decode, convert = bench(body, decoder, repeat)
+            print('{:>6} {:>8} {:>9.1f} {:>12.3f} {:>12.3f}'.format(
+                size, name, len(body) / 1024.0, decode, convert))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Times building the header of an authenticated request, cached per token
+and application, against building it on every call, and the cost of
+preparing a whole racestats POST up to the transport.
+
+Usage:
+    python benchmarks/bench_request_headers.py [repeat]
+
+repeat defaults to 100000 headers and 10000 requests.
+"""
+import sys
+import time
+import podium_api
+from podium_api.asyncreq import get_json_header_token
+from podium_api.racestat import make_racestats_create
+from podium_api.transport import PodiumTransport
+from podium_api.types.token import PodiumToken
+
+
+class NullTransport(PodiumTransport):
+    """
+    Transport that drops every request, so only their preparation is
+    timed.
+    """
+
+    def request(self, url, method="GET", body=None, headers=None,
+                **callbacks):
+        return None
+
+
+def uncached_header(token):
+    if podium_api.PODIUM_APP is None:
+        raise ValueError()
+    return {"Content-Type": "application/x-www-form-urlencoded",
+            "Authorization": "Bearer {}".format(token.token),
+            "Accept": "application/json"}
+
+
+def bench(func, repeat):
+    start = time.perf_counter()
+    for i in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main(repeat):
+    podium_api.register_podium_application('bench_id', 'bench_secret',
+                                           transport=NullTransport())
+    token = PodiumToken('bench_token', 'bearer', 1)
+    racestats = [{'device_id': i, 'comp_number': str(i), 'position_overall': i}
+                 for i in range(10)]
+    print('{:>28} {:>10}'.format('', 'us/call'))
+    print('{:>28} {:>10.3f}'.format('uncached header', bench(
+        lambda: uncached_header(token), repeat)))
+    print('{:>28} {:>10.3f}'.format('get_json_header_token', bench(
+        lambda: get_json_header_token(token), repeat)))
+    print('{:>28} {:>10.3f}'.format('make_racestats_create', bench(
+        lambda: make_racestats_create(token, 1, racestats, partial=True),
+        repeat // 10)))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Compares the memory used by the slotted podium_api.types against the same
+classes backed by a per instance __dict__, as they were before __slots__.
+
+Usage:
+    python benchmarks/bench_types_memory.py [count]
+
+count defaults to 1000000 objects per type.
+"""
+import sys
+import tracemalloc
+from podium_api.types.lap import PodiumLap
+from podium_api.types.racestat import Racestat
+
+
+def dict_backed(cls):
+    """
+    Returns a class with the same constructor as cls storing its attributes
+    in a __dict__.
+    """
+    return type('Dict' + cls.__name__, (object,),
+                {'__init__': cls.__init__})
+
+
+def make_lap(cls, i):
+    return cls('/api/v1/events/1/devices/2/laps/{}'.format(i),
+               '/api/v1/events/1/devices/2/laps/{}/data'.format(i),
+               i, 1467000000.0 + i * 90, None, 1.5 + i % 10 * 0.01)
+
+
+def make_racestat(cls, i):
+    return cls(i, '/api/v1/events/1/racestats/{}'.format(i), str(i % 40),
+               'GT', i % 100, 1.5, i % 40, i % 10, str(i % 40 + 1),
+               str(i % 40 - 1), 0.5, 0.7, 0, 0, 1, 0,
+               '/api/v1/events/1/devices/2', '/api/v1/devices/2',
+               '/api/v1/users/3')
+
+
+def measure(factory, cls, count):
+    tracemalloc.start()
+    objects = [factory(cls, i) for i in range(count)]
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size
+
+
+def main(count):
+    print('{} objects per type'.format(count))
+    for factory, cls in ((make_lap, PodiumLap), (make_racestat, Racestat)):
+        old = measure(factory, dict_backed(cls), count)
+        new = measure(factory, cls, count)
+        print('{:<10} __dict__: {:>8.1f} MB  __slots__: {:>8.1f} MB  '
+              'saved: {:.0%}'.format(cls.__name__, old / 2 ** 20,
+                                     new / 2 ** 20, 1 - float(new) / old))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
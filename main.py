@@ -14,6 +14,7 @@ from podium_api.events import (
     make_event_update
     )
 from podium_api.types.token import PodiumToken
+from podium_api.types.identity import slot_names
 from podium_api.api import PodiumAPI
 from plyer import keystore
 from datetime import date
@@ -24,6 +25,10 @@ APP_SECRET = "YOUR_SECRET_HERE"
 class NoStoredToken(Exception):
     pass
 
+
+def attributes(obj):
+    return {name: getattr(obj, name) for name in slot_names(type(obj))}
+
 class PodiumApp(App):
 
     def on_start(self):
@@ -49,8 +54,8 @@ class PodiumApp(App):
     def create_eventdevice_for_event(self):
         event = self.events[0]
         device = self.devices[1]
-        print(event.__dict__)
-        print(device.__dict__)
+        print(attributes(event))
+        print(attributes(device))
         self.podium.eventdevices.create(
             event.event_id, device.device_id, "test name",
             redirect_callback=self.eventdevices_success,
@@ -60,21 +65,21 @@ class PodiumApp(App):
 
 
     def eventdevices_success(self, redirect):
-        print("event device created", redirect.__dict__)
+        print("event device created", attributes(redirect))
 
     def user_success(self, user):
-        print(user.__dict__)
+        print(attributes(user))
         self.user = user
         # self.podium.events.get(endpoint=user.events_uri)
         # make_friendships_get(self.token, user.friendships_uri,
         #                      success_callback=self.friendship_success)
 
     def friendship_success2(self, paged_response):
-        print(paged_response.__dict__)
+        print(attributes(paged_response))
 
     def devices_success(self, paged_response):
         print("devices")
-        print(paged_response.__dict__)
+        print(attributes(paged_response))
         self.devices += paged_response.devices
         if paged_response.next_uri is not None:
             self.podium.devices.list(paged_response.next_uri,
@@ -83,7 +88,7 @@ class PodiumApp(App):
             self.create_eventdevice_for_event()
 
     def friendship_success(self, paged_response):
-        print(paged_response.__dict__)
+        print(attributes(paged_response))
         # make_friendship_delete(self.token, 
         #                        paged_response.users[0].friendship_uri)
         # make_friendships_get(self.token, self.user.friendships_uri,
@@ -119,7 +124,7 @@ class PodiumApp(App):
             )
 
     def device_success(self, device):
-        print(device, device.__dict__)
+        print(device, attributes(device))
         self.podium.devices.update(
             device.uri,
             name="new name",
@@ -146,7 +151,7 @@ class PodiumApp(App):
 
 
     def create_success(self, redirect_object):
-        print("redirect after create", redirect_object.__dict__)
+        print("redirect after create", attributes(redirect_object))
         self.podium.events.update(
             redirect_object.location,
             title="new_title",
@@ -212,7 +217,7 @@ class PodiumApp(App):
 
 
     def users_success(self, user):
-        print(user, user.__dict__)
+        print(user, attributes(user))
 
     
     def success(self, result):
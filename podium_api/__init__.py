@@ -1,5 +1,7 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+from contextlib import contextmanager
+from contextvars import ContextVar
 from podium_api.types.application import PodiumApplication
 """
 The podium_api module allows you to asynchronously interact with the Podium
@@ -19,11 +21,64 @@ API. It is built on top of Kivy's UrlRequest.
 
 PODIUM_APP = None
 
+_application_override = ContextVar('podium_application', default=None)
 
-def register_podium_application(app_id, app_secret, podium_url=None):
+
+@contextmanager
+def using_podium_application(app):
+    """
+    Context manager making every request started inside the with block, in
+    the current thread or asyncio task, use app instead of PODIUM_APP: its
+    credentials, podium_url, transport, cache and limits. Responses are
+    handled with app as well, even when they arrive after the block.
+
+    Args:
+        app (PodiumApplication): The application to use.
+
+    """
+    reset_token = _application_override.set(app)
+    try:
+        yield app
+    finally:
+        _application_override.reset(reset_token)
+
+
+def get_application_override():
+    """
+    Returns the application set by **using_podium_application**, or None
+    outside of such a block.
+    """
+    return _application_override.get()
+
+
+def get_podium_application():
+    """
+    Returns the application requests are made for: the one set by
+    **using_podium_application** if any, otherwise PODIUM_APP.
+
+    Return:
+        PodiumApplication: The current application, None if none was
+        registered.
+
+    """
+    app = _application_override.get()
+    if app is not None:
+        return app
+    return PODIUM_APP
+
+
+def register_podium_application(app_id, app_secret, podium_url=None,
+                                transport=None, cache=None,
+                                coalesce_requests=False, retry_policy=None,
+                                throttle=None, circuit_breaker=None,
+                                lazy_payloads=False, identity_map=None):
     """Registers an id and secret for the application for use with the Podium
     API. Should only ever be invoked once per run of program. 
 
+    The registered application is the default one, to also talk to other
+    applications or servers from the same program see
+    **podium_api.client.PodiumClient**.
+
     Args:
         app_id (string): The UUID for your application as registered with
         the Podium API.
@@ -32,10 +87,56 @@ def register_podium_application(app_id, app_secret, podium_url=None):
         the Podium API.
         
         podium_url (String): Optional podium url. defaults to https://podium.live
+
+        transport (PodiumTransport): Optional transport all requests will be
+        made with, for example a **podium_api.transport.PooledTransport** to
+        reuse keep-alive connections. Defaults to a new UrlRequest per
+        request.
+
+        cache (ResponseCache): Optional **podium_api.cache.ResponseCache**
+        used to serve and revalidate GET requests, or a
+        **podium_api.sqlitecache.SQLiteResponseCache** persisting them
+        across restarts. Defaults to None, no caching.
+
+        coalesce_requests (bool): If True identical GET requests made while
+        one is already in flight share its response instead of making a new
+        request. Defaults to False.
+
+        retry_policy (RetryPolicy): Optional **podium_api.retry.RetryPolicy**
+        retrying transient failures of the requests it applies to, GETs by
+        default. Defaults to None, no retries.
+
+        throttle (RequestThrottle): Optional
+        **podium_api.throttle.RequestThrottle** limiting the rate and number
+        in flight of requests. Requests over the limits wait in a queue.
+        Defaults to None, no limits.
+
+        circuit_breaker (CircuitBreaker): Optional
+        **podium_api.circuit.CircuitBreaker** failing the requests of an
+        endpoint family immediately while it keeps failing. Defaults to
+        None, requests are always made.
+
+        lazy_payloads (bool): If True the payload of paged responses is a
+        **podium_api.types.paged_response.LazyPayload** creating each
+        object on first access. Heavy fields such as channels, aggregates and
+        track_map_array are always kept as the decoded json. Defaults to
+        False.
+
+        identity_map (IdentityMap): Optional
+        **podium_api.types.identity.IdentityMap** so that every response
+        describing the same URI returns the same, updated, instance.
+        Defaults to None, a new object per response.
     """
 
     global PODIUM_APP
-    PODIUM_APP = PodiumApplication(app_id, app_secret, podium_url=podium_url)
+    PODIUM_APP = PodiumApplication(app_id, app_secret, podium_url=podium_url,
+                                   transport=transport, cache=cache,
+                                   coalesce_requests=coalesce_requests,
+                                   retry_policy=retry_policy,
+                                   throttle=throttle,
+                                   circuit_breaker=circuit_breaker,
+                                   lazy_payloads=lazy_payloads,
+                                   identity_map=identity_map)
 
 
 def unregister_podium_application():
@@ -42,7 +42,7 @@ def make_account_get(token, expand=False, quiet=None,
         UrlRequest: The request being made.
 
     """
-    endpoint = '{}/api/v1/account'.format(podium_api.PODIUM_APP.podium_url)
+    endpoint = '{}/api/v1/account'.format(podium_api.get_podium_application().podium_url)
     params = {'expand': expand}
     if quiet is not None:
         params['quiet'] = quiet
@@ -134,7 +134,7 @@ def make_alertmessages_get(token, event_id=None, device_id=None, endpoint=None,
         if (event_id or device_id) is None:
             raise NoEndpointOrIdsProvided()
         endpoint = '{}/api/v1/events/{}/devices/{}/alertmessages'.format(
-            podium_api.PODIUM_APP.podium_url,
+            podium_api.get_podium_application().podium_url,
             event_id,
             device_id
             )
@@ -187,7 +187,7 @@ def make_alertmessage_create(token, event_id, device_id, message, priority,
 
     """
 
-    endpoint = '{}/api/v1/events/{}/devices/{}/alertmessages'.format(podium_api.PODIUM_APP.podium_url, event_id, device_id)
+    endpoint = '{}/api/v1/events/{}/devices/{}/alertmessages'.format(podium_api.get_podium_application().podium_url, event_id, device_id)
     body = {'alertmessage[message]': message, 'alertmessage[priority]': priority}
     header = get_json_header_token(token)
     return make_request_custom_success(
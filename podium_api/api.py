@@ -23,7 +23,10 @@ from podium_api.alertmessages import (
 from podium_api.venues import (
     make_venues_get, make_venue_get
     )
-from podium_api.laps import make_laps_get, make_lap_get
+from podium_api.laps import (
+    make_laps_get, make_lap_get, make_lap_raw_data_get
+    )
+from podium_api.paging import iterate_all, fetch_all
 
 
 class PodiumAPI(object):
@@ -125,12 +128,40 @@ class PodiumLapsAPI(object):
 
             per_page (int): Number per page of results, max of 100.
 
+            as_table (bool): If True the payload of the PodiumPagedResponse
+            is a LapTable instead of a list of PodiumLap. Requires numpy.
+            Defaults to False.
+
         Return:
             UrlRequest: The request being made.
 
         """
         make_laps_get(self.token, *args, **kwargs)
 
+    def iterate_all(self, *args, **kwargs):
+        """
+        Requests every page of laps, several pages at a time, and calls
+        item_callback for each item in order. Takes the same args as
+        **list** plus the kwargs of **podium_api.paging.iterate_all**.
+
+        Return:
+            PagedFetch: The state of the fetch.
+
+        """
+        return iterate_all(make_laps_get, self.token, *args, **kwargs)
+
+    def fetch_all(self, *args, **kwargs):
+        """
+        Requests every page of laps and returns all items at once to
+        success_callback. Takes the same args as **list** plus the kwargs of
+        **podium_api.paging.fetch_all**.
+
+        Return:
+            PagedFetch: The state of the fetch.
+
+        """
+        return fetch_all(make_laps_get, self.token, *args, **kwargs)
+
     def get(self, *args, **kwargs):
         """
        Request that returns a PodiumLap that represents a specific
@@ -172,6 +203,46 @@ class PodiumLapsAPI(object):
        """
         make_lap_get(self.token, *args, **kwargs)
 
+    def raw_data(self, *args, **kwargs):
+        """
+        Request that downloads the logged telemetry of a lap into a
+        LapRawData, streaming it to disk.
+
+        Args:
+            raw_data_uri (str): The raw_data_uri of a PodiumLap.
+
+            directory (str): Directory the data is stored in.
+
+        Kwargs:
+            success_callback (function): Callback for a successful request,
+            will have the signature:
+                on_success(LapRawData)
+            Defaults to None.
+
+            failure_callback (function): Callback for failures and errors.
+            Will have the signature:
+                on_failure(failure_type (string), result (dict), data (dict))
+            Values for failure type are: 'error', 'failure'. Defaults to None.
+
+            redirect_callback (function): Callback for redirect,
+            Will have the signature:
+                on_redirect(result (dict), data (dict))
+            Defaults to None.
+
+            progress_callback (function): Callback for download progress,
+            will have the signature:
+                on_progress(current_size (int), total_size (int), data (dict))
+            Defaults to None.
+
+            keep_csv (bool): Keep the downloaded csv once converted.
+            Defaults to False.
+
+        Return:
+            UrlRequest: The request being made.
+
+        """
+        return make_lap_raw_data_get(self.token, *args, **kwargs)
+
 
 class PodiumEventDevicesAPI(object):
     """
@@ -240,6 +311,30 @@ class PodiumEventDevicesAPI(object):
         """
         make_eventdevices_get(self.token, *args, **kwargs)
 
+    def iterate_all(self, *args, **kwargs):
+        """
+        Requests every page of event devices, several pages at a time, and calls
+        item_callback for each item in order. Takes the same args as
+        **list** plus the kwargs of **podium_api.paging.iterate_all**.
+
+        Return:
+            PagedFetch: The state of the fetch.
+
+        """
+        return iterate_all(make_eventdevices_get, self.token, *args, **kwargs)
+
+    def fetch_all(self, *args, **kwargs):
+        """
+        Requests every page of event devices and returns all items at once to
+        success_callback. Takes the same args as **list** plus the kwargs of
+        **podium_api.paging.fetch_all**.
+
+        Return:
+            PagedFetch: The state of the fetch.
+
+        """
+        return fetch_all(make_eventdevices_get, self.token, *args, **kwargs)
+
     def create(self, *args, **kwargs):
         """
         Request that creates a new PodiumEventDevice.
@@ -550,6 +645,30 @@ class PodiumFriendshipsAPI(object):
         """
         make_friendships_get(self.token, *args, **kwargs)
 
+    def iterate_all(self, *args, **kwargs):
+        """
+        Requests every page of friendships, several pages at a time, and calls
+        item_callback for each item in order. Takes the same args as
+        **list** plus the kwargs of **podium_api.paging.iterate_all**.
+
+        Return:
+            PagedFetch: The state of the fetch.
+
+        """
+        return iterate_all(make_friendships_get, self.token, *args, **kwargs)
+
+    def fetch_all(self, *args, **kwargs):
+        """
+        Requests every page of friendships and returns all items at once to
+        success_callback. Takes the same args as **list** plus the kwargs of
+        **podium_api.paging.fetch_all**.
+
+        Return:
+            PagedFetch: The state of the fetch.
+
+        """
+        return fetch_all(make_friendships_get, self.token, *args, **kwargs)
+
     def create(self, *args, **kwargs):
         """
         Request that adds a friendship for the user whose token is in use.
@@ -875,6 +994,30 @@ class PodiumDevicesAPI(object):
             """
         make_devices_get(self.token, *args, **kwargs)
 
+    def iterate_all(self, *args, **kwargs):
+        """
+        Requests every page of devices, several pages at a time, and calls
+        item_callback for each item in order. Takes the same args as
+        **list** plus the kwargs of **podium_api.paging.iterate_all**.
+
+        Return:
+            PagedFetch: The state of the fetch.
+
+        """
+        return iterate_all(make_devices_get, self.token, *args, **kwargs)
+
+    def fetch_all(self, *args, **kwargs):
+        """
+        Requests every page of devices and returns all items at once to
+        success_callback. Takes the same args as **list** plus the kwargs of
+        **podium_api.paging.fetch_all**.
+
+        Return:
+            PagedFetch: The state of the fetch.
+
+        """
+        return fetch_all(make_devices_get, self.token, *args, **kwargs)
+
 
 class PodiumEventsAPI(object):
     """
@@ -937,6 +1080,30 @@ class PodiumEventsAPI(object):
         """
         make_events_get(self.token, *args, **kwargs)
 
+    def iterate_all(self, *args, **kwargs):
+        """
+        Requests every page of events, several pages at a time, and calls
+        item_callback for each item in order. Takes the same args as
+        **list** plus the kwargs of **podium_api.paging.iterate_all**.
+
+        Return:
+            PagedFetch: The state of the fetch.
+
+        """
+        return iterate_all(make_events_get, self.token, *args, **kwargs)
+
+    def fetch_all(self, *args, **kwargs):
+        """
+        Requests every page of events and returns all items at once to
+        success_callback. Takes the same args as **list** plus the kwargs of
+        **podium_api.paging.fetch_all**.
+
+        Return:
+            PagedFetch: The state of the fetch.
+
+        """
+        return fetch_all(make_events_get, self.token, *args, **kwargs)
+
     def get(self, *args, **kwargs):
         """
         Request that returns a PodiumEvent for the provided event_uri. 
@@ -1160,6 +1327,30 @@ class PodiumAlertMessagesAPI(object):
         """
         make_alertmessages_get(self.token, *args, **kwargs)
 
+    def iterate_all(self, *args, **kwargs):
+        """
+        Requests every page of alertmessages, several pages at a time, and calls
+        item_callback for each item in order. Takes the same args as
+        **list** plus the kwargs of **podium_api.paging.iterate_all**.
+
+        Return:
+            PagedFetch: The state of the fetch.
+
+        """
+        return iterate_all(make_alertmessages_get, self.token, *args, **kwargs)
+
+    def fetch_all(self, *args, **kwargs):
+        """
+        Requests every page of alertmessages and returns all items at once to
+        success_callback. Takes the same args as **list** plus the kwargs of
+        **podium_api.paging.fetch_all**.
+
+        Return:
+            PagedFetch: The state of the fetch.
+
+        """
+        return fetch_all(make_alertmessages_get, self.token, *args, **kwargs)
+
     def get(self, *args, **kwargs):
         """
         Request that returns an AlertMessage for the provided alertmessage_uri. 
@@ -1303,6 +1494,30 @@ class PodiumVenuesAPI(object):
         """
         make_venues_get(self.token, *args, **kwargs)
 
+    def iterate_all(self, *args, **kwargs):
+        """
+        Requests every page of venues, several pages at a time, and calls
+        item_callback for each item in order. Takes the same args as
+        **list** plus the kwargs of **podium_api.paging.iterate_all**.
+
+        Return:
+            PagedFetch: The state of the fetch.
+
+        """
+        return iterate_all(make_venues_get, self.token, *args, **kwargs)
+
+    def fetch_all(self, *args, **kwargs):
+        """
+        Requests every page of venues and returns all items at once to
+        success_callback. Takes the same args as **list** plus the kwargs of
+        **podium_api.paging.fetch_all**.
+
+        Return:
+            PagedFetch: The state of the fetch.
+
+        """
+        return fetch_all(make_venues_get, self.token, *args, **kwargs)
+
     def get(self, *args, **kwargs):
         """
         Request that returns an Venue for the provided endpoint. 
@@ -0,0 +1,514 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Awaitable interface to the Podium API for use with asyncio, without Kivy.
+
+Every method is a coroutine that makes the same request as its callback
+based counterpart in **podium_api.api** and returns what would have been
+passed to the success or redirect callback. Failures and errors raise
+**PodiumRequestFailed**.
+
+    token = await login(username, password)
+    podium = AsyncPodiumAPI(token)
+    events = await podium.events.list(per_page=100)
+"""
+import asyncio
+from collections import deque
+from podium_api.asyncreq import using_transport
+from podium_api.transport import AsyncioTransport
+from podium_api.types.exceptions import PodiumRequestFailed
+from podium_api.login import make_login_post
+from podium_api.account import make_account_get
+from podium_api.events import (
+    make_events_get, make_event_create, make_event_get, make_event_delete,
+    make_event_update
+    )
+from podium_api.devices import (
+    make_device_get, make_device_create, make_device_update,
+    make_device_delete, make_devices_get
+    )
+from podium_api.friendships import (
+    make_friendship_get, make_friendships_get, make_friendship_create,
+    make_friendship_delete
+    )
+from podium_api.users import make_user_get
+from podium_api.eventdevices import (
+    make_eventdevices_get, make_eventdevice_create, make_eventdevice_update,
+    make_eventdevice_get, make_eventdevice_delete
+)
+from podium_api.alertmessages import (
+    make_alertmessages_get, make_alertmessage_get, make_alertmessage_create
+    )
+from podium_api.venues import make_venues_get, make_venue_get
+from podium_api.laps import make_laps_get, make_lap_get
+from podium_api.paging import require_item_payload
+
+
+async def call_async(request_func, *args, **kwargs):
+    """
+    Starts a request with one of the callback based make_* functions and
+    waits for it to complete.
+
+    Args:
+        request_func (function): The make_* function to call, args and kwargs
+        are passed through to it.
+
+    Kwargs:
+        transport (PodiumTransport): The transport to make the request with.
+        Defaults to a new AsyncioTransport, closed once the request
+        completed.
+
+    Return:
+        object: The argument passed to the success or redirect callback, or
+        a tuple if the callback receives several arguments.
+
+    Raises:
+        PodiumRequestFailed: If the request fails or errors.
+
+    """
+    transport = kwargs.pop('transport', None)
+    owned = transport is None
+    if owned:
+        transport = AsyncioTransport()
+    future = asyncio.get_running_loop().create_future()
+
+    def resolve(*results):
+        if not future.done():
+            future.set_result(results[0] if len(results) == 1 else results)
+
+    def reject(failure_type, result, data):
+        if not future.done():
+            future.set_exception(PodiumRequestFailed(failure_type, result))
+
+    kwargs['success_callback'] = resolve
+    kwargs['redirect_callback'] = resolve
+    kwargs['failure_callback'] = reject
+    try:
+        with using_transport(transport):
+            request_func(*args, **kwargs)
+        return await future
+    finally:
+        if owned:
+            transport.close()
+
+
+async def login(username, password, transport=None):
+    """
+    Logs a user in, see **podium_api.login.make_login_post**. Without a
+    transport the request is made with a new AsyncioTransport that is closed
+    afterwards.
+
+    Return:
+        PodiumToken: The token for the user.
+
+    """
+    return await call_async(make_login_post, username, password,
+                            transport=transport)
+
+
+class AsyncPodiumAPI(object):
+    """
+    Awaitable counterpart of **podium_api.api.PodiumAPI**. All requests made
+    through one AsyncPodiumAPI share its transport and therefore its
+    keep-alive connections.
+
+    Args:
+        token (PodiumToken): The token for the logged in user.
+
+    Kwargs:
+        transport (PodiumTransport): The transport requests are made with.
+        Defaults to a new AsyncioTransport.
+
+    **Attributes:**
+        **token** (PodiumToken): The token for the logged in user.
+
+        **transport** (PodiumTransport): The transport requests are made
+        with.
+
+        **account**, **events**, **devices**, **friendships**, **users**,
+        **eventdevices**, **laps**, **alertmessages**, **venues**: Awaitable
+        API objects mirroring the ones of PodiumAPI.
+
+    """
+
+    def __init__(self, token, transport=None):
+        self.token = token
+        self.transport = AsyncioTransport() if transport is None \
+            else transport
+        self.account = AsyncPodiumAccountAPI(token, self.transport)
+        self.events = AsyncPodiumEventsAPI(token, self.transport)
+        self.devices = AsyncPodiumDevicesAPI(token, self.transport)
+        self.friendships = AsyncPodiumFriendshipsAPI(token, self.transport)
+        self.users = AsyncPodiumUsersAPI(token, self.transport)
+        self.eventdevices = AsyncPodiumEventDevicesAPI(token, self.transport)
+        self.laps = AsyncPodiumLapsAPI(token, self.transport)
+        self.alertmessages = AsyncPodiumAlertMessagesAPI(token,
+                                                         self.transport)
+        self.venues = AsyncPodiumVenuesAPI(token, self.transport)
+
+    def close(self):
+        """
+        Closes the idle connections of the transport.
+        """
+        self.transport.close()
+
+
+class AsyncPodiumBaseAPI(object):
+    """
+    Base of the awaitable API objects, keeps track of the token and the
+    transport.
+
+    **Attributes:**
+        **token** (PodiumToken): The token for the logged in user.
+
+        **transport** (PodiumTransport): The transport requests are made
+        with.
+
+    """
+
+    def __init__(self, token, transport):
+        self.token = token
+        self.transport = transport
+
+    async def _call(self, request_func, *args, **kwargs):
+        kwargs['transport'] = self.transport
+        return await call_async(request_func, self.token, *args, **kwargs)
+
+
+class AsyncPodiumListAPI(AsyncPodiumBaseAPI):
+    """
+    Base of the awaitable API objects that can list a paged collection.
+    """
+
+    async def iterate_all(self, *args, **kwargs):
+        """
+        Asynchronous generator yielding every item of the collection in
+        order. After the first page the remaining start offsets are computed
+        from its total and up to window pages are requested at once. Takes
+        the same args and kwargs as **list** plus:
+
+        Kwargs:
+            per_page (int): Number per page of results, max of 100.
+            Defaults to 100.
+
+            window (int): Maximum number of pages requested at once.
+            Defaults to 4.
+
+        """
+        require_item_payload(kwargs)
+        per_page = min(kwargs.pop('per_page', 100), 100)
+        window = max(kwargs.pop('window', 4), 1)
+        first_page = await self.list(*args, start=0, per_page=per_page,
+                                     **kwargs)
+        for item in first_page.payload:
+            yield item
+        # the server may return less than per_page, use the size it returned
+        page_size = len(first_page.payload)
+        if not page_size:
+            return
+        offsets = iter(range(page_size, first_page.total, page_size))
+        pending = deque()
+
+        def request_next():
+            for start in offsets:
+                pending.append(asyncio.ensure_future(
+                    self.list(*args, start=start, per_page=per_page,
+                              **kwargs)))
+                return
+
+        for i in range(window):
+            request_next()
+        try:
+            while pending:
+                paged_response = await pending.popleft()
+                request_next()
+                for item in paged_response.payload:
+                    yield item
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def fetch_all(self, *args, **kwargs):
+        """
+        Returns a list of every item of the collection, see **iterate_all**.
+        """
+        return [item async for item in self.iterate_all(*args, **kwargs)]
+
+
+class AsyncPodiumAccountAPI(AsyncPodiumBaseAPI):
+
+    async def get(self, *args, **kwargs):
+        """
+        See **podium_api.account.make_account_get**.
+
+        Return:
+            PodiumAccount: The account of the token.
+        """
+        return await self._call(make_account_get, *args, **kwargs)
+
+
+class AsyncPodiumEventsAPI(AsyncPodiumListAPI):
+
+    async def list(self, *args, **kwargs):
+        """
+        See **podium_api.events.make_events_get**.
+
+        Return:
+            PodiumPagedResponse: A page of PodiumEvent.
+        """
+        return await self._call(make_events_get, *args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        """
+        See **podium_api.events.make_event_get**.
+
+        Return:
+            PodiumEvent: The event.
+        """
+        return await self._call(make_event_get, *args, **kwargs)
+
+    async def create(self, *args, **kwargs):
+        """
+        See **podium_api.events.make_event_create**.
+
+        Return:
+            PodiumRedirect: The location of the new event.
+        """
+        return await self._call(make_event_create, *args, **kwargs)
+
+    async def update(self, *args, **kwargs):
+        """
+        See **podium_api.events.make_event_update**.
+
+        Return:
+            tuple: The server message (dict) and the updated uri (str).
+        """
+        return await self._call(make_event_update, *args, **kwargs)
+
+    async def delete(self, *args, **kwargs):
+        """
+        See **podium_api.events.make_event_delete**.
+
+        Return:
+            str: The uri of the deleted event.
+        """
+        return await self._call(make_event_delete, *args, **kwargs)
+
+
+class AsyncPodiumDevicesAPI(AsyncPodiumListAPI):
+
+    async def list(self, *args, **kwargs):
+        """
+        See **podium_api.devices.make_devices_get**.
+
+        Return:
+            PodiumPagedResponse: A page of PodiumDevice.
+        """
+        return await self._call(make_devices_get, *args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        """
+        See **podium_api.devices.make_device_get**.
+
+        Return:
+            PodiumDevice: The device.
+        """
+        return await self._call(make_device_get, *args, **kwargs)
+
+    async def create(self, *args, **kwargs):
+        """
+        See **podium_api.devices.make_device_create**.
+
+        Return:
+            PodiumRedirect: The location of the new device.
+        """
+        return await self._call(make_device_create, *args, **kwargs)
+
+    async def update(self, *args, **kwargs):
+        """
+        See **podium_api.devices.make_device_update**.
+
+        Return:
+            tuple: The server message (dict) and the updated uri (str).
+        """
+        return await self._call(make_device_update, *args, **kwargs)
+
+    async def delete(self, *args, **kwargs):
+        """
+        See **podium_api.devices.make_device_delete**.
+
+        Return:
+            str: The uri of the deleted device.
+        """
+        return await self._call(make_device_delete, *args, **kwargs)
+
+
+class AsyncPodiumFriendshipsAPI(AsyncPodiumListAPI):
+
+    async def list(self, *args, **kwargs):
+        """
+        See **podium_api.friendships.make_friendships_get**.
+
+        Return:
+            PodiumPagedResponse: A page of PodiumUser.
+        """
+        return await self._call(make_friendships_get, *args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        """
+        See **podium_api.friendships.make_friendship_get**.
+
+        Return:
+            PodiumFriendship: The friendship.
+        """
+        return await self._call(make_friendship_get, *args, **kwargs)
+
+    async def create(self, *args, **kwargs):
+        """
+        See **podium_api.friendships.make_friendship_create**.
+
+        Return:
+            PodiumRedirect: The location of the new friendship.
+        """
+        return await self._call(make_friendship_create, *args, **kwargs)
+
+    async def delete(self, *args, **kwargs):
+        """
+        See **podium_api.friendships.make_friendship_delete**.
+
+        Return:
+            str: The uri of the deleted friendship.
+        """
+        return await self._call(make_friendship_delete, *args, **kwargs)
+
+
+class AsyncPodiumUsersAPI(AsyncPodiumBaseAPI):
+
+    async def get(self, *args, **kwargs):
+        """
+        See **podium_api.users.make_user_get**.
+
+        Return:
+            PodiumUser: The user.
+        """
+        return await self._call(make_user_get, *args, **kwargs)
+
+
+class AsyncPodiumEventDevicesAPI(AsyncPodiumListAPI):
+
+    async def list(self, *args, **kwargs):
+        """
+        See **podium_api.eventdevices.make_eventdevices_get**.
+
+        Return:
+            PodiumPagedResponse: A page of PodiumEventDevice.
+        """
+        return await self._call(make_eventdevices_get, *args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        """
+        See **podium_api.eventdevices.make_eventdevice_get**.
+
+        Return:
+            PodiumEventDevice: The event device.
+        """
+        return await self._call(make_eventdevice_get, *args, **kwargs)
+
+    async def create(self, *args, **kwargs):
+        """
+        See **podium_api.eventdevices.make_eventdevice_create**.
+
+        Return:
+            PodiumRedirect: The location of the new event device.
+        """
+        return await self._call(make_eventdevice_create, *args, **kwargs)
+
+    async def update(self, *args, **kwargs):
+        """
+        See **podium_api.eventdevices.make_eventdevice_update**.
+
+        Return:
+            tuple: The server message (dict) and the updated uri (str).
+        """
+        return await self._call(make_eventdevice_update, *args, **kwargs)
+
+    async def delete(self, *args, **kwargs):
+        """
+        See **podium_api.eventdevices.make_eventdevice_delete**.
+
+        Return:
+            str: The uri of the deleted event device.
+        """
+        return await self._call(make_eventdevice_delete, *args, **kwargs)
+
+
+class AsyncPodiumLapsAPI(AsyncPodiumListAPI):
+
+    async def list(self, *args, **kwargs):
+        """
+        See **podium_api.laps.make_laps_get**.
+
+        Return:
+            PodiumPagedResponse: A page of PodiumLap.
+        """
+        return await self._call(make_laps_get, *args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        """
+        See **podium_api.laps.make_lap_get**.
+
+        Return:
+            PodiumLap: The lap.
+        """
+        return await self._call(make_lap_get, *args, **kwargs)
+
+
+class AsyncPodiumAlertMessagesAPI(AsyncPodiumListAPI):
+
+    async def list(self, *args, **kwargs):
+        """
+        See **podium_api.alertmessages.make_alertmessages_get**.
+
+        Return:
+            PodiumPagedResponse: A page of PodiumAlertMessage.
+        """
+        return await self._call(make_alertmessages_get, *args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        """
+        See **podium_api.alertmessages.make_alertmessage_get**.
+
+        Return:
+            PodiumAlertMessage: The alert message.
+        """
+        return await self._call(make_alertmessage_get, *args, **kwargs)
+
+    async def create(self, *args, **kwargs):
+        """
+        See **podium_api.alertmessages.make_alertmessage_create**.
+
+        Return:
+            PodiumRedirect: The location of the new alert message.
+        """
+        return await self._call(make_alertmessage_create, *args, **kwargs)
+
+
+class AsyncPodiumVenuesAPI(AsyncPodiumListAPI):
+
+    async def list(self, *args, **kwargs):
+        """
+        See **podium_api.venues.make_venues_get**.
+
+        Return:
+            PodiumPagedResponse: A page of PodiumVenue.
+        """
+        return await self._call(make_venues_get, *args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        """
+        See **podium_api.venues.make_venue_get**.
+
+        Return:
+            PodiumVenue: The venue.
+        """
+        return await self._call(make_venue_get, *args, **kwargs)
@@ -1,29 +1,379 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
-from kivy.network.urlrequest import UrlRequest
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+import threading
 import podium_api
 try:
     from urllib.parse import urlencode
 except:
     from urllib import urlencode
 from podium_api.types.exceptions import PodiumApplicationNotRegistered
+from podium_api.transport import (UrlRequest, UrlRequestTransport,
+                                  TransportRequest)
+from podium_api.throttle import QueuedRequest
+from podium_api.circuit import CircuitOpenRequest
+
+"""
+    **DEFAULT_TRANSPORT** (PodiumTransport): The transport used when no
+    application is registered or the registered application did not provide
+    one.
+"""
+
+DEFAULT_TRANSPORT = UrlRequestTransport()
+
+_transport_override = ContextVar('podium_transport', default=None)
+
+_UNSET = object()
+
+_retry_policy_override = ContextVar('podium_retry_policy', default=_UNSET)
+
+_priority_override = ContextVar('podium_priority', default=None)
+
+_idempotency_key = ContextVar('podium_idempotency_key', default=None)
+
+_unauthorized_handler = ContextVar('podium_unauthorized_handler',
+                                   default=None)
+
+_stale_callback = ContextVar('podium_stale_callback', default=None)
+
+
+@contextmanager
+def using_transport(transport):
+    """
+    Context manager making every request started inside the with block,
+    in the current thread or asyncio task, use transport.
+
+    Args:
+        transport (PodiumTransport): The transport to use.
+
+    """
+    reset_token = _transport_override.set(transport)
+    try:
+        yield transport
+    finally:
+        _transport_override.reset(reset_token)
+
+
+def get_transport():
+    """
+    Returns the transport requests should be made with: the one set by
+    **using_transport** if any, then the one provided to
+    **register_podium_application**, otherwise DEFAULT_TRANSPORT.
+
+    Return:
+        PodiumTransport: The transport for the next request.
+
+    """
+    transport = _transport_override.get()
+    if transport is not None:
+        return transport
+    app = podium_api.get_podium_application()
+    if app is not None and app.transport is not None:
+        return app.transport
+    return DEFAULT_TRANSPORT
+
+
+_PENDING = object()
+
+
+class ScheduledCall(object):
+    """
+    Calls callback once after a delay, using call_later of the transport
+    returned by **get_transport**. At most one call is scheduled at a time,
+    **schedule** and **cancel** can be used from any thread.
+
+    Args:
+        callback (function): Called without arguments.
+    """
+
+    def __init__(self, callback):
+        self.callback = callback
+        self._handle = None
+        # bumped by every schedule and cancel, calls from timers armed
+        # before are ignored
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def scheduled(self):
+        """
+        True while a call is scheduled.
+        """
+        return self._handle is not None
+
+    def schedule(self, delay, replace=False):
+        """
+        Schedules the call in delay seconds.
+
+        Kwargs:
+            replace (bool): Cancel the call already scheduled, if any,
+            instead of keeping it. Defaults to False.
+
+        Return:
+            bool: False if a call was already scheduled and kept.
+
+        """
+        with self._lock:
+            if self._handle is not None and not replace:
+                return False
+            previous, self._handle = self._handle, _PENDING
+            self._generation += 1
+            generation = self._generation
+        if previous is not None and previous is not _PENDING:
+            previous.cancel()
+        handle = get_transport().call_later(delay,
+                                            partial(self._fire, generation))
+        with self._lock:
+            stale = self._generation != generation
+            # the transport may have already made the call
+            if not stale and self._handle is _PENDING:
+                self._handle = handle
+        if stale:
+            # cancelled or replaced while call_later was running
+            handle.cancel()
+        return True
+
+    def cancel(self):
+        with self._lock:
+            handle, self._handle = self._handle, None
+            self._generation += 1
+        if handle is not None and handle is not _PENDING:
+            handle.cancel()
+
+    def _fire(self, generation):
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._handle = None
+        self.callback()
+
+
+@contextmanager
+def using_retry_policy(policy):
+    """
+    Context manager applying policy to every request started inside the with
+    block, in the current thread or asyncio task. Retries scheduled later
+    keep the policy of their first attempt.
+
+    Args:
+        policy (RetryPolicy): The policy to use, None to disable retries.
+
+    """
+    reset_token = _retry_policy_override.set(policy)
+    try:
+        yield policy
+    finally:
+        _retry_policy_override.reset(reset_token)
+
+
+def get_retry_policy():
+    """
+    Returns the RetryPolicy set by **using_retry_policy** if any, otherwise
+    the one provided to **register_podium_application**, or None when
+    requests are not retried.
+    """
+    policy = _retry_policy_override.get()
+    if policy is not _UNSET:
+        return policy
+    app = podium_api.get_podium_application()
+    if app is not None:
+        return app.retry_policy
+    return None
+
+
+@contextmanager
+def using_priority(priority):
+    """
+    Context manager giving every request started inside the with block, in
+    the current thread or asyncio task, the priority class priority. Retries
+    scheduled later keep the priority of their first attempt.
+
+    Args:
+        priority (str): One of podium_api.throttle.PRIORITIES.
+
+    """
+    reset_token = _priority_override.set(priority)
+    try:
+        yield priority
+    finally:
+        _priority_override.reset(reset_token)
+
+
+def get_priority():
+    """
+    Returns the priority class set by **using_priority**, or None to let
+    the RequestThrottle classify the request by its url.
+    """
+    return _priority_override.get()
+
+
+@contextmanager
+def using_idempotency_key(key):
+    """
+    Context manager sending key as the Idempotency-Key header of every
+    request started inside the with block, in the current thread or asyncio
+    task, so the server can recognize a mutation that is sent again.
+
+    Args:
+        key (str): The idempotency key.
+
+    """
+    reset_token = _idempotency_key.set(key)
+    try:
+        yield key
+    finally:
+        _idempotency_key.reset(reset_token)
+
+
+@contextmanager
+def using_unauthorized_handler(handler):
+    """
+    Context manager giving the 401 responses of every request started inside
+    the with block, in the current thread or asyncio task, to handler before
+    the failure callbacks. handler returns True when it takes care of the
+    request, for example by making it again with a refreshed token, the
+    failure callbacks are then not called.
+
+    Args:
+        handler (function): Will have the signature:
+            handler(request (UrlRequest), result (dict)) -> bool
+
+    """
+    reset_token = _unauthorized_handler.set(handler)
+    try:
+        yield handler
+    finally:
+        _unauthorized_handler.reset(reset_token)
+
+
+@contextmanager
+def using_stale_callback(callback):
+    """
+    Context manager handing the stale cached response of every GET request
+    started inside the with block, in the current thread or asyncio task,
+    to callback while the request revalidates it. Only used with a
+    ResponseCache created with serve_stale. The success_callback is still
+    called once, with the cached objects on a 304 response or with the new
+    objects on a changed response.
+
+    Args:
+        callback (function): Will be called with the same args as the
+        success_callback of the request.
+
+    """
+    reset_token = _stale_callback.set(callback)
+    try:
+        yield callback
+    finally:
+        _stale_callback.reset(reset_token)
+
+
+def handle_unauthorized(handler, callback):
+    """
+    Wraps callback, the on_failure of **make_request**, to first offer 401
+    responses to handler, see **using_unauthorized_handler**.
+    """
+    def on_failure(req, result, data):
+        if getattr(req, 'resp_status', None) == 401 and handler(req, result):
+            return
+        if callback is not None:
+            callback(req, result, data)
+    return on_failure
+
+
+def bind_application(callback):
+    """
+    Returns callback made to run with the application of the current
+    **podium_api.using_podium_application** block, so that responses
+    arriving later on another thread are handled with the caches, identity
+    map and limits of the application that made the request. callback is
+    returned as is outside of such a block.
+    """
+    app = podium_api.get_application_override()
+    if app is None or callback is None:
+        return callback
+
+    def bound(*args):
+        with podium_api.using_podium_application(app):
+            return callback(*args)
+    return bound
+
+
+def get_throttle():
+    """
+    Returns the RequestThrottle provided to **register_podium_application**,
+    or None if requests are not throttled.
+    """
+    app = podium_api.get_podium_application()
+    if app is not None:
+        return app.throttle
+    return None
+
+
+def get_circuit_breaker():
+    """
+    Returns the CircuitBreaker provided to **register_podium_application**,
+    or None if requests are always made.
+    """
+    app = podium_api.get_podium_application()
+    if app is not None:
+        return app.circuit_breaker
+    return None
+
+
+def get_cache():
+    """
+    Returns the ResponseCache provided to **register_podium_application**,
+    or None if responses are not cached.
+    """
+    app = podium_api.get_podium_application()
+    if app is not None:
+        return app.cache
+    return None
+
+
+def coalescing_enabled():
+    """
+    Returns True if identical in-flight GET requests should share one
+    request, see **make_single_flight_request**.
+    """
+    app = podium_api.get_podium_application()
+    return app is not None and app.coalesce_requests
+
+
+def encode_url(endpoint, params):
+    """
+    Returns endpoint with params urlencoded into its query string.
+    """
+    if params is not None and params != {}:
+        params = urlencode(params)
+        if "?" in endpoint:
+            endpoint = '{}&{}'.format(endpoint, params)
+        else:
+            endpoint = '{}?{}'.format(endpoint, params)
+    return endpoint
 
 
 def get_json_header_token(token):
     """
-    Returns a header prepared with the app_id and app_secret set to tell
+    Returns a header prepared with the token of the user set to tell
     the server to return json. Content-Type will be
     'application/x-www-form-urlencoded'
 
+    The header is built once per token and application and shared by every
+    request, copy it before changing it.
+
     Return:
-        dict: Dict containing the header data for a request.
+        MappingProxyType: Read only mapping containing the header data for
+        a request.
 
     """
-    if podium_api.PODIUM_APP is None:
+    app = podium_api.get_podium_application()
+    if app is None:
         raise PodiumApplicationNotRegistered()
-    return {"Content-Type": "application/x-www-form-urlencoded",
-            "Authorization": "Bearer {}".format(token.token),
-            "Accept": "application/json"}
+    return app.json_header_token(token.token)
 
 
 def get_json_header():
@@ -32,24 +382,44 @@ def get_json_header():
     the server to return json. Content-Type will be
     'application/x-www-form-urlencoded'
 
+    The header is shared like **get_json_header_token**'s.
+
     Return:
-        dict: Dict containing the header data for a request.
+        MappingProxyType: Read only mapping containing the header data for
+        a request.
 
     """
-    if podium_api.PODIUM_APP is None:
+    app = podium_api.get_podium_application()
+    if app is None:
         raise PodiumApplicationNotRegistered()
-    return {"Content-Type": "application/x-www-form-urlencoded",
-            "Authorization": "Basic {}:{}".format(
-                podium_api.PODIUM_APP.app_id,
-                podium_api.PODIUM_APP.app_secret),
-            "Accept": "application/json"}
+    return app.json_header()
 
 
 def make_request(endpoint, method="GET", on_success=None, on_failure=None,
                  on_error=None, on_redirect=None, on_progress=None,
-                 body=None, header=None, data=None, params=None):
+                 body=None, header=None, data=None, params=None,
+                 file_path=None, retry_policy=_UNSET, priority=None):
     """
-    Creates and starts a UrlRequest.
+    Creates and starts a request using the transport returned by
+    **get_transport**, a UrlRequest by default, see **start_request**.
+
+    If a RetryPolicy applies to the request, see **make_retrying_request**,
+    transient failures and errors are retried before on_failure or on_error
+    is called.
+
+    Inside a **using_idempotency_key** block the Idempotency-Key header is
+    added to header.
+
+    Inside a **using_unauthorized_handler** block 401 responses are given
+    to the handler first.
+
+    Inside a **podium_api.using_podium_application** block the callbacks
+    run with the same application, see **bind_application**.
+
+    If a CircuitBreaker was registered and the circuit of the endpoint's
+    family is open, no request is made and on_error is called with a
+    CircuitOpenRequest, see **reject_request**. A request and its retries
+    count as one outcome for the circuit.
 
     Args:
         endpoint (str): The endpoint the request will go to.
@@ -92,32 +462,226 @@ def make_request(endpoint, method="GET", on_success=None, on_failure=None,
         to the various callbacks of a request. Each callback will receive the
         data in here. Defaults to empty dict.
 
+        file_path (str): If not None the response is streamed into this file
+        instead of being kept in memory. Defaults to None.
+
+        retry_policy (RetryPolicy): Policy for this request, None to never
+        retry it. Defaults to the policy returned by **get_retry_policy**.
+
+        priority (str): Priority class of the request when a RequestThrottle
+        was registered, one of podium_api.throttle.PRIORITIES. Defaults to
+        the class returned by **get_priority**.
+
     Return:
-        UrlRequest: The request being made.
+        UrlRequest: The request being made, or the request object of the
+        registered transport.
 
     """
     if body is not None:
         body = urlencode(body)
-    if params is not None and params != {}:
-        params = urlencode(params)
-        if "?" in endpoint:
-            endpoint = '{}&{}'.format(endpoint, params)
-        else:
-            endpoint = '{}?{}'.format(endpoint, params)
-    return UrlRequest(
-        endpoint, method=method, req_body=body, req_headers=header,
-        on_success=(lambda req, res: on_success(
-                    req, res, data)) if on_success is not None else None,
-        on_failure=(lambda req, res: on_failure(
-                    req, res, data)) if on_failure is not None else None,
-        on_redirect=(lambda req, res: on_redirect(
-                     req, res, data)) if on_redirect is not None else None,
-        on_progress=(lambda req, cur, tot:
-            on_progress(req, cur, tot, data)
-            ) if on_progress is not None else None,
-        on_error=(lambda req, res: on_error(
-                  req, res, data)) if on_error is not None else None
-        )
+    endpoint = encode_url(endpoint, params)
+    unauthorized_handler = _unauthorized_handler.get()
+    if unauthorized_handler is not None:
+        on_failure = handle_unauthorized(unauthorized_handler, on_failure)
+    on_success = bind_application(on_success)
+    on_failure = bind_application(on_failure)
+    on_error = bind_application(on_error)
+    on_redirect = bind_application(on_redirect)
+    on_progress = bind_application(on_progress)
+    idempotency_key = _idempotency_key.get()
+    if idempotency_key is not None:
+        header = dict(header or {})
+        header['Idempotency-Key'] = idempotency_key
+    kwargs = {}
+    if file_path is not None:
+        kwargs['file_path'] = file_path
+    if priority is None:
+        priority = get_priority()
+    if priority is not None:
+        kwargs['priority'] = priority
+    breaker = get_circuit_breaker()
+    if breaker is not None:
+        family = breaker.family_for(endpoint)
+        if not breaker.allow(family):
+            return reject_request(breaker, family, endpoint, method, body,
+                                  header, on_error, data)
+        on_success = record_outcome(breaker, family, on_success)
+        on_failure = record_outcome(breaker, family, on_failure)
+        on_error = record_outcome(breaker, family, on_error, error=True)
+        on_redirect = record_outcome(breaker, family, on_redirect)
+    if retry_policy is _UNSET:
+        retry_policy = get_retry_policy()
+    if retry_policy is not None and retry_policy.applies_to(method):
+        req = make_retrying_request(
+            retry_policy, endpoint, method, body, header, on_success,
+            on_failure, on_error, on_redirect, on_progress, data, kwargs)
+    else:
+        req = start_request(
+            get_transport(), endpoint, method=method, body=body,
+            headers=header,
+            on_success=(lambda req, res: on_success(
+                        req, res, data)) if on_success is not None else None,
+            on_failure=(lambda req, res: on_failure(
+                        req, res, data)) if on_failure is not None else None,
+            on_redirect=(lambda req, res: on_redirect(
+                req, res, data)) if on_redirect is not None else None,
+            on_progress=(lambda req, cur, tot:
+                on_progress(req, cur, tot, data)
+                ) if on_progress is not None else None,
+            on_error=(lambda req, res: on_error(
+                      req, res, data)) if on_error is not None else None,
+            **kwargs)
+    if breaker is not None and isinstance(req, QueuedRequest):
+        # a request cancelled in the throttle queue never completes
+        req.on_cancel = lambda: breaker.release(family)
+    return req
+
+
+def record_outcome(breaker, family, callback, error=False):
+    """
+    Wraps callback, a final callback of **make_request**, to record the
+    outcome of the request in the circuit of family before calling it.
+    """
+    def handler(req, result, data):
+        status = None if error else getattr(req, 'resp_status', None)
+        breaker.record(family, breaker.is_failure(status=status, error=error))
+        if callback is not None:
+            callback(req, result, data)
+    return handler
+
+
+def reject_request(breaker, family, url, method, body, header, on_error,
+                   data):
+    """
+    Fails a request whose circuit is open without making it. on_error is
+    called from the transport with a CircuitOpenRequest and a result dict
+    holding the 'error', 'family' and 'retry_in' seconds until the circuit
+    is probed.
+
+    Return:
+        CircuitOpenRequest: The already finished request.
+
+    """
+    req = CircuitOpenRequest(url, method, body, header)
+    req._finished.set()
+    result = {'error': 'circuit_open', 'family': family,
+              'retry_in': breaker.retry_in(family)}
+    if on_error is not None:
+        get_transport().call_later(0, lambda: on_error(req, result, data))
+    return req
+
+
+def start_request(transport, url, method="GET", body=None, headers=None,
+                  on_success=None, on_failure=None, on_error=None,
+                  on_redirect=None, on_progress=None, priority=None,
+                  **kwargs):
+    """
+    Starts a request with transport.request, taking the same args. If a
+    RequestThrottle was registered the request may instead wait in its
+    queue, with the other requests of its priority class, until the rate
+    and in flight limits allow it to start. priority defaults to the class
+    given by **RequestThrottle.priority_for**.
+
+    Return:
+        object: The request being made, or a QueuedRequest if it has to
+        wait.
+
+    """
+    throttle = get_throttle()
+    if throttle is None:
+        return transport.request(
+            url, method=method, body=body, headers=headers,
+            on_success=on_success, on_failure=on_failure, on_error=on_error,
+            on_redirect=on_redirect, on_progress=on_progress, **kwargs)
+    key = throttle.key_for(url, headers)
+    if priority is None:
+        priority = throttle.priority_for(url)
+    ticket = QueuedRequest(url, priority)
+    ticket.on_error = on_error
+
+    def release(callback):
+        def handler(req, result):
+            throttle.release(transport, key, ticket)
+            if callback is not None:
+                callback(req, result)
+        return handler
+
+    def start():
+        return transport.request(
+            url, method=method, body=body, headers=headers,
+            on_success=release(on_success), on_failure=release(on_failure),
+            on_error=release(on_error), on_redirect=release(on_redirect),
+            on_progress=on_progress, **kwargs)
+    return throttle.submit(transport, key, ticket, start)
+
+
+def make_retrying_request(policy, url, method, body, header, on_success,
+                          on_failure, on_error, on_redirect, on_progress,
+                          data, kwargs):
+    """
+    Makes the request like **make_request** and makes it again, after the
+    delay given by policy, when it fails with a status in policy.retry_on or
+    errors. on_failure and on_error are only called once policy gives up.
+
+    The number of retries made is stored in data as 'retry_count' before
+    any callback is called, when data is a dict.
+
+    Args:
+        policy (RetryPolicy): The policy deciding on retries.
+
+        url (str): The url with its query already encoded.
+
+        method (str): The type of request being made.
+
+        body (str): The already encoded body.
+
+        header (dict): The header for the request.
+
+        The callbacks and data are the same as **make_request**'s, kwargs
+        are passed to the transport.
+
+    Return:
+        UrlRequest: The request of the first attempt.
+
+    """
+    # retries are scheduled outside of any using_transport block
+    transport = get_transport()
+    attempts = [0]
+
+    def deliver(callback):
+        if callback is None:
+            return None
+
+        def handler(req, *args):
+            if isinstance(data, dict):
+                data['retry_count'] = attempts[0] - 1
+            callback(req, *(args + (data,)))
+        return handler
+
+    def retry_or(callback, error):
+        callback = deliver(callback)
+
+        def handler(req, result):
+            status = None if error else getattr(req, 'resp_status', None)
+            if policy.should_retry(attempts[0], status=status, error=error):
+                delay = policy.delay(attempts[0],
+                                     None if error else req._resp_headers)
+                transport.call_later(delay, bind_application(attempt))
+            elif callback is not None:
+                callback(req, result)
+        return handler
+
+    def attempt():
+        attempts[0] += 1
+        return start_request(
+            transport, url, method=method, body=body, headers=header,
+            on_success=deliver(on_success),
+            on_failure=retry_or(on_failure, False),
+            on_error=retry_or(on_error, True),
+            on_redirect=deliver(on_redirect),
+            on_progress=deliver(on_progress), **kwargs)
+
+    return attempt()
 
 
 def make_request_default(endpoint, method="GET", success_callback=None,
@@ -142,7 +706,8 @@ def make_request_default(endpoint, method="GET", success_callback=None,
         failure_callback (function): Callback for failures and errors. 
         Will have the signature:
             on_failure(failure_type (string), result (dict), data (dict))
-        Values for failure type are: 'error', 'failure'. Defaults to None.
+        Values for failure type are: 'error', 'failure', 'circuit_open'.
+        Defaults to None.
 
         redirect_callback (function): Callback for redirect, 
         Will have the signature:
@@ -185,11 +750,18 @@ def make_request_custom_success(endpoint, success_handler, method="GET",
                                 success_callback=None, failure_callback=None,
                                 redirect_callback=None,
                                 progress_callback=None, data=None, body=None,
-                                header=None, params=None):
+                                header=None, params=None, file_path=None,
+                                cacheable=True):
     """
     Creates a request with a custom success handler and the default failure
     and progress handlers.
 
+    If a ResponseCache was registered, GET requests are served from it or
+    made conditional, see **make_cached_request**, and other requests
+    invalidate the cached responses of their endpoint. GET requests without
+    a success_callback bypass the cache, requests streamed to a file_path
+    are never cached or shared.
+
     Args:
         endpoint (str): The endpoint the request will go to.
 
@@ -209,8 +781,8 @@ def make_request_custom_success(endpoint, success_handler, method="GET",
         failure_callback (function): Callback for redirects, failures, and
         errors. Will have the signature:
             on_failure(failure_type (string), result (dict), data (dict))
-        Values for failure type are: 'error', 'redirect', 'failure'. Defaults
-        to None.
+        Values for failure type are: 'error', 'redirect', 'failure',
+        'circuit_open'. Defaults to None.
 
         redirect_callback (function): Callback for redirect, 
         Will have the signature:
@@ -231,6 +803,13 @@ def make_request_custom_success(endpoint, success_handler, method="GET",
         to the various callbacks of a request. Each callback will receive the
         data in here. Defaults to empty dict.
 
+        file_path (str): If not None the response is streamed into this file
+        instead of being kept in memory. Defaults to None.
+
+        cacheable (bool): If False a GET request bypasses the cache, for
+        success handlers building other objects than the usual ones of
+        endpoint. Defaults to True.
+
     Return:
         UrlRequest: The request being made.
 
@@ -241,11 +820,173 @@ def make_request_custom_success(endpoint, success_handler, method="GET",
     data['failure_callback'] = failure_callback
     data['progress_callback'] = progress_callback
     data['redirect_callback'] = redirect_callback
-    return make_request(endpoint, method=method, on_success=success_handler,
+    cache = get_cache() if file_path is None else None
+    if cache is not None:
+        if method != "GET":
+            cache.invalidate(endpoint)
+        elif success_callback is not None and cacheable:
+            return make_cached_request(cache, endpoint, success_handler,
+                                       data=data, header=header,
+                                       params=params)
+    request_func = make_request
+    kwargs = {}
+    if file_path is not None:
+        kwargs['file_path'] = file_path
+    elif method == "GET" and coalescing_enabled():
+        request_func = make_single_flight_request
+    return request_func(endpoint, method=method, on_success=success_handler,
                         on_failure=default_failure, on_error=default_error,
                         on_redirect=default_redirect,
                         on_progress=default_progress,
-                        body=body, header=header, data=data, params=params)
+                        body=body, header=header, data=data, params=params,
+                        **kwargs)
+
+
+def make_cached_request(cache, endpoint, success_handler, data, header=None,
+                        params=None):
+    """
+    Makes a GET request through cache. A fresh cached response is handed to
+    the success_callback without making a request. Otherwise the request is
+    made with If-None-Match/If-Modified-Since from the cached validators and
+    a 304 response hands the cached objects to the success_callback without
+    parsing. With cache.serve_stale the stale objects are also handed to the
+    callback of **using_stale_callback** while the request is made. The
+    objects passed to the success_callback by success_handler are cached for
+    the next request.
+
+    Args:
+        cache (ResponseCache): The cache to use.
+
+        endpoint (str): The endpoint the request will go to.
+
+        success_handler (function): The success handler of the request, see
+        **make_request_custom_success**.
+
+        data (dict): Wildcard dict prepared by
+        **make_request_custom_success**.
+
+    Kwargs:
+        header (dict): The header for the request. Defaults to None.
+
+        params (dict): The query params of the request. Defaults to None.
+
+    Return:
+        UrlRequest: The request being made, or an already finished
+        TransportRequest if the response was fresh in the cache.
+
+    """
+    url = encode_url(endpoint, params)
+    key = cache.make_key(url, header)
+    entry = cache.get(key)
+    success_callback = data['success_callback']
+    if entry is not None and entry.is_fresh():
+        req = TransportRequest(url, "GET", None, header)
+        req._resp_status = 200
+        req._finished.set()
+        get_transport().call_later(0, lambda: success_callback(*entry.args))
+        return req
+
+    def cached_success(req, results, data):
+        def store(*args):
+            cache.store(key, req._resp_headers, args)
+            success_callback(*args)
+        data['success_callback'] = store
+        try:
+            success_handler(req, results, data)
+        finally:
+            data['success_callback'] = success_callback
+
+    stale_callback = _stale_callback.get()
+    if (entry is not None and cache.serve_stale and
+            stale_callback is not None):
+        get_transport().call_later(0, lambda: stale_callback(*entry.args))
+
+    def cached_redirect(req, results, data):
+        if entry is not None and req.resp_status == 304:
+            cache.refresh(key, entry, req._resp_headers)
+            success_callback(*entry.args)
+        else:
+            default_redirect(req, results, data)
+
+    if entry is not None:
+        header = cache.conditional_header(entry, header)
+    request_func = make_request
+    if coalescing_enabled():
+        request_func = make_single_flight_request
+    return request_func(url, method="GET", on_success=cached_success,
+                        on_failure=default_failure, on_error=default_error,
+                        on_redirect=cached_redirect,
+                        on_progress=default_progress,
+                        header=header, data=data)
+
+
+class SharedRequest(object):
+    """
+    A GET request shared by every identical request made while it is in
+    flight.
+
+    **Attributes:**
+        **request** (UrlRequest): The request actually made.
+
+        **waiters** (list): (on_success, on_failure, on_error, on_redirect,
+        on_progress, data) tuples of every caller sharing the request.
+    """
+
+    def __init__(self, waiter):
+        self.request = None
+        self.waiters = [waiter]
+
+
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+
+def make_single_flight_request(endpoint, method="GET", on_success=None,
+                               on_failure=None, on_error=None,
+                               on_redirect=None, on_progress=None,
+                               body=None, header=None, data=None,
+                               params=None):
+    """
+    Takes the same arguments as **make_request** but if an identical GET
+    request, same url, params and header (and so the same token), is already
+    in flight no new request is made. Instead the callbacks are registered
+    on the request in flight and every caller's callbacks receive its
+    result, each with its own data.
+
+    Return:
+        UrlRequest: The request being made, possibly shared with other
+        callers.
+
+    """
+    url = encode_url(endpoint, params)
+    key = (method, url, tuple(sorted((header or {}).items())))
+    waiter = (on_success, on_failure, on_error, on_redirect, on_progress,
+              data)
+    with _in_flight_lock:
+        shared = _in_flight.get(key)
+        if shared is not None:
+            shared.waiters.append(waiter)
+            return shared.request
+        shared = _in_flight[key] = SharedRequest(waiter)
+
+    def fan_out(index, final=True):
+        def callback(req, *args):
+            if final:
+                with _in_flight_lock:
+                    if _in_flight.get(key) is shared:
+                        del _in_flight[key]
+            # the last arg is make_request's data, each waiter has its own
+            args = args[:-1]
+            for waiter in list(shared.waiters):
+                if waiter[index] is not None:
+                    waiter[index](req, *(args + (waiter[5],)))
+        return callback
+
+    shared.request = make_request(
+        url, method=method, on_success=fan_out(0), on_failure=fan_out(1),
+        on_error=fan_out(2), on_redirect=fan_out(3),
+        on_progress=fan_out(4, final=False), body=body, header=header)
+    return shared.request
 
 
 def default_redirect(req, results, data):
@@ -326,7 +1067,9 @@ def default_failure(req, results, data):
 def default_error(req, results, data):
     """
     Default handler for an error callback. Will call the 'failure_callback'
-    provided in data with the args: 'error', results, data
+    provided in data with the args: 'error', results, data, or
+    'circuit_open', results, data if the request was rejected by the
+    CircuitBreaker.
 
     If the value of 'failure_callback' is None, nothing will be called.
 
@@ -345,7 +1088,10 @@ def default_error(req, results, data):
     """
     if data['failure_callback'] is None:
         return
-    data['failure_callback']('error', results, data)
+    if isinstance(req, CircuitOpenRequest):
+        data['failure_callback']('circuit_open', results, data)
+    else:
+        data['failure_callback']('error', results, data)
 
 
 def default_progress(req, current_size, total_size, data):
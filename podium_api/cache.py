@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+In memory cache of GET responses used by
+**podium_api.asyncreq.make_request_custom_success**.
+
+Each entry stores the validators of a response (ETag and Last-Modified) and
+the already converted objects that were handed to the success_callback.
+While an entry is fresh it is returned without making a request, once stale
+the request is made conditional and a 304 Not Modified response hands the
+cached objects to the success_callback again without parsing anything.
+
+Enable it by passing a ResponseCache to
+**podium_api.register_podium_application**. A
+**podium_api.sqlitecache.SQLiteResponseCache** keeps the responses across
+restarts of the application.
+"""
+import re
+import threading
+import time
+from collections import OrderedDict
+
+
+class CacheEntry(object):
+    """
+    A cached response.
+
+    **Attributes:**
+        **etag** (str): ETag header of the response, may be None.
+
+        **last_modified** (str): Last-Modified header of the response, may be
+        None.
+
+        **args** (tuple): The args the success_callback was called with.
+
+        **expires** (float): time.monotonic() after which the entry has to be
+        revalidated.
+    """
+
+    def __init__(self, etag, last_modified, args, expires):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.args = args
+        self.expires = expires
+
+    def is_fresh(self):
+        return time.monotonic() < self.expires
+
+
+def get_header(headers, name):
+    """
+    Case insensitive lookup of name in the response headers dict.
+    """
+    if not headers:
+        return None
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+class ResponseCache(object):
+    """
+    Size bounded LRU cache of GET responses keyed by url and Authorization
+    header.
+
+    Kwargs:
+        max_entries (int): Maximum number of responses kept, the least
+        recently used is dropped first. Defaults to 256.
+
+        default_ttl (float): Seconds a response is used without
+        revalidating it. Defaults to 0, always revalidate.
+
+        ttl_policy (list): List of (pattern (str), ttl (float)) tuples. The
+        ttl of the first pattern found in the url, as a regular expression
+        search, is used instead of default_ttl. For example:
+            [(r'/api/v1/venues', 3600), (r'/api/v1/events/\\d+\\?', 60)]
+
+        serve_stale (bool): Hand a stale entry to the callback of
+        **podium_api.asyncreq.using_stale_callback** right away while it is
+        revalidated. Defaults to False.
+
+    """
+
+    def __init__(self, max_entries=256, default_ttl=0, ttl_policy=None,
+                 serve_stale=False):
+        self.max_entries = max_entries
+        self.serve_stale = serve_stale
+        self.default_ttl = default_ttl
+        self.ttl_policy = [(re.compile(pattern), ttl)
+                           for pattern, ttl in (ttl_policy or [])]
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def make_key(self, url, header):
+        authorization = None
+        if header is not None:
+            authorization = header.get('Authorization')
+        return (url, authorization)
+
+    def ttl_for(self, url):
+        for pattern, ttl in self.ttl_policy:
+            if pattern.search(url):
+                return ttl
+        return self.default_ttl
+
+    def get(self, key):
+        """
+        Returns the CacheEntry for key, fresh or not, or None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def store(self, key, resp_headers, args):
+        """
+        Stores the args the success_callback received for the response with
+        resp_headers. Responses without validators are only kept if they
+        have a ttl.
+
+        Return:
+            CacheEntry: The new entry or None if it was not stored.
+
+        """
+        ttl = self.ttl_for(key[0])
+        etag = get_header(resp_headers, 'ETag')
+        last_modified = get_header(resp_headers, 'Last-Modified')
+        if etag is None and last_modified is None and ttl <= 0:
+            return None
+        entry = CacheEntry(etag, last_modified, args, time.monotonic() + ttl)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def refresh(self, key, entry, resp_headers):
+        """
+        Marks entry as fresh again after a 304 response, picking up new
+        validators if the server sent any.
+        """
+        entry.etag = get_header(resp_headers, 'ETag') or entry.etag
+        entry.last_modified = get_header(
+            resp_headers, 'Last-Modified') or entry.last_modified
+        entry.expires = time.monotonic() + self.ttl_for(key[0])
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+
+    def conditional_header(self, entry, header):
+        """
+        Returns a copy of header with If-None-Match and If-Modified-Since
+        set from the validators of entry.
+        """
+        header = dict(header or {})
+        if entry.etag is not None:
+            header['If-None-Match'] = entry.etag
+        if entry.last_modified is not None:
+            header['If-Modified-Since'] = entry.last_modified
+        return header
+
+    def invalidate(self, uri=None):
+        """
+        Drops every entry whose url starts with uri, or all entries if uri is
+        None.
+        """
+        with self._lock:
+            if uri is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries
+                        if key[0].startswith(uri)]:
+                del self._entries[key]
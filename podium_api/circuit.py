@@ -0,0 +1,226 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Circuit breaker for the requests made by **podium_api.asyncreq.make_request**.
+Enable it by passing a CircuitBreaker to
+**podium_api.register_podium_application**.
+
+Requests are grouped in endpoint families, for example every
+/api/v1/events/{id}/racestats request is in the same family. After
+failure_threshold consecutive failures of a family its circuit opens and its
+requests fail immediately, with the failure_type 'circuit_open', instead of
+waiting for a dead backend. Once reset_timeout has passed the circuit is
+half open: half_open_probes requests are made, and the circuit closes again
+once they all succeed or opens for another reset_timeout if one fails or
+they did not all complete within probe_timeout.
+"""
+import re
+import threading
+import time
+from urllib.parse import urlparse
+from podium_api.transport import TransportRequest
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenRequest(TransportRequest):
+    """
+    The request passed to the on_error callback of a request rejected
+    because the circuit of its endpoint family is open. It is never made.
+    """
+
+
+class Circuit(object):
+    """
+    State of the circuit of one endpoint family.
+
+    **Attributes:**
+        **state** (str): 'closed', 'open' or 'half_open'.
+
+        **failures** (int): Consecutive failures while closed.
+
+        **opened_at** (float): time.monotonic() when the circuit last
+        opened.
+
+        **probes** (int): Requests made since the circuit became half open.
+
+        **successes** (int): Probe requests that succeeded.
+
+        **probed_at** (float): time.monotonic() when the last probe request
+        was made.
+    """
+
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.probes = 0
+        self.successes = 0
+        self.probed_at = None
+
+
+class CircuitBreaker(object):
+    """
+    Stops making the requests of an endpoint family that keeps failing.
+
+    Kwargs:
+        failure_threshold (int): Consecutive failures opening the circuit.
+        Defaults to 5.
+
+        reset_timeout (float): Seconds the circuit stays open before probe
+        requests are made. Defaults to 30.
+
+        half_open_probes (int): Requests made while half open, all of them
+        have to succeed to close the circuit. Defaults to 1.
+
+        probe_timeout (float): Seconds a probe request has to complete in,
+        the circuit opens again if it does not. Defaults to reset_timeout.
+
+        failure_statuses (tuple): Response status codes counted as failures,
+        besides errors such as timeouts. Other responses show the backend is
+        up. Defaults to (429, 500, 502, 503, 504).
+
+        patterns (list): Regular expressions naming the endpoint families,
+        the first one found in a url is its family. Urls matching none are
+        grouped by their path with the numeric ids replaced, so
+        /api/v1/events/12/racestats is in /api/v1/events/{id}/racestats.
+        Defaults to None.
+
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0,
+                 half_open_probes=1, probe_timeout=None,
+                 failure_statuses=(429, 500, 502, 503, 504), patterns=None):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_probes = half_open_probes
+        if probe_timeout is None:
+            probe_timeout = reset_timeout
+        self.probe_timeout = probe_timeout
+        self.failure_statuses = frozenset(failure_statuses)
+        self.patterns = [re.compile(pattern) for pattern in patterns or ()]
+        self._circuits = {}
+        self._lock = threading.Lock()
+
+    def family_for(self, url):
+        """
+        Returns the endpoint family of url.
+        """
+        for pattern in self.patterns:
+            if pattern.search(url):
+                return pattern.pattern
+        return re.sub(r'/\d+(?=/|$)', '/{id}', urlparse(url).path)
+
+    def state(self, family):
+        """
+        Returns the state of the circuit of family, 'closed', 'open' or
+        'half_open'.
+        """
+        with self._lock:
+            circuit = self._circuits.get(family)
+            if circuit is None:
+                return CLOSED
+            self._expire_probes(circuit)
+            if circuit.state == OPEN and self._cooled_down(circuit):
+                return HALF_OPEN
+            return circuit.state
+
+    def retry_in(self, family):
+        """
+        Returns the seconds until the open circuit of family makes a probe
+        request, 0 if it is not open.
+        """
+        with self._lock:
+            circuit = self._circuits.get(family)
+            if circuit is not None:
+                self._expire_probes(circuit)
+            if circuit is None or circuit.state != OPEN:
+                return 0
+            return max(0.0, circuit.opened_at + self.reset_timeout -
+                       time.monotonic())
+
+    def allow(self, family):
+        """
+        Returns True if a request of family can be made, counting it as a
+        probe when the circuit is half open.
+        """
+        with self._lock:
+            circuit = self._circuits.get(family)
+            if circuit is None or circuit.state == CLOSED:
+                return True
+            self._expire_probes(circuit)
+            if circuit.state == OPEN:
+                if not self._cooled_down(circuit):
+                    return False
+                circuit.state = HALF_OPEN
+                circuit.probes = 0
+                circuit.successes = 0
+            if circuit.probes >= self.half_open_probes:
+                return False
+            circuit.probes += 1
+            circuit.probed_at = time.monotonic()
+            return True
+
+    def release(self, family):
+        """
+        Gives back the probe slot taken by **allow** for a request of family
+        that will never complete, for example a request cancelled before it
+        started.
+        """
+        with self._lock:
+            circuit = self._circuits.get(family)
+            if (circuit is not None and circuit.state == HALF_OPEN and
+                    circuit.probes > circuit.successes):
+                circuit.probes -= 1
+
+    def is_failure(self, status=None, error=False):
+        return error or status in self.failure_statuses
+
+    def record(self, family, failed):
+        """
+        Records the outcome of a request of family.
+
+        Args:
+            family (str): The family returned by **family_for**.
+
+            failed (bool): True if the request failed, see **is_failure**.
+
+        """
+        with self._lock:
+            circuit = self._circuits.get(family)
+            if circuit is None:
+                if not failed:
+                    return
+                circuit = self._circuits[family] = Circuit()
+            if circuit.state == OPEN:
+                # a request made before the circuit opened
+                return
+            if circuit.state == HALF_OPEN and not failed:
+                circuit.successes += 1
+                if circuit.successes >= self.half_open_probes:
+                    circuit.state = CLOSED
+            elif not failed:
+                circuit.failures = 0
+            elif circuit.state == HALF_OPEN:
+                self._open(circuit)
+            else:
+                circuit.failures += 1
+                if circuit.failures >= self.failure_threshold:
+                    self._open(circuit)
+
+    def _open(self, circuit):
+        circuit.state = OPEN
+        circuit.failures = 0
+        circuit.opened_at = time.monotonic()
+
+    def _expire_probes(self, circuit):
+        # probes that never completed, the backend is still not answering
+        if (circuit.state == HALF_OPEN and
+                circuit.probes > circuit.successes and
+                time.monotonic() - circuit.probed_at >= self.probe_timeout):
+            self._open(circuit)
+
+    def _cooled_down(self, circuit):
+        return time.monotonic() - circuit.opened_at >= self.reset_timeout
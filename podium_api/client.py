@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Client objects for talking to several Podium applications or servers from
+one process, for example production and staging, each with its own
+credentials, transport, cache and limits.
+
+The module level functions keep using the application registered with
+**podium_api.register_podium_application**, the default client. A
+PodiumClient makes them use its own application instead:
+
+    staging = PodiumClient(app_id, app_secret,
+                           podium_url='https://staging.podium.live',
+                           transport=PooledTransport())
+    staging.call(make_events_get, token, success_callback=on_events)
+
+    with staging.activate():
+        make_login_post(username, password, success_callback=on_login)
+
+Clients can be used concurrently from several threads or asyncio tasks.
+"""
+from podium_api import using_podium_application
+from podium_api.types.application import PodiumApplication
+
+
+class PodiumClient(object):
+    """
+    Owns a PodiumApplication and runs requests with it.
+
+    Args:
+        app_id (string): The UUID for your application as registered with
+        the Podium API.
+
+        app_secret (string): The secret for your application as registered
+        with the Podium API.
+
+    Kwargs:
+        podium_url and the remaining kwargs are the same as
+        **podium_api.register_podium_application**'s.
+
+    **Attributes:**
+        **application** (PodiumApplication): The application of the client.
+    """
+
+    def __init__(self, app_id, app_secret, podium_url=None, **kwargs):
+        self.application = PodiumApplication(app_id, app_secret,
+                                             podium_url=podium_url, **kwargs)
+
+    @classmethod
+    def from_application(cls, application):
+        """
+        Returns a PodiumClient using application, for example
+        podium_api.PODIUM_APP.
+        """
+        client = cls.__new__(cls)
+        client.application = application
+        return client
+
+    @property
+    def podium_url(self):
+        return self.application.podium_url
+
+    def activate(self):
+        """
+        Returns a context manager making every request started inside the
+        with block, in the current thread or asyncio task, use this client.
+        """
+        return using_podium_application(self.application)
+
+    def call(self, request_func, *args, **kwargs):
+        """
+        Calls request_func, one of the make_* request functions, with args
+        and kwargs using this client.
+
+        Return:
+            object: What request_func returned, usually the request being
+            made.
+
+        """
+        with using_podium_application(self.application):
+            return request_func(*args, **kwargs)
+
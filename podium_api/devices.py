@@ -169,7 +169,7 @@ def make_device_create(token, name,
         UrlRequest: The request being made.
 
     """
-    endpoint = '{}/api/v1/devices'.format(podium_api.PODIUM_APP.podium_url)
+    endpoint = '{}/api/v1/devices'.format(podium_api.get_podium_application().podium_url)
     body = {'device[name]': name}
     header = get_json_header_token(token)
     return make_request_custom_success(
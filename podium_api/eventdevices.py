@@ -73,7 +73,7 @@ def make_eventdevices_get(token, event_id=None,
         if event_id is None:
             raise NoEndpointOrIdsProvided()
         endpoint = '{}/api/v1/events/{}/devices'.format(
-            podium_api.PODIUM_APP.podium_url,
+            podium_api.get_podium_application().podium_url,
             event_id
             )
     params = {}
@@ -152,7 +152,7 @@ def make_livestreams_get(token,
     """
     if endpoint is None:
         endpoint = '{}/api/v1/livestreams'.format(
-            podium_api.PODIUM_APP.podium_url)
+            podium_api.get_podium_application().podium_url)
     params = {}
     if expand is not None:
         params['expand'] = expand
@@ -432,7 +432,7 @@ def make_eventdevice_create(token, event_id, device_id, name,
 
     """
     endpoint = '{}/api/v1/events/{}/devices'.format(
-        podium_api.PODIUM_APP.podium_url,
+        podium_api.get_podium_application().podium_url,
         event_id
         )
     body = {'eventdevice[device_id]': device_id, 'eventdevice[name]': name,
@@ -119,7 +119,7 @@ def make_event_create(token, title, start_time, end_time, venue_id=None,
         UrlRequest: The request being made.
 
     """
-    endpoint = '{}/api/v1/events'.format(podium_api.PODIUM_APP.podium_url)
+    endpoint = '{}/api/v1/events'.format(podium_api.get_podium_application().podium_url)
     body = {'event[title]': title, 'event[start_time]': start_time,
             'event[end_time]': end_time}
     if venue_id is not None:
@@ -291,7 +291,7 @@ def make_events_get(token, start=None, per_page=None,
 
     """
     if endpoint is None:
-        endpoint = '{}/api/v1/events'.format(podium_api.PODIUM_APP.podium_url)
+        endpoint = '{}/api/v1/events'.format(podium_api.get_podium_application().podium_url)
     params = {}
     if expand is not None:
         params['expand'] = expand
@@ -220,7 +220,7 @@ def make_friendship_create(token, friend_id,
         UrlRequest: The request being made.
 
     """
-    endpoint = '{}/api/v1/friendships'.format(podium_api.PODIUM_APP.podium_url)
+    endpoint = '{}/api/v1/friendships'.format(podium_api.get_podium_application().podium_url)
     body = {'friendship[user_id]': friend_id}
     header = get_json_header_token(token)
     return make_request_custom_success(
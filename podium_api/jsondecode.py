@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+JSON decoders used by the transports to load response bodies. orjson and
+ujson are optional dependencies of podium_api, the fastest one installed is
+used by default and the standard library json module otherwise.
+
+**Module Attributes:**
+    **DECODERS** (dict): The loads function of every available library by
+    name, 'orjson', 'ujson' and 'json'.
+
+    **DEFAULT_DECODER** (str): Name of the fastest available decoder.
+"""
+import json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+DECODERS = {'json': json.loads}
+if ujson is not None:
+    DECODERS['ujson'] = ujson.loads
+if orjson is not None:
+    DECODERS['orjson'] = orjson.loads
+
+DEFAULT_DECODER = next(name for name in ('orjson', 'ujson', 'json')
+                       if name in DECODERS)
+
+
+def get_json_decoder(name=None):
+    """
+    Returns the loads function of a JSON library. Every decoder accepts the
+    raw bytes of a response as well as a str.
+
+    Kwargs:
+        name (str): 'orjson', 'ujson' or 'json', None for DEFAULT_DECODER.
+        Defaults to None.
+
+    Return:
+        function: The loads function.
+
+    """
+    if name is None:
+        name = DEFAULT_DECODER
+    try:
+        return DECODERS[name]
+    except KeyError:
+        raise ImportError("The {} JSON decoder is not installed, install it "
+                          "with 'pip install {}'".format(name, name))
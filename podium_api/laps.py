@@ -1,8 +1,17 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
-from podium_api.asyncreq import make_request_custom_success, get_json_header_token
+import os
+import tempfile
+from podium_api.asyncreq import (make_request, make_request_custom_success,
+                                 get_json_header_token, get_transport,
+                                 default_error, default_failure,
+                                 default_redirect, default_progress)
+from podium_api.cache import get_header
+from podium_api.transport import decode_result
 from podium_api.types.paged_response import get_paged_response_from_json
 from podium_api.types.lap import get_lap_from_json
+from podium_api.types.laptable import get_lap_table_from_json
+from podium_api.types.rawdata import get_lap_raw_data_from_csv
 
 
 def make_lap_get(token, endpoint,
@@ -70,7 +79,8 @@ def make_laps_get(token, endpoint,
                   expand=True,
                   quiet=None, success_callback=None,
                   redirect_callback=None,
-                  failure_callback=None, progress_callback=None):
+                  failure_callback=None, progress_callback=None,
+                  as_table=False):
     """
     Request that returns a PodiumPagedRequest of laps.
 
@@ -109,6 +119,13 @@ def make_laps_get(token, endpoint,
 
         per_page (int): Number per page of results, max of 100.
 
+        as_table (bool): If True the payload of the PodiumPagedResponse is a
+        LapTable instead of a list of PodiumLap. Requires numpy. Such
+        responses are not cached and can not be paged with
+        **podium_api.paging.iterate_all**, join the pages with
+        **podium_api.types.laptable.concatenate_lap_tables** instead.
+        Defaults to False.
+
     Return:
         UrlRequest: The request being made.
 
@@ -125,13 +142,186 @@ def make_laps_get(token, endpoint,
         params['per_page'] = per_page
 
     header = get_json_header_token(token)
-    return make_request_custom_success(endpoint, laps_success_handler,
+    success_handler = laps_success_handler
+    if as_table:
+        success_handler = laps_table_success_handler
+    return make_request_custom_success(endpoint, success_handler,
                                        method="GET",
                                        success_callback=success_callback,
                                        failure_callback=failure_callback,
                                        progress_callback=progress_callback,
                                        redirect_callback=redirect_callback,
-                                       params=params, header=header)
+                                       params=params, header=header,
+                                       cacheable=not as_table)
+
+
+def make_lap_raw_data_get(token, raw_data_uri, directory,
+                          success_callback=None, redirect_callback=None,
+                          failure_callback=None, progress_callback=None,
+                          keep_csv=False):
+    """
+    Request that downloads the logged telemetry of a lap and returns it as a
+    LapRawData. The response is streamed to a csv file of its own in
+    directory in chunks, never held in memory, then converted into one
+    memory mappable file per channel. The body of a failed request is
+    decoded from the csv and passed to the failure_callback.
+
+    Args:
+        token (PodiumToken): The authentication token for this session.
+
+        raw_data_uri (str): The raw_data_uri of a PodiumLap.
+
+        directory (str): Directory the data is stored in, created if needed.
+
+    Kwargs:
+        success_callback (function): Callback for a successful request,
+        will have the signature:
+            on_success(LapRawData)
+        Defaults to None.
+
+        failure_callback (function): Callback for failures and errors.
+        Will have the signature:
+            on_failure(failure_type (string), result (dict), data (dict))
+        Values for failure type are: 'error', 'failure'. Defaults to None.
+
+        redirect_callback (function): Callback for redirect,
+        Will have the signature:
+            on_redirect(result (dict), data (dict))
+        Defaults to None.
+
+        progress_callback (function): Callback for download progress,
+        will have the signature:
+            on_progress(current_size (int), total_size (int), data (dict))
+        Defaults to None.
+
+        keep_csv (bool): Keep the downloaded csv, the file_path of the
+        request, in directory once it has been converted. Defaults to False.
+
+    Return:
+        UrlRequest: The request being made.
+
+    """
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    fd, file_path = tempfile.mkstemp(prefix='raw_data-', suffix='.csv',
+                                     dir=directory)
+    os.close(fd)
+    header = dict(get_json_header_token(token))
+    header['Accept'] = 'text/csv'
+    data = {'directory': directory, 'keep_csv': keep_csv,
+            'file_path': file_path, 'success_callback': success_callback,
+            'failure_callback': failure_callback,
+            'progress_callback': progress_callback,
+            'redirect_callback': redirect_callback}
+    return make_request(raw_data_uri, method="GET",
+                        on_success=lap_raw_data_success_handler,
+                        on_failure=lap_raw_data_failure_handler,
+                        on_error=lap_raw_data_error_handler,
+                        on_redirect=lap_raw_data_redirect_handler,
+                        on_progress=default_progress, header=header,
+                        data=data, file_path=file_path)
+
+
+def lap_raw_data_success_handler(req, results, data):
+    """
+    Converts the downloaded csv with the run_in_worker of the transport,
+    off the thread the callbacks run on, and returns a LapRawData to the
+    success_callback found in data if there is one. A failed conversion is
+    reported to the failure_callback as an 'error'.
+
+    Called automatically by **make_lap_raw_data_get**.
+
+    Args:
+        req (UrlRequest): Instace of the request that was made.
+
+        results (str): Unused, the csv is read from req.file_path.
+
+        data (dict): Wildcard dict for containing data that needs to be passed
+        to the various callbacks of a request. Will contain at least a
+        'success_callback', 'directory' and 'keep_csv' key.
+
+    Return:
+        None, this function instead calls a callback.
+
+    """
+    def convert():
+        raw_data = get_lap_raw_data_from_csv(req.file_path, data['directory'])
+        if not data['keep_csv']:
+            os.remove(req.file_path)
+        return raw_data
+
+    def on_done(raw_data):
+        if data['success_callback'] is not None:
+            data['success_callback'](raw_data)
+
+    get_transport().run_in_worker(
+        convert, on_done, lambda error: default_error(req, error, data))
+
+
+def lap_raw_data_failure_handler(req, results, data):
+    """
+    Reads the error body the server sent from the downloaded csv, removes
+    the csv and passes the decoded body to the failure_callback found in
+    data if there is one.
+
+    Called automatically by **make_lap_raw_data_get**.
+
+    Args:
+        req (UrlRequest): Instace of the request that was made.
+
+        results (str): Unused, the body is read from the 'file_path' in
+        data.
+
+        data (dict): Wildcard dict for containing data that needs to be passed
+        to the various callbacks of a request. Will contain at least a
+        'failure_callback' and 'file_path' key.
+
+    Return:
+        None, this function instead calls a callback.
+
+    """
+    try:
+        with open(data['file_path'], 'rb') as csv_file:
+            body = csv_file.read()
+    except (IOError, OSError):
+        body = None
+    remove_raw_data_csv(data)
+    if body is not None:
+        body = decode_result(
+            get_header(req.resp_headers, 'Content-Type'), body)
+    default_failure(req, body, data)
+
+
+def lap_raw_data_error_handler(req, results, data):
+    """
+    Removes the csv of a request that could not be made, then calls
+    **default_error**.
+
+    Called automatically by **make_lap_raw_data_get**.
+    """
+    remove_raw_data_csv(data)
+    default_error(req, results, data)
+
+
+def lap_raw_data_redirect_handler(req, results, data):
+    """
+    Removes the csv of a redirected request, then calls
+    **default_redirect**.
+
+    Called automatically by **make_lap_raw_data_get**.
+    """
+    remove_raw_data_csv(data)
+    default_redirect(req, results, data)
+
+
+def remove_raw_data_csv(data):
+    """
+    Removes the csv at the 'file_path' in data, if it still exists.
+    """
+    try:
+        os.remove(data['file_path'])
+    except OSError:
+        pass
 
 
 def laps_success_handler(req, results, data):
@@ -158,6 +348,31 @@ def laps_success_handler(req, results, data):
         data['success_callback'](get_paged_response_from_json(results, "laps"))
 
 
+def laps_table_success_handler(req, results, data):
+    """
+    Creates and returns a PodiumPagedResponse with a LapTable as the
+    payload to the success_callback found in data if there is one.
+
+    Called automatically by **make_laps_get** when as_table is True.
+
+    Args:
+        req (UrlRequest): Instace of the request that was made.
+
+        results (dict): Dict returned by the request.
+
+        data (dict): Wildcard dict for containing data that needs to be passed
+        to the various callbacks of a request. Will contain at least a
+        'success_callback' key.
+
+    Return:
+        None, this function instead calls a callback.
+
+    """
+    if data['success_callback'] is not None:
+        data['success_callback'](get_paged_response_from_json(
+            results, "laps", payload_func=get_lap_table_from_json))
+
+
 def lap_success_handler(req, results, data):
     """
     Creates and returns a PodiumLap.
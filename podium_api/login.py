@@ -38,7 +38,7 @@ def make_login_post(username, password, success_callback=None,
         UrlRequest: The request being made.
 
     """
-    endpoint = '{}/oauth/token'.format(podium_api.PODIUM_APP.podium_url)
+    endpoint = '{}/oauth/token'.format(podium_api.get_podium_application().podium_url)
     body = {'grant_type': 'password', 'username': username,
             'password': password}
     header = get_json_header()
@@ -51,6 +51,50 @@ def make_login_post(username, password, success_callback=None,
                                        body=body, header=header)
 
 
+def make_token_refresh_post(refresh_token, success_callback=None,
+                            failure_callback=None, progress_callback=None,
+                            redirect_callback=None):
+    """
+    Request that hits the /oauth/token endpoint to exchange the
+    refresh_token of an expiring PodiumToken for a new token. Will
+    internally use **make_request_custom_success**.
+
+    Args:
+        refresh_token (string): The refresh_token of the PodiumToken.
+
+    Kwargs:
+        success_callback (function): Callback for a successful request,
+        will have the signature:
+            on_success(token (PodiumToken))
+        Defaults to None.
+
+        failure_callback (function): Callback for redirects, failures, and
+        errors. Will have the signature:
+            on_failure(failure_type (string), result (dict), data (dict))
+        Values for failure type are: 'error', 'redirect', 'failure'. Defaults
+        to None.
+
+        progress_callback (function): Callback for progress updates,
+        will have the signature:
+            on_progress(current_size (int), total_size (int), data (dict))
+        Defaults to None.
+
+    Return:
+        UrlRequest: The request being made.
+
+    """
+    endpoint = '{}/oauth/token'.format(podium_api.get_podium_application().podium_url)
+    body = {'grant_type': 'refresh_token', 'refresh_token': refresh_token}
+    header = get_json_header()
+    return make_request_custom_success(endpoint, login_success_handler,
+                                       method='POST',
+                                       success_callback=success_callback,
+                                       failure_callback=failure_callback,
+                                       progress_callback=progress_callback,
+                                       redirect_callback=redirect_callback,
+                                       body=body, header=header)
+
+
 def login_success_handler(req, results, data):
     """
     Creates and returns a  PodiumToken to the success_callback found in data.
@@ -0,0 +1,274 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Durable queue of creates and updates for when the trackside connection is
+unreliable. Mutations are written to a SQLite database before being sent,
+replayed in order once the connection returns and removed once the server
+accepted them, so nothing is lost when the connection drops or the
+application restarts.
+
+Every mutation has an idempotency key, sent as the Idempotency-Key header,
+so a mutation sent again after its response was lost can be recognized by
+the server, and submitting a key already queued does nothing.
+
+**Module Attributes:**
+    **QUEUEABLE_REQUESTS** (dict): The request functions a WriteBehindQueue
+    accepts, by name.
+"""
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+from podium_api.alertmessages import make_alertmessage_create
+from podium_api.asyncreq import ScheduledCall, using_idempotency_key
+from podium_api.devices import make_device_create, make_device_update
+from podium_api.eventdevices import (make_eventdevice_create,
+                                     make_eventdevice_update)
+from podium_api.events import make_event_create, make_event_update
+from podium_api.racestat import make_racestat_create, make_racestats_create
+
+QUEUEABLE_REQUESTS = {
+    'alertmessage_create': make_alertmessage_create,
+    'device_create': make_device_create,
+    'device_update': make_device_update,
+    'eventdevice_create': make_eventdevice_create,
+    'eventdevice_update': make_eventdevice_update,
+    'event_create': make_event_create,
+    'event_update': make_event_update,
+    'racestat_create': make_racestat_create,
+    'racestats_create': make_racestats_create,
+}
+
+# failures caused by the connection, retried until the mutation is sent
+TRANSIENT_FAILURES = ('error', 'circuit_open')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS mutations (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    request TEXT NOT NULL,
+    args BLOB NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    created REAL NOT NULL
+)
+"""
+
+
+class WriteBehindQueue(object):
+    """
+    Persists mutations and sends them in the order they were submitted, at
+    most max_in_flight at a time.
+
+    When a mutation fails because of the connection the queue pauses and
+    tries again after retry_interval, until it is sent. Mutations the server
+    rejected are tried max_attempts times before being dropped.
+
+    Mutations left by a previous run are sent once **flush** is called.
+    Their callbacks are lost with the previous run, the queue's own
+    callbacks are called for them instead.
+
+    Args:
+        path (str): Path of the database file, created if needed.
+
+        token (PodiumToken): The authentication token mutations are sent
+        with, replace the attribute when the token changes.
+
+    Kwargs:
+        max_in_flight (int): Maximum number of mutations sent at once, 1 to
+        wait for each mutation to complete before sending the next.
+        Defaults to 1.
+
+        retry_interval (float): Seconds to wait after a failure before
+        sending again. Defaults to 5.
+
+        max_attempts (int): Attempts of a mutation the server rejected.
+        Defaults to 3.
+
+        success_callback (function): Called for a mutation whose own
+        callbacks are unknown, with the arguments its success_callback or
+        redirect_callback would have received. Defaults to None.
+
+        failure_callback (function): Called for a dropped mutation whose own
+        callbacks are unknown, with the signature:
+            on_failure(failure_type (string), result (dict), data (dict))
+        Defaults to None.
+
+    **Attributes:**
+        **paused** (bool): True while waiting to retry after a failure.
+    """
+
+    def __init__(self, path, token, max_in_flight=1, retry_interval=5.0,
+                 max_attempts=3, success_callback=None,
+                 failure_callback=None):
+        self.path = path
+        self.token = token
+        self.max_in_flight = max_in_flight
+        self.retry_interval = retry_interval
+        self.max_attempts = max_attempts
+        self.success_callback = success_callback
+        self.failure_callback = failure_callback
+        self.paused = False
+        self._callbacks = {}
+        self._in_flight = set()
+        self._timer = ScheduledCall(self._resume)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.execute(SCHEMA)
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute(
+                'SELECT COUNT(*) FROM mutations').fetchone()[0]
+
+    def pending(self):
+        """
+        Returns the (idempotency_key, request name) of the queued mutations
+        in order.
+        """
+        with self._lock:
+            return self._db.execute(
+                'SELECT idempotency_key, request FROM mutations '
+                'ORDER BY seq').fetchall()
+
+    def submit(self, request_func, *args, **kwargs):
+        """
+        Queues a call of request_func and sends it as soon as possible.
+
+        Args:
+            request_func (function): One of QUEUEABLE_REQUESTS.
+
+            The args and kwargs are passed to request_func after the token,
+            they must be picklable.
+
+        Kwargs:
+            success_callback, redirect_callback and failure_callback are
+            called like they would be by request_func, once the mutation was
+            sent or dropped.
+
+            idempotency_key (str): Key identifying the mutation. Defaults to
+            a new uuid.
+
+        Return:
+            str: The idempotency key of the mutation.
+
+        """
+        name = None
+        for request_name, func in QUEUEABLE_REQUESTS.items():
+            if func is request_func:
+                name = request_name
+        if name is None:
+            raise ValueError('{} can not be queued'.format(
+                getattr(request_func, '__name__', request_func)))
+        callbacks = (kwargs.pop('success_callback', None),
+                     kwargs.pop('redirect_callback', None),
+                     kwargs.pop('failure_callback', None))
+        key = kwargs.pop('idempotency_key', None)
+        if key is None:
+            key = uuid.uuid4().hex
+        blob = pickle.dumps((args, kwargs), pickle.HIGHEST_PROTOCOL)
+        with self._lock, self._db:
+            inserted = self._db.execute(
+                'INSERT OR IGNORE INTO mutations (idempotency_key, request, '
+                'args, created) VALUES (?, ?, ?, ?)',
+                (key, name, sqlite3.Binary(blob), time.time())).rowcount
+            if inserted or key not in self._callbacks:
+                self._callbacks[key] = callbacks
+        self.flush()
+        return key
+
+    def flush(self):
+        """
+        Sends the queued mutations, up to max_in_flight at once, unless
+        waiting to retry.
+        """
+        sends = []
+        with self._lock, self._db:
+            if self.paused:
+                return
+            free = self.max_in_flight - len(self._in_flight)
+            if free <= 0:
+                return
+            rows = self._db.execute(
+                'SELECT idempotency_key, request, args FROM mutations '
+                'ORDER BY seq LIMIT ?',
+                (len(self._in_flight) + free,)).fetchall()
+            for key, name, blob in rows:
+                if key in self._in_flight:
+                    continue
+                self._in_flight.add(key)
+                self._db.execute(
+                    'UPDATE mutations SET attempts = attempts + 1 WHERE '
+                    'idempotency_key = ?', (key,))
+                sends.append((key, name, blob))
+        for key, name, blob in sends:
+            self._send(key, name, blob)
+
+    def close(self):
+        """
+        Stops retrying and closes the database, unsent mutations stay in it.
+        """
+        self._timer.cancel()
+        with self._lock:
+            self._db.close()
+
+    def _send(self, key, name, blob):
+        args, kwargs = pickle.loads(blob)
+
+        def on_success(*args):
+            self._done(key, 0, args)
+
+        def on_redirect(redirect):
+            self._done(key, 1, (redirect,))
+
+        def on_failure(failure_type, result, data):
+            self._failed(key, failure_type, result, data)
+
+        with using_idempotency_key(key):
+            QUEUEABLE_REQUESTS[name](self.token, *args,
+                                     success_callback=on_success,
+                                     redirect_callback=on_redirect,
+                                     failure_callback=on_failure, **kwargs)
+
+    def _done(self, key, index, args):
+        with self._lock, self._db:
+            self._db.execute('DELETE FROM mutations WHERE idempotency_key = ?',
+                             (key,))
+            self._in_flight.discard(key)
+            callbacks = self._callbacks.pop(key, None)
+        if callbacks is None:
+            if self.success_callback is not None:
+                self.success_callback(*args)
+        elif callbacks[index] is not None:
+            callbacks[index](*args)
+        self.flush()
+
+    def _failed(self, key, failure_type, result, data):
+        callback = None
+        with self._lock, self._db:
+            self._in_flight.discard(key)
+            row = self._db.execute(
+                'SELECT attempts FROM mutations WHERE idempotency_key = ?',
+                (key,)).fetchone()
+            drop = (failure_type not in TRANSIENT_FAILURES and row is not None
+                    and row[0] >= self.max_attempts)
+            if drop:
+                self._db.execute(
+                    'DELETE FROM mutations WHERE idempotency_key = ?', (key,))
+                callbacks = self._callbacks.pop(key, None)
+                callback = (self.failure_callback if callbacks is None
+                            else callbacks[2])
+            if not drop:
+                self.paused = True
+        if callback is not None:
+            callback(failure_type, result, data)
+        if drop:
+            self.flush()
+        else:
+            self._timer.schedule(self.retry_interval)
+
+    def _resume(self):
+        with self._lock:
+            self.paused = False
+        self.flush()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Helpers for walking every page of a paged collection. The first page is
+requested on its own, then the start offsets of the remaining pages are
+computed from its total and the remaining pages are requested concurrently,
+up to **window** at a time. Items are always delivered in collection order.
+
+Works with any of the list request functions: make_events_get,
+make_devices_get, make_laps_get, make_eventdevices_get, make_livestreams_get,
+make_venues_get, make_alertmessages_get and make_friendships_get.
+"""
+
+
+def require_item_payload(kwargs):
+    """
+    Raises a ValueError if the kwargs of a list request make its payload
+    something else than a list of items, such as the LapTable of
+    make_laps_get with as_table.
+    """
+    if kwargs.get('as_table'):
+        raise ValueError('as_table pages can not be iterated, join them with '
+                         'concatenate_lap_tables')
+
+
+class PagedFetch(object):
+    """
+    State of a collection being fetched by **iterate_all**.
+
+    **Attributes:**
+        **total** (int): Total number of items in the collection, None until
+        the first page has arrived.
+
+        **delivered** (int): Number of items delivered so far.
+
+        **finished** (bool): True once every item has been delivered.
+
+        **failed** (bool): True if a page request failed.
+
+        **cancelled** (bool): True if **cancel** was called.
+    """
+
+    def __init__(self, request_func, token, args, kwargs, per_page, window,
+                 item_callback, done_callback, failure_callback):
+        self.request_func = request_func
+        self.token = token
+        self.args = args
+        self.kwargs = kwargs
+        self.per_page = min(per_page, 100)
+        self.window = max(window, 1)
+        self.item_callback = item_callback
+        self.done_callback = done_callback
+        self.failure_callback = failure_callback
+        self.total = None
+        self.delivered = 0
+        self.finished = False
+        self.failed = False
+        self.cancelled = False
+        self._offsets = []
+        self._pages = {}
+        self._next_request = 0
+        self._next_delivery = 0
+
+    def start(self, first_page=None):
+        """
+        Starts fetching. If first_page, the PodiumPagedResponse of the first
+        page, was already received it is used instead of requesting it.
+        """
+        if first_page is not None:
+            self._first_page_success(first_page)
+        else:
+            self._request(0, self._first_page_success)
+
+    def cancel(self):
+        """
+        Stops requesting pages. Pages already in flight will be ignored.
+        """
+        self.cancelled = True
+
+    def _request(self, start, success_callback):
+        kwargs = dict(self.kwargs)
+        kwargs['start'] = start
+        kwargs['per_page'] = self.per_page
+        kwargs['success_callback'] = success_callback
+        kwargs['failure_callback'] = self._failure
+        self.request_func(self.token, *self.args, **kwargs)
+
+    def _first_page_success(self, paged_response):
+        if self.cancelled or self.failed:
+            return
+        self.total = paged_response.total
+        # the server may return less than per_page, use the size it returned
+        page_size = len(paged_response.payload)
+        if page_size:
+            self._offsets = list(range(page_size, self.total, page_size))
+        self._deliver(paged_response)
+        self._fill_window()
+        self._check_finished()
+
+    def _page_success(self, index):
+        def on_page(paged_response):
+            if self.cancelled or self.failed:
+                return
+            self._pages[index] = paged_response
+            while self._next_delivery in self._pages:
+                self._deliver(self._pages.pop(self._next_delivery))
+                self._next_delivery += 1
+            self._fill_window()
+            self._check_finished()
+        return on_page
+
+    def _fill_window(self):
+        # pages in flight and pages waiting for an earlier page both count
+        # against the window
+        while (self._next_request < len(self._offsets) and
+               self._next_request - self._next_delivery < self.window):
+            index = self._next_request
+            self._next_request += 1
+            self._request(self._offsets[index], self._page_success(index))
+
+    def _deliver(self, paged_response):
+        for item in paged_response.payload:
+            self.delivered += 1
+            if self.item_callback is not None:
+                self.item_callback(item)
+
+    def _check_finished(self):
+        if self._next_delivery == len(self._offsets) and not self.finished:
+            self.finished = True
+            if self.done_callback is not None:
+                self.done_callback(self)
+
+    def _failure(self, failure_type, result, data):
+        if self.cancelled or self.failed:
+            return
+        self.failed = True
+        if self.failure_callback is not None:
+            self.failure_callback(failure_type, result, data)
+
+
+def iterate_all(request_func, token, *args, **kwargs):
+    """
+    Requests every page of a collection and calls item_callback for each
+    item, in order, as soon as all the pages before it have arrived.
+
+    Args:
+        request_func (function): The list request function, such as
+        **podium_api.events.make_events_get**.
+
+        token (PodiumToken): The authentication token for this session.
+
+        Any other args and kwargs are passed through to request_func.
+
+    Kwargs:
+        per_page (int): Number per page of results, max of 100. Defaults to
+        100.
+
+        window (int): Maximum number of pages requested at once, including
+        pages that arrived early and wait for an earlier page. Defaults to 4.
+
+        item_callback (function): Called for every item with the signature:
+            on_item(item)
+
+        done_callback (function): Called once every item was delivered with
+        the signature:
+            on_done(fetch (PagedFetch))
+
+        failure_callback (function): Callback for failures and errors of any
+        page, no further items are delivered after it is called.
+        Will have the signature:
+            on_failure(failure_type (string), result (dict), data (dict))
+
+        first_page (PodiumPagedResponse): The first page, requested with
+        start 0 and per_page, if it was already received. Defaults to None.
+
+    Return:
+        PagedFetch: The state of the fetch, can be used to cancel it.
+
+    """
+    require_item_payload(kwargs)
+    first_page = kwargs.pop('first_page', None)
+    fetch = PagedFetch(request_func, token, args, kwargs,
+                       kwargs.pop('per_page', 100), kwargs.pop('window', 4),
+                       kwargs.pop('item_callback', None),
+                       kwargs.pop('done_callback', None),
+                       kwargs.pop('failure_callback', None))
+    fetch.start(first_page)
+    return fetch
+
+
+def fetch_all(request_func, token, *args, **kwargs):
+    """
+    Requests every page of a collection like **iterate_all** and returns all
+    of the items to success_callback at once.
+
+    Args:
+        request_func (function): The list request function, such as
+        **podium_api.events.make_events_get**.
+
+        token (PodiumToken): The authentication token for this session.
+
+        Any other args and kwargs are passed through to request_func.
+
+    Kwargs:
+        per_page (int): Number per page of results, max of 100. Defaults to
+        100.
+
+        window (int): Maximum number of pages requested at once.
+        Defaults to 4.
+
+        success_callback (function): Called once with every item, will have
+        the signature:
+            on_success(items (list))
+
+        failure_callback (function): Callback for failures and errors.
+        Will have the signature:
+            on_failure(failure_type (string), result (dict), data (dict))
+
+    Return:
+        PagedFetch: The state of the fetch, can be used to cancel it.
+
+    """
+    items = []
+    success_callback = kwargs.pop('success_callback', None)
+
+    def on_done(fetch):
+        if success_callback is not None:
+            success_callback(items)
+
+    kwargs['item_callback'] = items.append
+    kwargs['done_callback'] = on_done
+    return iterate_all(request_func, token, *args, **kwargs)
@@ -0,0 +1,235 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Batched publishing of racestats from a live timing feed. Racestats are
+queued per event, a newer racestat for a car replaces the queued one, and
+the queue is sent with **podium_api.racestat.make_racestats_create** in
+chunks once it is large enough or flush_interval has passed. Cars whose
+racestat did not change since the server last acknowledged one are skipped,
+and with partial_updates only the changed fields are sent.
+"""
+import threading
+import time
+from collections import OrderedDict, deque
+from podium_api.asyncreq import ScheduledCall
+from podium_api.racestat import make_racestats_create
+
+
+class RacestatPublisher(object):
+    """
+    Queues racestats and uploads them in batches.
+
+    **publish** only queues, it never makes a request itself unless the
+    queue reached flush_size, so it can be called from the thread reading
+    the timing feed at any rate.
+
+    Args:
+        token (PodiumToken): The authentication token for this session.
+
+    Kwargs:
+        chunk_size (int): Maximum number of racestats per request.
+        Defaults to 50.
+
+        flush_size (int): Number of queued racestats that triggers a flush.
+        Defaults to chunk_size.
+
+        flush_interval (float): Maximum seconds a racestat waits in the
+        queue. Defaults to 1.0.
+
+        max_in_flight (int): Maximum number of requests made at once, the
+        queue keeps coalescing while the limit is reached. Defaults to 2.
+
+        delta (bool): Skip racestats equal to the last one acknowledged by
+        the server for the car. Defaults to True.
+
+        partial_updates (bool): Send only the fields that changed since the
+        last racestat acknowledged for the car, the server must accept
+        partial updates. Defaults to False.
+
+        failure_callback (function): Called when a request failed, its
+        racestats are dropped and the next racestat of each of its cars is
+        sent in full. Will have the signature:
+            on_failure(failure_type (string), result (dict), data (dict))
+        data contains the 'event_id' and 'racestats' of the request.
+        Defaults to None.
+
+    **Attributes:**
+        **published** (int): Number of racestats passed to **publish**.
+
+        **coalesced** (int): Number of queued racestats replaced by a newer
+        racestat for the same car before being sent.
+
+        **sent** (int): Number of racestats uploaded successfully.
+
+        **failed** (int): Number of racestats dropped by failed requests.
+
+        **unchanged** (int): Number of racestats not sent because nothing
+        changed since the last racestat acknowledged for the car.
+
+        **in_flight** (int): Number of requests being made.
+
+        **flush_latencies** (deque): Seconds taken by the last 100 requests.
+    """
+
+    def __init__(self, token, chunk_size=50, flush_size=None,
+                 flush_interval=1.0, max_in_flight=2, delta=True,
+                 partial_updates=False, failure_callback=None):
+        self.token = token
+        self.chunk_size = chunk_size
+        self.flush_size = chunk_size if flush_size is None else flush_size
+        self.flush_interval = flush_interval
+        self.max_in_flight = max_in_flight
+        self.delta = delta
+        self.partial_updates = partial_updates
+        self.failure_callback = failure_callback
+        self.published = 0
+        self.coalesced = 0
+        self.sent = 0
+        self.failed = 0
+        self.unchanged = 0
+        self.in_flight = 0
+        self.flush_latencies = deque(maxlen=100)
+        self._pending = OrderedDict()
+        self._acknowledged = {}
+        self._depth = 0
+        self._timer = ScheduledCall(self.flush)
+        self._lock = threading.Lock()
+
+    @property
+    def queue_depth(self):
+        """
+        Number of racestats waiting to be sent.
+        """
+        return self._depth
+
+    @property
+    def flush_latency(self):
+        """
+        Average seconds taken by the recent requests, None before the first
+        one completed.
+        """
+        latencies = list(self.flush_latencies)
+        if not latencies:
+            return None
+        return sum(latencies) / len(latencies)
+
+    def publish(self, event_id, racestat):
+        """
+        Queues racestat for event_id, replacing any racestat queued for the
+        same car.
+
+        Args:
+            event_id (int): The id of the event.
+
+            racestat (dict): The racestat with the keys expected by
+            **make_racestats_create**, including 'device_id'.
+
+        """
+        with self._lock:
+            cars = self._pending.setdefault(event_id, OrderedDict())
+            if racestat['device_id'] in cars:
+                self.coalesced += 1
+            else:
+                self._depth += 1
+            cars[racestat['device_id']] = racestat
+            self.published += 1
+            full = self._depth >= self.flush_size
+        if full:
+            self.flush()
+        else:
+            self._schedule()
+
+    def flush(self):
+        """
+        Sends the queued racestats now, as long as fewer than max_in_flight
+        requests are being made.
+        """
+        while True:
+            with self._lock:
+                if not self._pending or self.in_flight >= self.max_in_flight:
+                    break
+                event_id, cars = next(iter(self._pending.items()))
+                chunk = []
+                while cars and len(chunk) < self.chunk_size:
+                    chunk.append(cars.popitem(last=False)[1])
+                if cars:
+                    # take turns between events
+                    self._pending.move_to_end(event_id)
+                else:
+                    del self._pending[event_id]
+                self._depth -= len(chunk)
+                chunk = self._changes(event_id, chunk)
+                if not chunk:
+                    continue
+                self.in_flight += 1
+            self._send(event_id, chunk)
+        self._schedule()
+
+    def close(self):
+        """
+        Stops the flush timer. Racestats still queued are not sent, call
+        **flush** first to send them.
+        """
+        self._timer.cancel()
+
+    def _changes(self, event_id, racestats):
+        # called with the lock held
+        if not self.delta:
+            return racestats
+        changes = []
+        for racestat in racestats:
+            key = (event_id, racestat['device_id'])
+            last = self._acknowledged.get(key)
+            if last is not None:
+                changed = dict((field, value)
+                               for field, value in racestat.items()
+                               if last.get(field) != value)
+                if not changed:
+                    self.unchanged += 1
+                    continue
+                if self.partial_updates:
+                    changed['device_id'] = racestat['device_id']
+                    racestat = changed
+            changes.append(racestat)
+        return changes
+
+    def _schedule(self):
+        with self._lock:
+            pending = bool(self._pending)
+        if pending:
+            self._timer.schedule(self.flush_interval)
+
+    def _send(self, event_id, racestats):
+        started = time.monotonic()
+
+        def on_done(failure_type=None, result=None, data=None):
+            with self._lock:
+                self.in_flight -= 1
+                self.flush_latencies.append(time.monotonic() - started)
+                if failure_type is None:
+                    self.sent += len(racestats)
+                    if self.delta:
+                        for racestat in racestats:
+                            key = (event_id, racestat['device_id'])
+                            self._acknowledged[key] = dict(
+                                self._acknowledged.get(key, {}), **racestat)
+                else:
+                    self.failed += len(racestats)
+                    for racestat in racestats:
+                        self._acknowledged.pop(
+                            (event_id, racestat['device_id']), None)
+                full = self._depth >= self.flush_size
+            if failure_type is not None and self.failure_callback is not None:
+                self.failure_callback(failure_type, result,
+                                      {'event_id': event_id,
+                                       'racestats': racestats})
+            if full:
+                self.flush()
+            else:
+                self._schedule()
+
+        make_racestats_create(self.token, event_id, racestats,
+                              success_callback=lambda result, data: on_done(),
+                              redirect_callback=lambda redirect: on_done(),
+                              failure_callback=on_done,
+                              partial=self.partial_updates)
@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
-from podium_api.asyncreq import make_request_custom_success, get_json_header_token
+from podium_api.asyncreq import (make_request_custom_success,
+                                 get_json_header_token, default_success)
 from podium_api.types.racestat import get_racestat_from_json
 from podium_api.types.redirect import get_redirect_from_json
 import podium_api
@@ -62,40 +63,52 @@ def make_racestat_get(token, endpoint, expand=False, quiet=None,
                                        params=params, header=header)
 
 
+RACESTAT_FIELDS = ('device_id', 'comp_number', 'comp_class', 'total_laps',
+                   'last_lap_time', 'position_overall', 'position_in_class',
+                   'comp_number_ahead', 'comp_number_behind', 'gap_to_ahead',
+                   'gap_to_behind', 'laps_to_ahead', 'laps_to_behind',
+                   'fc_flag', 'comp_flag')
+
+
 def make_racestats_create(token, event_id, racestats, success_callback=None, failure_callback=None,
-                         progress_callback=None, redirect_callback=None):
+                         progress_callback=None, redirect_callback=None,
+                         partial=False):
     """
     add a collection of racestats to the specified event id
     Args:
         token (PodiumToken): The authentication token for this session
         
         event_id: The id of the event to apply racestats        
+
+    Kwargs:
+        success_callback (function): Callback for a 2xx response, will have
+        the signature:
+            on_success(result (dict), data (dict))
+        Defaults to None.
+
+        redirect_callback (function): Callback for the redirect to the
+        created racestats, will have the signature:
+            on_redirect(redirect_object (PodiumRedirect))
+        Defaults to None.
+
+        partial (bool): If True only the fields present in each racestat
+        dict are sent, for servers accepting partial updates. Every racestat
+        still needs a 'device_id'. Defaults to False.
     """
-    endpoint = '{}/api/v1/events/{}/racestats'.format(podium_api.PODIUM_APP.podium_url, event_id)
+    endpoint = '{}/api/v1/events/{}/racestats'.format(podium_api.get_podium_application().podium_url, event_id)
         
     index = 0
     body = {}
     for racestat in racestats:
-        body[f'racestat[{index}][device_id]'] = racestat['device_id']
-        body[f'racestat[{index}][comp_number]'] = racestat['comp_number']
-        body[f'racestat[{index}][comp_class]'] = racestat['comp_class']
-        body[f'racestat[{index}][total_laps]'] = racestat['total_laps']
-        body[f'racestat[{index}][last_lap_time]'] = racestat['last_lap_time']
-        body[f'racestat[{index}][position_overall]'] = racestat['position_overall']
-        body[f'racestat[{index}][position_in_class]'] = racestat['position_in_class']
-        body[f'racestat[{index}][comp_number_ahead]'] = racestat['comp_number_ahead']
-        body[f'racestat[{index}][comp_number_behind]'] = racestat['comp_number_behind']
-        body[f'racestat[{index}][gap_to_ahead]'] = racestat['gap_to_ahead']
-        body[f'racestat[{index}][gap_to_behind]'] = racestat['gap_to_behind']
-        body[f'racestat[{index}][laps_to_ahead]'] = racestat['laps_to_ahead']
-        body[f'racestat[{index}][laps_to_behind]'] = racestat['laps_to_behind']
-        body[f'racestat[{index}][fc_flag]'] = racestat['fc_flag']
-        body[f'racestat[{index}][comp_flag]'] = racestat['comp_flag']
+        for field in RACESTAT_FIELDS:
+            if partial and field not in racestat:
+                continue
+            body[f'racestat[{index}][{field}]'] = racestat[field]
         index += 1
 
     header = get_json_header_token(token)
     return make_request_custom_success(
-        endpoint, None, method='POST',
+        endpoint, default_success, method='POST',
         success_callback=success_callback,
         redirect_callback=create_racestat_redirect_handler,
         failure_callback=failure_callback,
@@ -146,7 +159,7 @@ def make_racestat_create(token, event_id, device_id, comp_number, comp_class, to
 
     """
 
-    endpoint = '{}/api/v1/events/{}/devices/{}/racestat'.format(podium_api.PODIUM_APP.podium_url, event_id, device_id)
+    endpoint = '{}/api/v1/events/{}/devices/{}/racestat'.format(podium_api.get_podium_application().podium_url, event_id, device_id)
     body = {'racestat[comp_number]': comp_number, 'racestat[comp_class]': comp_class,
             'racestat[total_laps]': total_laps, 'racestat[last_lap_time]': last_lap_time,
             'racestat[position_overall]': position_overall, 'racestat[position_in_class]': position_in_class,
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Retry policies for transient failures. A policy is applied by
+**podium_api.asyncreq.make_request** when one is given to the request,
+set with **podium_api.asyncreq.using_retry_policy** or provided to
+**podium_api.register_podium_application**.
+
+Failed attempts are retried after an exponential backoff with random jitter,
+or after the delay given by the Retry-After header of the response, so
+clients back off together instead of amplifying an outage.
+"""
+import random
+import time
+from email.utils import parsedate_to_datetime
+from podium_api.cache import get_header
+
+
+def parse_retry_after(value):
+    """
+    Returns the seconds to wait from a Retry-After header value, given
+    either in seconds or as an HTTP date, or None if it can not be parsed.
+    """
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+    return max(retry_at - time.time(), 0.0)
+
+
+class RetryPolicy(object):
+    """
+    Decides if and when a failed request is made again.
+
+    Kwargs:
+        max_attempts (int): Maximum number of attempts, including the first
+        one. Defaults to 3.
+
+        backoff_base (float): Delay in seconds before the first retry, it
+        doubles on every further retry. Defaults to 0.5.
+
+        backoff_max (float): Maximum backoff delay in seconds. Defaults to
+        30.
+
+        jitter (float): Fraction of the delay randomly removed, 0 for none
+        and 1 for full jitter. Defaults to 0.5.
+
+        retry_on (tuple): Response status codes that are retried. Defaults to
+        (408, 429, 500, 502, 503, 504).
+
+        retry_errors (bool): Retry requests that errored, such as timeouts
+        and refused connections. Defaults to True.
+
+        respect_retry_after (bool): Wait for the delay given by a
+        Retry-After header instead of the backoff when there is one.
+        Defaults to True.
+
+        retry_after_max (float): Maximum delay in seconds taken from a
+        Retry-After header, longer delays are cut to it. Defaults to
+        backoff_max.
+
+        methods (tuple): Methods the policy applies to. POST and PUT are not
+        idempotent and have to be added explicitly. Defaults to ('GET',).
+
+    """
+
+    def __init__(self, max_attempts=3, backoff_base=0.5, backoff_max=30.0,
+                 jitter=0.5, retry_on=(408, 429, 500, 502, 503, 504),
+                 retry_errors=True, respect_retry_after=True,
+                 retry_after_max=None, methods=('GET',)):
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.retry_on = frozenset(retry_on)
+        self.retry_errors = retry_errors
+        self.respect_retry_after = respect_retry_after
+        if retry_after_max is None:
+            retry_after_max = backoff_max
+        self.retry_after_max = retry_after_max
+        self.methods = frozenset(method.upper() for method in methods)
+
+    def applies_to(self, method):
+        return (method or 'GET').upper() in self.methods
+
+    def should_retry(self, attempt, status=None, error=False):
+        """
+        Returns True if the request should be made again after attempt
+        number attempt, starting at 1, failed with status or errored.
+        """
+        if attempt >= self.max_attempts:
+            return False
+        if error:
+            return self.retry_errors
+        return status in self.retry_on
+
+    def backoff(self, attempt):
+        """
+        Returns the jittered exponential backoff after attempt number
+        attempt.
+        """
+        delay = min(self.backoff_max,
+                    self.backoff_base * 2 ** (attempt - 1))
+        return delay * (1 - self.jitter * random.random())
+
+    def delay(self, attempt, resp_headers=None):
+        """
+        Returns the seconds to wait before retrying after attempt number
+        attempt, honoring the Retry-After header found in resp_headers up
+        to retry_after_max.
+        """
+        if self.respect_retry_after:
+            retry_after = parse_retry_after(
+                get_header(resp_headers, 'Retry-After'))
+            if retry_after is not None:
+                return min(retry_after, self.retry_after_max)
+        return self.backoff(attempt)
@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Persistent cache of GET responses stored in a SQLite database, so the
+events, devices, venues and eventdevices of the account can be shown from
+the cache as soon as the application starts and revalidated in the
+background.
+
+The converted objects handed to the success_callback are stored pickled,
+along with the validators and expiry of the response. The Authorization
+header is only stored hashed.
+"""
+import hashlib
+import pickle
+import sqlite3
+import time
+from podium_api.cache import CacheEntry, ResponseCache, get_header
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT NOT NULL,
+    authorization TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    expires REAL NOT NULL,
+    last_used REAL NOT NULL,
+    size INTEGER NOT NULL,
+    args BLOB NOT NULL,
+    PRIMARY KEY (url, authorization)
+)
+"""
+
+
+def hash_authorization(authorization):
+    if authorization is None:
+        return ''
+    return hashlib.sha256(authorization.encode('utf-8')).hexdigest()
+
+
+class SQLiteResponseCache(ResponseCache):
+    """
+    ResponseCache storing its entries in the SQLite database at path. The
+    least recently used entries are evicted once there are more than
+    max_entries or their size exceeds max_bytes.
+
+    Args:
+        path (str): Path of the database file, created if needed.
+
+    Kwargs:
+        max_entries (int): Maximum number of responses kept. Defaults to
+        1024.
+
+        max_bytes (int): Maximum total size of the pickled responses.
+        Defaults to 16 MB.
+
+        default_ttl (float): See **ResponseCache**. Defaults to 0.
+
+        ttl_policy (list): See **ResponseCache**. Defaults to None.
+
+        serve_stale (bool): See **ResponseCache**, lets responses stored by
+        the previous run be shown immediately. Defaults to False.
+
+    """
+
+    def __init__(self, path, max_entries=1024, max_bytes=16 * 1024 * 1024,
+                 default_ttl=0, ttl_policy=None, serve_stale=False):
+        super(SQLiteResponseCache, self).__init__(
+            max_entries=max_entries, default_ttl=default_ttl,
+            ttl_policy=ttl_policy, serve_stale=serve_stale)
+        self.path = path
+        self.max_bytes = max_bytes
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.execute(SCHEMA)
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute(
+                'SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    @property
+    def size(self):
+        """
+        Total size in bytes of the pickled responses.
+        """
+        with self._lock:
+            return self._db.execute(
+                'SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def get(self, key):
+        """
+        Returns the CacheEntry for key, fresh or not, or None.
+        """
+        url, authorization = key[0], hash_authorization(key[1])
+        with self._lock, self._db:
+            row = self._db.execute(
+                'SELECT etag, last_modified, expires, args FROM responses '
+                'WHERE url = ? AND authorization = ?',
+                (url, authorization)).fetchone()
+            if row is None:
+                return None
+            etag, last_modified, expires, blob = row
+            try:
+                args = pickle.loads(blob)
+            except Exception:
+                # written by an incompatible version of podium_api
+                self._db.execute(
+                    'DELETE FROM responses WHERE url = ? AND '
+                    'authorization = ?', (url, authorization))
+                return None
+            self._db.execute(
+                'UPDATE responses SET last_used = ? WHERE url = ? AND '
+                'authorization = ?', (time.time(), url, authorization))
+        # expires is stored as wall clock time, entries use time.monotonic()
+        return CacheEntry(etag, last_modified, args,
+                          time.monotonic() + expires - time.time())
+
+    def store(self, key, resp_headers, args):
+        """
+        Stores the args the success_callback received for the response with
+        resp_headers, see **ResponseCache.store**. Responses whose objects
+        can not be pickled are not stored.
+
+        Return:
+            CacheEntry: The new entry or None if it was not stored.
+
+        """
+        ttl = self.ttl_for(key[0])
+        etag = get_header(resp_headers, 'ETag')
+        last_modified = get_header(resp_headers, 'Last-Modified')
+        if etag is None and last_modified is None and ttl <= 0:
+            return None
+        try:
+            blob = pickle.dumps(args, pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return None
+        if len(blob) > self.max_bytes:
+            return None
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute(
+                'INSERT OR REPLACE INTO responses VALUES '
+                '(?, ?, ?, ?, ?, ?, ?, ?)',
+                (key[0], hash_authorization(key[1]), etag, last_modified,
+                 now + ttl, now, len(blob), sqlite3.Binary(blob)))
+            self._evict()
+        return CacheEntry(etag, last_modified, args, time.monotonic() + ttl)
+
+    def refresh(self, key, entry, resp_headers):
+        """
+        Marks entry as fresh again after a 304 response, see
+        **ResponseCache.refresh**.
+        """
+        entry.etag = get_header(resp_headers, 'ETag') or entry.etag
+        entry.last_modified = get_header(
+            resp_headers, 'Last-Modified') or entry.last_modified
+        ttl = self.ttl_for(key[0])
+        entry.expires = time.monotonic() + ttl
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute(
+                'UPDATE responses SET etag = ?, last_modified = ?, '
+                'expires = ?, last_used = ? WHERE url = ? AND '
+                'authorization = ?',
+                (entry.etag, entry.last_modified, now + ttl, now, key[0],
+                 hash_authorization(key[1])))
+
+    def invalidate(self, uri=None):
+        """
+        Drops every entry whose url starts with uri, or all entries if uri is
+        None.
+        """
+        with self._lock, self._db:
+            if uri is None:
+                self._db.execute('DELETE FROM responses')
+            else:
+                self._db.execute(
+                    'DELETE FROM responses WHERE substr(url, 1, ?) = ?',
+                    (len(uri), uri))
+
+    def _evict(self):
+        # called with the lock held, inside a transaction
+        self._db.execute(
+            'DELETE FROM responses WHERE rowid IN (SELECT rowid FROM '
+            'responses ORDER BY last_used DESC, rowid DESC '
+            'LIMIT -1 OFFSET ?)',
+            (self.max_entries,))
+        total = self._db.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._db.execute(
+            'SELECT rowid, size FROM responses '
+            'ORDER BY last_used, rowid').fetchall()
+        evicted = []
+        for rowid, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((rowid,))
+            total -= size
+        self._db.executemany('DELETE FROM responses WHERE rowid = ?',
+                             evicted)
@@ -0,0 +1,294 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Delivers the new alertmessages of event devices as they arrive.
+
+The alertmessages endpoint has no parameter to list only the messages after
+a given one, so every poll requests the first page of the newest messages
+and the following pages only while every message of a page is newer than
+the cursor, the newest (send_time, alertmessage_id) seen for the device.
+Messages are delivered once, oldest first, even when a message is listed
+again by a later poll. Only the ids of the newest messages are remembered,
+messages older than the ones forgotten are taken as already delivered.
+
+Polls are frequent while messages arrive and slow down while the devices
+are idle.
+"""
+import heapq
+import threading
+from podium_api.alertmessages import make_alertmessages_get
+from podium_api.asyncreq import ScheduledCall
+
+
+def message_order(alertmessage):
+    """
+    Returns the key ordering alertmessages from the oldest to the newest.
+    """
+    return (alertmessage.send_time or '', alertmessage.alertmessage_id)
+
+
+class Subscription(object):
+    """
+    Messages seen for an event device.
+
+    **Attributes:**
+        **cursor** (tuple): **message_order** of the newest message seen, None
+        if there was none.
+
+        **seen** (dict): **message_order** of the newest messages seen, by
+        id.
+
+        **floor** (tuple): **message_order** of the newest message forgotten
+        from seen, None if none was.
+
+        **primed** (bool): True once a poll of the subscription completed.
+    """
+
+    __slots__ = ('event_id', 'device_id', 'cursor', 'seen', 'floor', 'primed')
+
+    def __init__(self, event_id, device_id):
+        self.event_id = event_id
+        self.device_id = device_id
+        self.cursor = None
+        self.seen = {}
+        self.floor = None
+        self.primed = False
+
+    def is_new(self, alertmessage):
+        """
+        Returns True if alertmessage was not seen before.
+        """
+        if alertmessage.alertmessage_id in self.seen:
+            return False
+        return self.floor is None or message_order(alertmessage) > self.floor
+
+    def forget_oldest(self, max_seen):
+        """
+        Forgets the oldest ids of seen until it holds max_seen of them.
+        """
+        excess = len(self.seen) - max_seen
+        if excess <= 0:
+            return
+        forgotten = heapq.nsmallest(excess, self.seen.items(),
+                                    key=lambda item: item[1])
+        for alertmessage_id, order in forgotten:
+            del self.seen[alertmessage_id]
+        if self.floor is None or forgotten[-1][1] > self.floor:
+            self.floor = forgotten[-1][1]
+
+
+class AlertMessageSubscriber(object):
+    """
+    Polls the alertmessages of the subscribed event devices and calls
+    message_callback for every new PodiumAlertMessage.
+
+    The poll interval starts at min_interval, is multiplied by backoff after
+    each poll that found no message, up to max_interval, and goes back to
+    min_interval as soon as a message arrives.
+
+    Args:
+        token (PodiumToken): The authentication token for this session.
+
+        message_callback (function): Called once for every new message, will
+        have the signature:
+            on_message(event_id (int), device_id (int),
+                       alertmessage (PodiumAlertMessage))
+
+    Kwargs:
+        min_interval (float): Seconds between polls while messages arrive.
+        Defaults to 1.
+
+        max_interval (float): Maximum seconds between polls. Defaults to 30.
+
+        backoff (float): Factor applied to the interval after an idle poll.
+        Defaults to 2.
+
+        per_page (int): Number of messages requested per page, max of 100.
+        Defaults to 20.
+
+        history (bool): Deliver the messages sent before the subscription,
+        otherwise the first poll of a subscription only sets its cursor.
+        Defaults to False.
+
+        max_seen (int): Number of message ids remembered per subscription to
+        deliver each message once, must be more than per_page. Defaults to
+        1000.
+
+        failure_callback (function): Called when a request failed, will have
+        the signature:
+            on_failure(failure_type (string), result (dict), data (dict))
+        Defaults to None.
+
+    **Attributes:**
+        **interval** (float): Seconds between the end of a poll and the next.
+
+        **requests** (int): Number of pages requested.
+
+        **delivered** (int): Number of messages delivered.
+    """
+
+    def __init__(self, token, message_callback, min_interval=1.0,
+                 max_interval=30.0, backoff=2.0, per_page=20, history=False,
+                 max_seen=1000, failure_callback=None):
+        self.token = token
+        self.message_callback = message_callback
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.per_page = min(per_page, 100)
+        self.history = history
+        self.max_seen = max_seen
+        self.failure_callback = failure_callback
+        self.interval = min_interval
+        self.requests = 0
+        self.delivered = 0
+        self._subscriptions = {}
+        self._running = False
+        self._timer = ScheduledCall(self._on_timer)
+        self._pending = 0
+        self._active = False
+        self._poll_again = False
+        self._lock = threading.Lock()
+
+    def subscribe(self, event_id, device_id):
+        """
+        Starts delivering the messages of the device in the event, polled
+        immediately if the subscriber is running.
+
+        Return:
+            Subscription: The state of the subscription.
+
+        """
+        key = (event_id, device_id)
+        with self._lock:
+            subscription = self._subscriptions.get(key)
+            if subscription is not None:
+                return subscription
+            subscription = Subscription(event_id, device_id)
+            self._subscriptions[key] = subscription
+            self.interval = self.min_interval
+            running = self._running
+        if running:
+            self.poll()
+        return subscription
+
+    def unsubscribe(self, event_id, device_id):
+        with self._lock:
+            self._subscriptions.pop((event_id, device_id), None)
+
+    def start(self):
+        """
+        Polls now and then at the adaptive interval until **stop** is called.
+        """
+        with self._lock:
+            self._running = True
+        self.poll()
+
+    def stop(self):
+        with self._lock:
+            self._running = False
+        self._timer.cancel()
+
+    def poll(self):
+        """
+        Polls every subscription now, or as soon as the poll in progress
+        completed.
+        """
+        with self._lock:
+            if self._pending:
+                self._poll_again = True
+                return
+            subscriptions = list(self._subscriptions.values())
+            self._pending = len(subscriptions)
+            self._active = False
+        self._timer.cancel()
+        for subscription in subscriptions:
+            self._request(subscription, [], 0)
+        if not subscriptions:
+            self._schedule()
+
+    def _request(self, subscription, new, start):
+
+        def on_page(page):
+            self._on_page(subscription, new, start, page)
+
+        def on_failure(failure_type, result, data):
+            if self.failure_callback is not None:
+                self.failure_callback(failure_type, result, data)
+            self._finish(False)
+
+        self.requests += 1
+        make_alertmessages_get(self.token, event_id=subscription.event_id,
+                               device_id=subscription.device_id, start=start,
+                               per_page=self.per_page,
+                               success_callback=on_page,
+                               failure_callback=on_failure)
+
+    def _on_page(self, subscription, new, start, page):
+        deliver = subscription.primed or self.history
+        reached_cursor = False
+        for alertmessage in page.payload:
+            if (subscription.cursor is not None and
+                    message_order(alertmessage) <= subscription.cursor):
+                reached_cursor = True
+            if subscription.is_new(alertmessage):
+                new.append(alertmessage)
+        start += len(page.payload)
+        more = (len(page.payload) > 0 and page.next_uri is not None and
+                start < page.total)
+        if more and deliver and not reached_cursor:
+            self._request(subscription, new, start)
+            return
+        # a message can be listed twice when newer ones shift the pages
+        new = sorted(dict((alertmessage.alertmessage_id, alertmessage)
+                          for alertmessage in new).values(),
+                     key=message_order)
+        subscription.seen.update((alertmessage.alertmessage_id,
+                                  message_order(alertmessage))
+                                 for alertmessage in new)
+        subscription.forget_oldest(self.max_seen)
+        if new and (subscription.cursor is None or
+                    message_order(new[-1]) > subscription.cursor):
+            subscription.cursor = message_order(new[-1])
+        subscription.primed = True
+        key = (subscription.event_id, subscription.device_id)
+        delivered = False
+        if deliver:
+            for alertmessage in new:
+                if self._subscriptions.get(key) is not subscription:
+                    break
+                self.delivered += 1
+                delivered = True
+                self.message_callback(subscription.event_id,
+                                      subscription.device_id, alertmessage)
+        self._finish(delivered)
+
+    def _finish(self, delivered):
+        with self._lock:
+            self._active = self._active or delivered
+            self._pending -= 1
+            if self._pending:
+                return
+            if self._active:
+                self.interval = self.min_interval
+            else:
+                self.interval = min(self.interval * self.backoff,
+                                    self.max_interval)
+            poll_again, self._poll_again = self._poll_again, False
+        if poll_again:
+            self.poll()
+        else:
+            self._schedule()
+
+    def _schedule(self):
+        with self._lock:
+            running = self._running
+            interval = self.interval
+        if running:
+            self._timer.schedule(interval)
+
+    def _on_timer(self):
+        with self._lock:
+            running = self._running
+        if running:
+            self.poll()
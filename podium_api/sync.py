@@ -0,0 +1,403 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Keeps a local replica of an account's events, devices and eventdevices
+current.
+
+Each **SyncEngine.sync** requests the first page of the events and of the
+devices. When the total of a collection and every object of its first page
+are the same as at the last sync the collection is considered unchanged and
+no other page is requested, otherwise every page is requested. Podium lists
+the newest objects first, so changes almost always show on the first page.
+The eventdevices of the events added or changed by the sync, and of the
+events not over yet or that ended less than recent seconds ago, are checked
+the same way: a car joining an event does not change the event itself, but
+cars only join events around the time they are run. A periodic sync costs
+two requests plus one per such event when nothing changed.
+
+Edits on later pages and to the eventdevices of older events are picked up
+by full syncs, which request every page and the eventdevices of every
+event. A sync is made full once full_interval has passed since the last
+full sync, or when requested with full=True.
+
+Registering a **podium_api.cache.ResponseCache** makes the page requests
+conditional, unchanged pages then come back as 304 responses without being
+parsed.
+"""
+import pickle
+import time
+from datetime import datetime, timezone
+from podium_api.devices import make_devices_get
+from podium_api.eventdevices import make_eventdevices_get
+from podium_api.events import make_events_get
+from podium_api.paging import iterate_all
+
+EVENTS = 'events'
+DEVICES = 'devices'
+EVENTDEVICES = 'eventdevices'
+
+COLLECTIONS = (EVENTS, DEVICES, EVENTDEVICES)
+
+
+def parse_time(value):
+    """
+    Returns the seconds since the epoch of value, an ISO 8601 time, or None
+    if it can not be parsed. Times without an offset are in UTC.
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except (AttributeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def fingerprint(obj):
+    """
+    Returns the values of obj's attributes, equal for two representations
+    of an object if nothing changed.
+    """
+    return tuple(getattr(obj, name) for name in type(obj).__slots__
+                 if name != '__weakref__')
+
+
+class SyncStore(object):
+    """
+    Local replica of the synced collections.
+
+    **Attributes:**
+        **objects** (dict): For each collection, events, devices and
+        eventdevices, a dict of uri to object.
+
+        **fingerprints** (dict): For each collection, a dict of uri to the
+        **fingerprint** of the object when it was synced.
+
+        **members** (dict): The uris listed by every endpoint synced.
+
+        **totals** (dict): The total of every endpoint synced.
+
+        **last_full_sync** (float): time.time() when the last full sync
+        started, None before the first one.
+    """
+
+    def __init__(self):
+        self.objects = dict((name, {}) for name in COLLECTIONS)
+        self.fingerprints = dict((name, {}) for name in COLLECTIONS)
+        self.members = {}
+        self.totals = {}
+        self.last_full_sync = None
+
+    @property
+    def events(self):
+        return self.objects[EVENTS]
+
+    @property
+    def devices(self):
+        return self.objects[DEVICES]
+
+    @property
+    def eventdevices(self):
+        return self.objects[EVENTDEVICES]
+
+    def eventdevices_of(self, event):
+        """
+        Returns the synced eventdevices of event.
+        """
+        eventdevices = self.objects[EVENTDEVICES]
+        return [eventdevices[uri]
+                for uri in self.members.get(event.devices_uri, ())]
+
+    def is_unchanged(self, collection, endpoint, page):
+        """
+        Returns True if page, the first page of endpoint, has the total and
+        the objects seen by the last sync.
+        """
+        if self.totals.get(endpoint) != page.total:
+            return False
+        fingerprints = self.fingerprints[collection]
+        return all(fingerprints.get(obj.uri) == fingerprint(obj)
+                   for obj in page.payload)
+
+    def update(self, collection, endpoint, objects, total, result):
+        """
+        Replaces the objects listed by endpoint, recording the objects added,
+        changed and removed in result (SyncResult).
+        """
+        stored = self.objects[collection]
+        fingerprints = self.fingerprints[collection]
+        seen = set()
+        for obj in objects:
+            seen.add(obj.uri)
+            current = fingerprint(obj)
+            previous = fingerprints.get(obj.uri)
+            if previous is None:
+                result.added[collection].append(obj)
+            elif previous != current:
+                result.changed[collection].append(obj)
+            stored[obj.uri] = obj
+            fingerprints[obj.uri] = current
+        for uri in self.members.get(endpoint, set()) - seen:
+            result.removed[collection].append(self.remove(collection, uri))
+        self.members[endpoint] = seen
+        self.totals[endpoint] = total
+
+    def remove(self, collection, uri):
+        """
+        Removes the object of uri from collection and returns it.
+        """
+        self.fingerprints[collection].pop(uri, None)
+        return self.objects[collection].pop(uri)
+
+    def save(self, path):
+        """
+        Writes the store to the file at path.
+        """
+        with open(path, 'wb') as store_file:
+            pickle.dump(self, store_file, pickle.HIGHEST_PROTOCOL)
+
+
+def load_sync_store(path):
+    """
+    Returns the SyncStore saved at path by **SyncStore.save**.
+    """
+    with open(path, 'rb') as store_file:
+        return pickle.load(store_file)
+
+
+class SyncResult(object):
+    """
+    Changes found by a sync.
+
+    **Attributes:**
+        **added** (dict): For each collection the list of new objects.
+
+        **changed** (dict): For each collection the list of objects whose
+        attributes changed.
+
+        **removed** (dict): For each collection the list of objects that are
+        no longer listed.
+
+        **requests** (int): Number of first pages requested, full listings
+        are counted once.
+
+        **full_listings** (int): Number of endpoints that had to be listed
+        entirely.
+    """
+
+    def __init__(self):
+        self.added = dict((name, []) for name in COLLECTIONS)
+        self.changed = dict((name, []) for name in COLLECTIONS)
+        self.removed = dict((name, []) for name in COLLECTIONS)
+        self.requests = 0
+        self.full_listings = 0
+
+    def has_changes(self):
+        return any(self.added[name] or self.changed[name] or
+                   self.removed[name] for name in COLLECTIONS)
+
+
+class SyncEngine(object):
+    """
+    Syncs the events, devices and eventdevices of an account into a
+    SyncStore.
+
+    Args:
+        token (PodiumToken): The authentication token for this session.
+
+        account (PodiumAccount): The account synced.
+
+    Kwargs:
+        store (SyncStore): The replica to update, for example one returned
+        by **load_sync_store**. Defaults to a new, empty, SyncStore.
+
+        per_page (int): Number per page of results, max of 100. Defaults to
+        100.
+
+        window (int): Maximum number of requests made at once per listing.
+        Defaults to 4.
+
+        recent (float): Seconds after the end of an event its eventdevices
+        are still checked by every sync. Defaults to 86400, a day.
+
+        full_interval (float): Seconds between full syncs, None to only make
+        them when requested. Defaults to 3600.
+
+    **Attributes:**
+        **syncing** (bool): True while a sync is running.
+    """
+
+    def __init__(self, token, account, store=None, per_page=100, window=4,
+                 recent=86400.0, full_interval=3600.0):
+        self.token = token
+        self.account = account
+        self.store = SyncStore() if store is None else store
+        self.per_page = per_page
+        self.window = window
+        self.recent = recent
+        self.full_interval = full_interval
+        self.syncing = False
+
+    def is_recent(self, event, now=None):
+        """
+        Returns True if event is not over yet, ended less than recent
+        seconds ago or has no end_time that can be parsed.
+        """
+        end_time = parse_time(event.end_time)
+        if end_time is None:
+            return True
+        if now is None:
+            now = time.time()
+        return end_time >= now - self.recent
+
+    def needs_full_sync(self):
+        """
+        Returns True if the next sync should be full, see full_interval.
+        """
+        if self.full_interval is None:
+            return False
+        last_full_sync = self.store.last_full_sync
+        return (last_full_sync is None or
+                time.time() - last_full_sync >= self.full_interval)
+
+    def sync(self, done_callback=None, failure_callback=None, full=False):
+        """
+        Brings the store up to date.
+
+        Kwargs:
+            done_callback (function): Called once the store is up to date,
+            will have the signature:
+                on_done(result (SyncResult))
+
+            failure_callback (function): Called instead of done_callback if
+            a request failed, the collections synced before the failure are
+            updated. Will have the signature:
+                on_failure(failure_type (string), result (dict), data (dict))
+
+            full (bool): Request every page of every collection and the
+            eventdevices of every event. Defaults to False, the sync is then
+            only full when **needs_full_sync** returns True.
+
+        Return:
+            bool: False if a sync was already running and none was started.
+
+        """
+        if self.syncing:
+            return False
+        self.syncing = True
+        full = full or self.needs_full_sync()
+        run = SyncRun(self, done_callback, failure_callback, full)
+        run.start()
+        return True
+
+
+class SyncRun(object):
+    """
+    A single sync of a SyncEngine.
+    """
+
+    def __init__(self, engine, done_callback, failure_callback, full):
+        self.engine = engine
+        self.store = engine.store
+        self.done_callback = done_callback
+        self.failure_callback = failure_callback
+        self.full = full
+        self.started = time.time()
+        self.result = SyncResult()
+        self.failed = False
+        self._pending = 0
+        self._event_queue = []
+
+    def start(self):
+        account = self.engine.account
+        self._pending = 2
+        self._sync_list(EVENTS, make_events_get, account.events_uri,
+                        self._events_synced)
+        self._sync_list(DEVICES, make_devices_get, account.devices_uri,
+                        self._collection_synced)
+
+    def _sync_list(self, collection, request_func, endpoint, on_synced):
+        engine = self.engine
+
+        def on_first_page(page):
+            if self.failed:
+                return
+            if not self.full and self.store.is_unchanged(collection,
+                                                         endpoint, page):
+                on_synced()
+                return
+            objects = []
+
+            def on_done(fetch):
+                self.result.full_listings += 1
+                self.store.update(collection, endpoint, objects, fetch.total,
+                                  self.result)
+                on_synced()
+
+            iterate_all(request_func, engine.token, endpoint=endpoint,
+                        per_page=engine.per_page, window=engine.window,
+                        item_callback=objects.append, done_callback=on_done,
+                        failure_callback=self._failure, first_page=page)
+
+        self.result.requests += 1
+        request_func(engine.token, endpoint=endpoint, start=0,
+                     per_page=engine.per_page,
+                     success_callback=on_first_page,
+                     failure_callback=self._failure)
+
+    def _events_synced(self):
+        result = self.result
+        for event in result.removed[EVENTS]:
+            for eventdevice in self.store.eventdevices_of(event):
+                result.removed[EVENTDEVICES].append(
+                    self.store.remove(EVENTDEVICES, eventdevice.uri))
+            self.store.members.pop(event.devices_uri, None)
+            self.store.totals.pop(event.devices_uri, None)
+        if self.full:
+            events = list(self.store.events.values())
+        else:
+            now = time.time()
+            events = result.added[EVENTS] + result.changed[EVENTS]
+            synced = set(event.uri for event in events)
+            events += [event for event in self.store.events.values()
+                       if event.uri not in synced and
+                       self.engine.is_recent(event, now)]
+        self._event_queue = [event for event in events
+                             if event.devices_uri is not None]
+        self._pending += len(self._event_queue)
+        for i in range(min(self.engine.window, len(self._event_queue))):
+            self._next_eventdevices()
+        self._collection_synced()
+
+    def _next_eventdevices(self):
+        if not self._event_queue or self.failed:
+            return
+        event = self._event_queue.pop(0)
+
+        def on_synced():
+            self._next_eventdevices()
+            self._collection_synced()
+
+        self._sync_list(EVENTDEVICES, make_eventdevices_get,
+                        event.devices_uri, on_synced)
+
+    def _collection_synced(self):
+        if self.failed:
+            return
+        self._pending -= 1
+        if self._pending == 0:
+            if self.full:
+                self.store.last_full_sync = self.started
+            self.engine.syncing = False
+            if self.done_callback is not None:
+                self.done_callback(self.result)
+
+    def _failure(self, failure_type, result, data):
+        if self.failed:
+            return
+        self.failed = True
+        self.engine.syncing = False
+        if self.failure_callback is not None:
+            self.failure_callback(failure_type, result, data)
@@ -0,0 +1,394 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Client side rate limiting of the requests made by
+**podium_api.asyncreq.make_request**. Enable it by passing a RequestThrottle
+to **podium_api.register_podium_application**.
+
+Requests over the limits are not dropped, they wait in a queue and start as
+soon as the limits allow. Every request has a priority class, waiting
+requests of a higher class always start before those of a lower class, and
+within a class they start in the order they were made.
+
+**Module Attributes:**
+    **PRIORITIES** (tuple): The priority classes, highest first.
+
+    **DEFAULT_PRIORITY_RULES** (list): (pattern, priority) tuples classifying
+    live session traffic as realtime and history downloads as bulk.
+"""
+import re
+import threading
+import time
+from collections import deque
+from urllib.parse import urlparse
+
+REALTIME = 'realtime'
+INTERACTIVE = 'interactive'
+BULK = 'bulk'
+
+PRIORITIES = (REALTIME, INTERACTIVE, BULK)
+
+DEFAULT_PRIORITY_RULES = [
+    (r'/racestats?(\?|$)', REALTIME),
+    (r'/alertmessages', REALTIME),
+    (r'/laps', BULK),
+    (r'/raw_data', BULK),
+    (r'/venues', BULK),
+]
+
+
+class TokenBucket(object):
+    """
+    Allows rate events per second on average with bursts of up to burst
+    events.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self):
+        """
+        Takes a token if one is available.
+
+        Return:
+            float: 0 if a token was taken, otherwise the seconds until one
+            will be available.
+
+        """
+        now = time.monotonic()
+        self.tokens = min(self.burst,
+                          self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+
+class QueuedRequest(object):
+    """
+    Returned by **make_request** instead of the request when the request had
+    to wait for the throttle.
+
+    **Attributes:**
+        **url** (str): The url of the request.
+
+        **priority** (str): The priority class of the request.
+
+        **request** (UrlRequest): The request once it started, None before.
+
+        **cancelled** (bool): True if **cancel** was called before the
+        request started.
+
+        **submitted** (float): time.monotonic() when the request was made.
+
+        **started** (float): time.monotonic() when the request started, None
+        before.
+
+        **on_cancel** (function): Called without arguments when the request
+        is cancelled before it started. Defaults to None.
+
+        **error** (Exception): What starting the request raised once it left
+        the queue, None if it started.
+
+        **on_error** (function): Called when starting the request raised
+        once it left the queue, will have the signature:
+            on_error(request (QueuedRequest), error (Exception))
+        Defaults to None.
+    """
+
+    def __init__(self, url, priority=INTERACTIVE):
+        self.url = url
+        self.priority = priority
+        self.request = None
+        self.cancelled = False
+        self.submitted = time.monotonic()
+        self.started = None
+        self.on_cancel = None
+        self.error = None
+        self.on_error = None
+
+    def cancel(self):
+        """
+        Removes the request from the queue if it did not start yet.
+        """
+        if self.cancelled or self.started is not None:
+            return
+        self.cancelled = True
+        if self.on_cancel is not None:
+            self.on_cancel()
+
+
+class ThrottleState(object):
+    """
+    Limits and queues of one host, or host and token.
+    """
+
+    def __init__(self, bucket):
+        self.bucket = bucket
+        self.in_flight = 0
+        self.bulk_in_flight = 0
+        self.queues = dict((priority, deque()) for priority in PRIORITIES)
+        self.timer = None
+
+    def next_queue(self):
+        # the highest priority queue with a request that was not cancelled
+        for priority in PRIORITIES:
+            queue = self.queues[priority]
+            while queue and queue[0][0].cancelled:
+                queue.popleft()
+            if queue:
+                return queue
+        return None
+
+
+class LatencyStats(object):
+    """
+    Latencies of the requests of one priority class.
+
+    **Attributes:**
+        **count** (int): Number of finished requests.
+
+        **queue_wait** (deque): Seconds the last 100 requests waited before
+        starting.
+
+        **latency** (deque): Seconds from being made to finishing of the
+        last 100 requests.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.queue_wait = deque(maxlen=100)
+        self.latency = deque(maxlen=100)
+
+    def summary(self):
+        """
+        Returns a dict with the count, mean_wait, mean_latency and
+        max_latency of the recent requests.
+        """
+        waits = list(self.queue_wait)
+        latencies = list(self.latency)
+        return {
+            'count': self.count,
+            'mean_wait': sum(waits) / len(waits) if waits else None,
+            'mean_latency': (sum(latencies) / len(latencies)
+                             if latencies else None),
+            'max_latency': max(latencies) if latencies else None,
+        }
+
+
+class RequestThrottle(object):
+    """
+    Limits the rate of requests and the number of requests in flight. The
+    limits apply separately to every podium_url host, and with per_token to
+    every token used on it.
+
+    Waiting requests start by priority class. The class of a request is the
+    one given to **podium_api.asyncreq.make_request** or set with
+    **podium_api.asyncreq.using_priority**, otherwise the class of the first
+    of priority_rules found in its url, otherwise interactive.
+
+    Kwargs:
+        rate (float): Requests started per second on average, None for no
+        rate limit. Defaults to None.
+
+        burst (int): Requests that can start at once before rate applies.
+        Defaults to rate, at least 1.
+
+        max_in_flight (int): Maximum number of requests in flight, None for
+        no limit. Defaults to None.
+
+        per_token (bool): Apply the limits to every token separately instead
+        of to every host. Defaults to False.
+
+        max_bulk_in_flight (int): Maximum number of bulk requests in flight,
+        keeping the rest of max_in_flight free for live traffic. None for no
+        limit. Defaults to None.
+
+        priority_rules (list): (pattern (str), priority (str)) tuples, the
+        priority of the first pattern found in the url, as a regular
+        expression search, applies. Defaults to DEFAULT_PRIORITY_RULES.
+
+    **Attributes:**
+        **stats** (dict): LatencyStats of every priority class.
+    """
+
+    def __init__(self, rate=None, burst=None, max_in_flight=None,
+                 per_token=False, max_bulk_in_flight=None,
+                 priority_rules=None):
+        self.rate = rate
+        if burst is None and rate is not None:
+            burst = max(1, rate)
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+        self.per_token = per_token
+        self.max_bulk_in_flight = max_bulk_in_flight
+        if priority_rules is None:
+            priority_rules = DEFAULT_PRIORITY_RULES
+        self.priority_rules = [(re.compile(pattern), priority)
+                               for pattern, priority in priority_rules]
+        self.stats = dict((priority, LatencyStats())
+                          for priority in PRIORITIES)
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def key_for(self, url, header):
+        """
+        Returns the key of the limits url and header are subject to.
+        """
+        host = urlparse(url).netloc
+        if self.per_token and header is not None:
+            return (host, header.get('Authorization'))
+        return (host, None)
+
+    def priority_for(self, url):
+        """
+        Returns the priority class of url from priority_rules.
+        """
+        for pattern, priority in self.priority_rules:
+            if pattern.search(url):
+                return priority
+        return INTERACTIVE
+
+    def latency_stats(self):
+        """
+        Returns the **LatencyStats.summary** of every priority class.
+        """
+        with self._lock:
+            return dict((priority, stats.summary())
+                        for priority, stats in self.stats.items())
+
+    def queue_depth(self, key=None, priority=None):
+        """
+        Returns the number of requests waiting for key, or for every key if
+        key is None, of the priority class or of every class if priority is
+        None.
+        """
+        priorities = PRIORITIES if priority is None else (priority,)
+        with self._lock:
+            if key is not None:
+                states = [self._states[key]] if key in self._states else []
+            else:
+                states = self._states.values()
+            return sum(len(state.queues[priority]) for state in states
+                       for priority in priorities)
+
+    def in_flight(self, key):
+        with self._lock:
+            state = self._states.get(key)
+            return state.in_flight if state is not None else 0
+
+    def submit(self, transport, key, ticket, start):
+        """
+        Calls start, a function starting the request and returning it, now
+        if the limits for key allow it or later from transport.call_later
+        or **release**.
+
+        Args:
+            transport (PodiumTransport): Transport of the request.
+
+            key (tuple): Key returned by **key_for**.
+
+            ticket (QueuedRequest): Tracks the request while it waits.
+
+            start (function): Starts the request.
+
+        Return:
+            object: What start returned or ticket if the request has to wait.
+
+        """
+        with self._lock:
+            state = self._get_state(key)
+            run_now = (state.next_queue() is None and
+                       self._acquire(state, ticket.priority) == 0)
+            if not run_now:
+                state.queues[ticket.priority].append((ticket, start))
+        if run_now:
+            return self._start(transport, key, ticket, start)
+        self._drain(transport, key)
+        return ticket
+
+    def release(self, transport, key, ticket):
+        """
+        Called once the request of ticket, started by **submit**, finished.
+        """
+        now = time.monotonic()
+        with self._lock:
+            state = self._states[key]
+            state.in_flight -= 1
+            if ticket.priority == BULK:
+                state.bulk_in_flight -= 1
+            stats = self.stats[ticket.priority]
+            stats.count += 1
+            stats.queue_wait.append(ticket.started - ticket.submitted)
+            stats.latency.append(now - ticket.submitted)
+        self._drain(transport, key)
+
+    def _get_state(self, key):
+        state = self._states.get(key)
+        if state is None:
+            bucket = None
+            if self.rate is not None:
+                bucket = TokenBucket(self.rate, self.burst)
+            state = self._states[key] = ThrottleState(bucket)
+        return state
+
+    def _acquire(self, state, priority):
+        # returns 0 and counts the request in flight if it can start, None
+        # if an in flight limit was reached or the seconds until the rate
+        # allows it
+        if self.max_in_flight is not None and \
+                state.in_flight >= self.max_in_flight:
+            return None
+        if priority == BULK and self.max_bulk_in_flight is not None and \
+                state.bulk_in_flight >= self.max_bulk_in_flight:
+            return None
+        wait = state.bucket.take() if state.bucket is not None else 0
+        if wait == 0:
+            state.in_flight += 1
+            if priority == BULK:
+                state.bulk_in_flight += 1
+        return wait
+
+    def _start(self, transport, key, ticket, start):
+        ticket.started = time.monotonic()
+        try:
+            return start()
+        except Exception:
+            self.release(transport, key, ticket)
+            raise
+
+    def _drain(self, transport, key):
+        ready = []
+        wait = None
+        with self._lock:
+            state = self._states[key]
+            while True:
+                queue = state.next_queue()
+                if queue is None:
+                    break
+                wait = self._acquire(state, queue[0][0].priority)
+                if wait != 0:
+                    break
+                ready.append(queue.popleft())
+            schedule = bool(wait) and state.timer is None
+            if schedule:
+                state.timer = True
+        for ticket, start in ready:
+            try:
+                ticket.request = self._start(transport, key, ticket, start)
+            except Exception as error:
+                # its slot was released, keep starting the others
+                ticket.error = error
+                if ticket.on_error is not None:
+                    ticket.on_error(ticket, error)
+        if schedule:
+            transport.call_later(wait, lambda: self._on_timer(transport, key))
+
+    def _on_timer(self, transport, key):
+        with self._lock:
+            self._states[key].timer = None
+        self._drain(transport, key)
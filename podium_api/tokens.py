@@ -0,0 +1,353 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Keeps the PodiumToken of a long running session valid.
+
+A TokenManager stores the token in the platform keystore, refreshes it
+before it expires and holds back the requests made through
+**TokenManager.call** while a refresh is in progress. Requests made through
+it that still get a 401 response are made again once the token was
+refreshed.
+
+The token is refreshed in place: every object holding the manager's
+PodiumToken, such as a PodiumAPI or a RacestatPublisher, uses the new token
+without being recreated.
+
+keyring and plyer are optional dependencies of podium_api, the token is
+only kept in memory when neither is installed.
+"""
+import json
+import threading
+import time
+import podium_api
+from podium_api.asyncreq import ScheduledCall, using_unauthorized_handler
+from podium_api.login import make_login_post, make_token_refresh_post
+from podium_api.types.token import get_json_from_token, get_token_from_json
+try:
+    import keyring
+    from keyring.errors import PasswordDeleteError
+except ImportError:
+    keyring = None
+try:
+    from plyer import keystore
+except ImportError:
+    keystore = None
+
+DEFAULT_SERVICE = 'podium_api'
+
+
+class MemoryTokenStore(object):
+    """
+    Keeps the token for the current run only.
+    """
+
+    def __init__(self):
+        self._token = None
+
+    def load(self):
+        """
+        Returns the stored PodiumToken, or None.
+        """
+        if self._token is None:
+            return None
+        return get_token_from_json(self._token)
+
+    def save(self, token):
+        self._token = get_json_from_token(token)
+
+    def clear(self):
+        self._token = None
+
+
+class KeyringTokenStore(object):
+    """
+    Stores the token with keyring, in the keychain of the desktop.
+
+    Kwargs:
+        service (str): Name the token is stored under. Defaults to
+        'podium_api'.
+
+        username (str): Account the token is stored for. Defaults to 'token'.
+    """
+
+    def __init__(self, service=DEFAULT_SERVICE, username='token'):
+        if keyring is None:
+            raise ImportError("keyring is not installed, install it with "
+                              "'pip install keyring'")
+        self.service = service
+        self.username = username
+
+    def load(self):
+        stored = keyring.get_password(self.service, self.username)
+        if not stored:
+            return None
+        return get_token_from_json(json.loads(stored))
+
+    def save(self, token):
+        keyring.set_password(self.service, self.username,
+                             json.dumps(get_json_from_token(token)))
+
+    def clear(self):
+        try:
+            keyring.delete_password(self.service, self.username)
+        except PasswordDeleteError:
+            pass
+
+
+class PlyerTokenStore(object):
+    """
+    Stores the token with the plyer keystore, on mobile platforms.
+
+    Kwargs:
+        service (str): Name the token is stored under. Defaults to
+        'podium_api'.
+    """
+
+    def __init__(self, service=DEFAULT_SERVICE):
+        if keystore is None:
+            raise ImportError("plyer is not installed, install it with "
+                              "'pip install plyer'")
+        self.service = service
+
+    def load(self):
+        stored = keystore.get_key(self.service, 'token')
+        if not stored:
+            return None
+        return get_token_from_json(json.loads(stored))
+
+    def save(self, token):
+        keystore.set_key(self.service, 'token',
+                         json.dumps(get_json_from_token(token)))
+
+    def clear(self):
+        keystore.set_key(self.service, 'token', '')
+
+
+def get_default_token_store(service=DEFAULT_SERVICE):
+    """
+    Returns a KeyringTokenStore if keyring is installed, else a
+    PlyerTokenStore if plyer is installed, else a MemoryTokenStore.
+    """
+    if keyring is not None:
+        return KeyringTokenStore(service)
+    if keystore is not None:
+        return PlyerTokenStore(service)
+    return MemoryTokenStore()
+
+
+class TokenManager(object):
+    """
+    Owns the PodiumToken of the session.
+
+    Kwargs:
+        store (object): Where the token is kept across runs, a
+        MemoryTokenStore, KeyringTokenStore, PlyerTokenStore or any object
+        with the same load, save and clear methods. Defaults to
+        **get_default_token_store**.
+
+        refresh_margin (float): Seconds before the token expires it is
+        refreshed. Defaults to 300.
+
+        token_callback (function): Called after a login or refresh, will
+        have the signature:
+            on_token(token (PodiumToken))
+        Defaults to None.
+
+        expired_callback (function): Called when the token could not be
+        refreshed and the user has to log in again, with the signature:
+            on_expired(failure_type (string), result (dict), data (dict))
+        Defaults to None.
+
+    **Attributes:**
+        **token** (PodiumToken): The token of the session, loaded from the
+        store, None until logged in.
+
+        **refreshing** (bool): True while a refresh is in progress.
+    """
+
+    def __init__(self, store=None, refresh_margin=300.0, token_callback=None,
+                 expired_callback=None):
+        self.store = get_default_token_store() if store is None else store
+        self.refresh_margin = refresh_margin
+        self.token_callback = token_callback
+        self.expired_callback = expired_callback
+        self.refreshing = False
+        self._queue = []
+        self._timer = ScheduledCall(self._on_timer)
+        self._lock = threading.Lock()
+        self.token = self.store.load()
+        if self.token is not None:
+            self._schedule_refresh()
+
+    def login(self, username, password, success_callback=None,
+              failure_callback=None):
+        """
+        Logs the user in with **make_login_post** and keeps the token.
+        Callbacks are the same as **make_login_post**'s.
+        """
+        def on_login(token):
+            self.set_token(token)
+            if success_callback is not None:
+                success_callback(self.token)
+
+        return make_login_post(username, password, success_callback=on_login,
+                               failure_callback=failure_callback)
+
+    def logout(self):
+        """
+        Forgets the token, and removes it from the store.
+        """
+        with self._lock:
+            token, self.token = self.token, None
+        self._timer.cancel()
+        if token is not None:
+            self._forget_header(token.token)
+        self.store.clear()
+
+    def set_token(self, token):
+        """
+        Makes token the token of the session. If there already is one it is
+        updated in place with the values of token.
+        """
+        with self._lock:
+            current = self.token
+            old_value = None
+            if current is None:
+                self.token = token
+            elif current is not token:
+                old_value = current.token
+                for name in type(token).__slots__:
+                    setattr(current, name, getattr(token, name))
+            token = self.token
+        if old_value is not None and old_value != token.token:
+            self._forget_header(old_value)
+        self.store.save(token)
+        self._schedule_refresh()
+        if self.token_callback is not None:
+            self.token_callback(token)
+
+    def needs_refresh(self):
+        """
+        Returns True if the token expires within refresh_margin.
+        """
+        token = self.token
+        if token is None or token.expires_at is None:
+            return False
+        return token.expires_at - self.refresh_margin <= time.time()
+
+    def refresh(self):
+        """
+        Requests a new token with the refresh_token, unless a refresh is
+        already in progress.
+
+        Return:
+            bool: False if a refresh was already in progress.
+
+        """
+        with self._lock:
+            if self.refreshing:
+                return False
+            self.refreshing = True
+            token = self.token
+        if token is None or token.refresh_token is None:
+            self._refresh_failed('failure', {'error': 'no_refresh_token'},
+                                 {})
+            return True
+        make_token_refresh_post(token.refresh_token,
+                                success_callback=self._refreshed,
+                                failure_callback=self._refresh_failed)
+        return True
+
+    def call(self, request_func, *args, **kwargs):
+        """
+        Calls request_func, one of the make_* request functions, with the
+        token of the session followed by args and kwargs. While the token
+        is refreshed, or when it is about to expire, the call is queued
+        until the refresh completed. A request failing with a 401 is made
+        again once after a refresh. Must be logged in.
+
+        Return:
+            object: The request being made, None if the call was queued.
+
+        """
+        pending = [request_func, args, kwargs, False]
+        with self._lock:
+            queued = self.refreshing
+            if queued:
+                self._queue.append(pending)
+        if queued:
+            return None
+        if self.needs_refresh():
+            with self._lock:
+                self._queue.append(pending)
+            self.refresh()
+            return None
+        return self._start(pending)
+
+    def _start(self, pending):
+        request_func, args, kwargs, replayed = pending
+        token = self.token
+        sent_with = token.token
+
+        def on_unauthorized(req, result):
+            if replayed:
+                return False
+            pending[3] = True
+            with self._lock:
+                if self.token is not None and self.token.token != sent_with:
+                    # already refreshed while the request was in flight
+                    refreshed = not self.refreshing
+                else:
+                    refreshed = False
+                if not refreshed:
+                    self._queue.append(pending)
+            if refreshed:
+                self._start(pending)
+            else:
+                self.refresh()
+            return True
+
+        with using_unauthorized_handler(on_unauthorized):
+            return request_func(token, *args, **kwargs)
+
+    def _refreshed(self, token):
+        with self._lock:
+            self.refreshing = False
+            if token.refresh_token is None and self.token is not None:
+                # the server kept the refresh_token
+                token.refresh_token = self.token.refresh_token
+        self.set_token(token)
+        self._replay()
+
+    def _refresh_failed(self, failure_type, result, data):
+        with self._lock:
+            self.refreshing = False
+            queue, self._queue = self._queue, []
+        if self.expired_callback is not None:
+            self.expired_callback(failure_type, result, data)
+        for request_func, args, kwargs, replayed in queue:
+            failure_callback = kwargs.get('failure_callback')
+            if failure_callback is not None:
+                failure_callback(failure_type, result, data)
+
+    def _replay(self):
+        with self._lock:
+            queue, self._queue = self._queue, []
+        for pending in queue:
+            self._start(pending)
+
+    def _forget_header(self, token_value):
+        app = podium_api.get_podium_application()
+        if app is not None:
+            app.forget_token(token_value)
+
+    def _schedule_refresh(self):
+        token = self.token
+        if token is None or token.expires_at is None:
+            return
+        delay = max(token.expires_at - self.refresh_margin - time.time(), 0)
+        self._timer.schedule(delay, replace=True)
+
+    def _on_timer(self):
+        if self.token is not None:
+            self.refresh()
@@ -0,0 +1,874 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Transports perform the actual HTTP work behind
+**podium_api.asyncreq.make_request**. A transport receives a fully prepared
+url, method, body and header along with UrlRequest-style callbacks and is
+responsible for invoking them once the request completes.
+
+Three transports are provided:
+
+    **UrlRequestTransport**: The default, creates a Kivy UrlRequest per call.
+
+    **PooledTransport**: Keeps persistent keep-alive connections per host and
+    runs requests on a bounded pool of worker threads.
+
+    **AsyncioTransport**: Non-blocking requests on a running asyncio event
+    loop, used by **podium_api.asyncapi.AsyncPodiumAPI**. Does not require
+    Kivy.
+
+The transport used is selected with the transport kwarg of
+**podium_api.register_podium_application**.
+
+Every transport decodes json responses with its json_decoder, by default
+the fastest library found by **podium_api.jsondecode**, before the
+callbacks are dispatched.
+"""
+import asyncio
+import io
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http.client import (HTTPConnection, HTTPSConnection, HTTPException,
+                         RemoteDisconnected)
+from urllib.parse import urlparse
+import ssl
+from podium_api.jsondecode import get_json_decoder
+try:
+    from kivy.clock import Clock
+    from kivy.network.urlrequest import UrlRequest
+except ImportError:
+    # Kivy is only needed by UrlRequestTransport and the default dispatch of
+    # PooledTransport, AsyncioTransport works without it.
+    Clock = None
+    UrlRequest = None
+
+# methods a request can be sent again with, the server may have already
+# handled the first attempt when a kept-alive connection broke
+IDEMPOTENT_METHODS = frozenset(('GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS'))
+
+
+class PodiumTransport(object):
+    """
+    Base class for transports. Subclasses must implement **request**.
+
+    **Attributes:**
+        **json_decoder** (function): Loads the bytes of json responses.
+    """
+
+    json_decoder = staticmethod(get_json_decoder())
+
+    def request(self, url, method="GET", body=None, headers=None,
+                on_success=None, on_failure=None, on_error=None,
+                on_redirect=None, on_progress=None, file_path=None):
+        """
+        Starts a request and returns an object representing it.
+
+        Args:
+            url (str): The full url for the request, including the query.
+
+        Kwargs:
+            method (str): The type of request being made. Defaults to 'GET'
+
+            body (str): The already encoded body of the request.
+            Defaults to None.
+
+            headers (dict): The header for the request. Defaults to None.
+
+            on_success (function): Called for 1xx and 2xx responses as
+                on_success(request, result)
+
+            on_failure (function): Called for 4xx and 5xx responses as
+                on_failure(request, result)
+
+            on_error (function): Called when the request raised as
+                on_error(request, error)
+
+            on_redirect (function): Called for 3xx responses as
+                on_redirect(request, result)
+
+            on_progress (function): Called while reading the response as
+                on_progress(request, current_size, total_size)
+
+            file_path (str): If not None the response body is streamed into
+            this file instead of being kept in memory and the result is the
+            file_path. Defaults to None.
+
+        Return:
+            object: The request being made. Must provide the response headers
+            as _resp_headers once finished.
+
+        """
+        raise NotImplementedError()
+
+    def call_later(self, delay, callback):
+        """
+        Schedules callback to be called without arguments after delay
+        seconds, in the same context the request callbacks are called in.
+
+        Args:
+            delay (float): Seconds to wait, 0 to call as soon as possible.
+
+            callback (function): The function to call.
+
+        Return:
+            object: A handle with a cancel method.
+
+        """
+        raise NotImplementedError()
+
+    def run_in_worker(self, func, on_done, on_error):
+        """
+        Calls func away from the thread the callbacks run on, for blocking
+        work such as converting a downloaded file, then calls on_done with
+        what func returned or on_error with the exception it raised, in the
+        same context the request callbacks are called in.
+
+        Args:
+            func (function): Called without arguments.
+
+            on_done (function): Called as on_done(result).
+
+            on_error (function): Called as on_error(error).
+
+        """
+        thread = threading.Thread(target=self._worker(
+            func, lambda callback: self.call_later(0, callback), on_done,
+            on_error))
+        thread.daemon = True
+        thread.start()
+
+    def _worker(self, func, dispatch, on_done, on_error):
+        def work():
+            try:
+                result = func()
+            except Exception as error:
+                dispatch(lambda: on_error(error))
+            else:
+                dispatch(lambda: on_done(result))
+        return work
+
+    def _dispatch(self, callback, *args):
+        if callback is not None:
+            callback(*args)
+
+    def _complete(self, req, callbacks, status, resp_headers, result):
+        req._resp_status = status
+        req._resp_headers = resp_headers
+        req._result = result
+        status_class = status // 100
+        if status_class in (1, 2):
+            self._dispatch(callbacks['success'], req, result)
+        elif status_class == 3:
+            self._dispatch(callbacks['redirect'], req, result)
+        elif status_class in (4, 5):
+            self._dispatch(callbacks['failure'], req, result)
+        req._finished.set()
+
+    def _fail(self, req, callbacks, error):
+        req._error = error
+        self._dispatch(callbacks['error'], req, error)
+        req._finished.set()
+
+
+class UrlRequestTransport(PodiumTransport):
+    """
+    Transport that creates a new Kivy UrlRequest for every request. Every
+    request runs on its own thread and opens its own connection.
+
+    Responses are decoded with json_decoder by a **DecodingUrlRequest**, on
+    the thread of the request before the callbacks are dispatched to the
+    main thread.
+
+    Kwargs:
+        json_decoder (str): Name of the decoder, see
+        **podium_api.jsondecode.get_json_decoder**. Defaults to the fastest
+        available.
+
+    """
+
+    def __init__(self, json_decoder=None):
+        self.json_decoder = get_json_decoder(json_decoder)
+
+    def request(self, url, method="GET", body=None, headers=None,
+                on_success=None, on_failure=None, on_error=None,
+                on_redirect=None, on_progress=None, file_path=None):
+        if headers is not None:
+            # UrlRequest adds its User-Agent to the headers it is given
+            headers = dict(headers)
+        return DecodingUrlRequest(
+            url, method=method, req_body=body, req_headers=headers,
+            on_success=on_success, on_failure=on_failure,
+            on_redirect=on_redirect, on_progress=on_progress,
+            on_error=on_error, file_path=file_path,
+            decode=file_path is None, json_decoder=self.json_decoder)
+
+    def call_later(self, delay, callback):
+        return Clock.schedule_once(lambda dt: callback(), delay)
+
+
+def kivy_dispatch(func):
+    """
+    Schedules func to be called on the next frame of Kivy's main thread.
+    Default dispatch function of **PooledTransport**.
+    """
+    Clock.schedule_once(lambda dt: func(), 0)
+
+
+def decode_result(content_type, result, json_decoder=None):
+    """
+    Decodes a response body following the same rules as UrlRequest: json
+    content is loaded, a json body that can not be loaded is returned as a
+    str and any other content is returned unchanged.
+
+    Args:
+        content_type (str): The Content-Type header of the response, may be
+        None.
+
+        result (bytes): The raw response body, or the str UrlRequest
+        already decoded it to.
+
+    Kwargs:
+        json_decoder (function): Loads json content from the raw bytes.
+        Defaults to PodiumTransport.json_decoder.
+
+    Return:
+        object: The decoded result.
+
+    """
+    if content_type is not None and \
+            content_type.split(';')[0] == 'application/json':
+        if json_decoder is None:
+            json_decoder = PodiumTransport.json_decoder
+        try:
+            return json_decoder(result)
+        except Exception:
+            if isinstance(result, bytes):
+                try:
+                    return result.decode('utf-8')
+                except UnicodeDecodeError:
+                    pass
+    return result
+
+
+if UrlRequest is not None:
+    class DecodingUrlRequest(UrlRequest):
+        """
+        UrlRequest decoding json responses with json_decoder, in its own
+        thread like UrlRequest's decoding.
+
+        Kwargs:
+            json_decoder (function): Loads the json responses. Defaults to
+            PodiumTransport.json_decoder.
+
+            The other args and kwargs are UrlRequest's.
+
+        """
+
+        def __init__(self, *args, **kwargs):
+            # set before UrlRequest starts the thread
+            self.json_decoder = kwargs.pop('json_decoder', None)
+            super(DecodingUrlRequest, self).__init__(*args, **kwargs)
+
+        def decode_result(self, result, resp):
+            return decode_result(self.get_content_type(resp), result,
+                                 self.json_decoder)
+else:
+    DecodingUrlRequest = None
+
+
+class TransportRequest(object):
+    """
+    Request made through a **PooledTransport** or **AsyncioTransport**.
+    Mirrors the attributes of UrlRequest that the rest of podium_api relies
+    on.
+
+    **Attributes:**
+        **url** (str): The url requested.
+
+        **req_body** (str): The encoded body sent.
+
+        **req_headers** (dict): The header sent.
+
+        **file_path** (str): File the response body is streamed into, None
+        to keep it in memory.
+
+        **resp_status** (int): Status code of the response once finished.
+
+        **resp_headers** (dict): Headers of the response once finished.
+
+        **result** (object): The decoded result once finished.
+
+        **error** (Exception): The exception raised if the request errored.
+
+        **is_finished** (bool): True once a final callback has been
+        dispatched.
+    """
+
+    def __init__(self, url, method, req_body, req_headers, file_path=None):
+        self.url = url
+        self._method = method
+        self.req_body = req_body
+        self.req_headers = req_headers
+        self.file_path = file_path
+        self._resp_status = None
+        self._resp_headers = None
+        self._result = None
+        self._error = None
+        self._finished = threading.Event()
+
+    def open_body(self):
+        """
+        Returns the file object the response body is written to.
+        """
+        if self.file_path is not None:
+            return open(self.file_path, 'wb')
+        return io.BytesIO()
+
+    def close_body(self, body, content_type, json_decoder=None):
+        """
+        Closes the file object returned by **open_body** and returns the
+        result of the request, see **decode_result**.
+        """
+        if self.file_path is not None:
+            body.close()
+            return self.file_path
+        return decode_result(content_type, body.getvalue(), json_decoder)
+
+    @property
+    def resp_status(self):
+        return self._resp_status
+
+    @property
+    def resp_headers(self):
+        return self._resp_headers
+
+    @property
+    def result(self):
+        return self._result
+
+    @property
+    def error(self):
+        return self._error
+
+    @property
+    def is_finished(self):
+        return self._finished.is_set()
+
+    def wait(self, timeout=None):
+        """
+        Blocks until the response has been received and its callbacks
+        handed to the transport's dispatch. Never call this from the event
+        loop running an AsyncioTransport request.
+        """
+        self._finished.wait(timeout)
+
+
+class ConnectionPool(object):
+    """
+    Idle keep-alive connections for a single scheme/host/port.
+
+    **Attributes:**
+        **maxsize** (int): Maximum number of idle connections kept open.
+    """
+
+    def __init__(self, scheme, host, port, maxsize, timeout=None,
+                 context=None):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.context = context
+        self._idle = deque()
+        self._lock = threading.Lock()
+
+    def new_connection(self):
+        kwargs = {}
+        if self.timeout is not None:
+            kwargs['timeout'] = self.timeout
+        if self.scheme == 'https':
+            if self.context is not None:
+                kwargs['context'] = self.context
+            return HTTPSConnection(self.host, self.port, **kwargs)
+        elif self.scheme == 'http':
+            return HTTPConnection(self.host, self.port, **kwargs)
+        raise ValueError('No connection class for scheme {}'.format(
+            self.scheme))
+
+    def get(self):
+        """
+        Returns a tuple of (connection, reused). Idle connections are reused
+        most recently released first.
+        """
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        return self.new_connection(), False
+
+    def put(self, conn):
+        with self._lock:
+            if len(self._idle) < self.maxsize:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close(self):
+        with self._lock:
+            while self._idle:
+                self._idle.pop().close()
+
+
+class PooledTransport(PodiumTransport):
+    """
+    Transport that keeps persistent connections open per host so that
+    consecutive requests to the same podium_url skip the TCP and TLS
+    handshake. Requests run on a shared pool of worker threads instead of a
+    thread per request, and callbacks are handed to **dispatch** so that
+    they run on the application's main thread just like UrlRequest's do.
+
+    Kwargs:
+        pool_size (int): Maximum number of idle connections kept open per
+        host. Defaults to 4.
+
+        max_workers (int): Number of worker threads running requests.
+        Defaults to pool_size.
+
+        timeout (float): Socket timeout in seconds. Defaults to None.
+
+        chunk_size (int): Size of the chunks read from the response when
+        reporting progress or writing to a file. Defaults to 8192.
+
+        ca_file (str): CA bundle used to verify https connections.
+        Defaults to None.
+
+        verify (bool): Verify https certificates. Defaults to True.
+
+        dispatch (function): Called with a zero argument function that must
+        be run on the main thread. Defaults to scheduling on Kivy's Clock.
+
+        json_decoder (str): Name of the decoder, see
+        **podium_api.jsondecode.get_json_decoder**. Responses are decoded on
+        the worker threads. Defaults to the fastest available.
+
+    """
+
+    def __init__(self, pool_size=4, max_workers=None, timeout=None,
+                 chunk_size=8192, ca_file=None, verify=True, dispatch=None,
+                 json_decoder=None):
+        self.json_decoder = get_json_decoder(json_decoder)
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.dispatch = kivy_dispatch if dispatch is None else dispatch
+        self._context = None
+        if ca_file is not None:
+            self._context = ssl.create_default_context(cafile=ca_file)
+        elif not verify:
+            self._context = ssl.create_default_context()
+            self._context.check_hostname = False
+            self._context.verify_mode = ssl.CERT_NONE
+        self._executor = ThreadPoolExecutor(
+            max_workers=pool_size if max_workers is None else max_workers)
+        self._pools = {}
+        self._lock = threading.Lock()
+
+    def get_pool(self, scheme, host, port):
+        """
+        Returns the ConnectionPool for the scheme/host/port, creating it if
+        necessary.
+        """
+        key = (scheme, host, port)
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = ConnectionPool(scheme, host, port, self.pool_size,
+                                      timeout=self.timeout,
+                                      context=self._context)
+                self._pools[key] = pool
+            return pool
+
+    def close(self):
+        """
+        Closes all idle connections and stops the worker threads once the
+        queued requests have finished.
+        """
+        self._executor.shutdown(wait=False)
+        with self._lock:
+            for pool in self._pools.values():
+                pool.close()
+            self._pools = {}
+
+    def request(self, url, method="GET", body=None, headers=None,
+                on_success=None, on_failure=None, on_error=None,
+                on_redirect=None, on_progress=None, file_path=None):
+        req = TransportRequest(url, method, body, headers,
+                               file_path=file_path)
+        callbacks = {'success': on_success, 'failure': on_failure,
+                     'error': on_error, 'redirect': on_redirect,
+                     'progress': on_progress}
+        self._executor.submit(self._run, req, callbacks)
+        return req
+
+    def _run(self, req, callbacks):
+        try:
+            status, resp_headers, result = self._fetch(req, callbacks)
+        except Exception as e:
+            self._fail(req, callbacks, e)
+        else:
+            self._complete(req, callbacks, status, resp_headers, result)
+
+    def run_in_worker(self, func, on_done, on_error):
+        self._executor.submit(self._worker(func, self.dispatch, on_done,
+                                           on_error))
+
+    def call_later(self, delay, callback):
+        timer = threading.Timer(delay, self.dispatch, args=(callback,))
+        timer.daemon = True
+        timer.start()
+        return timer
+
+    def _dispatch(self, callback, *args):
+        if callback is not None:
+            self.dispatch(lambda: callback(*args))
+
+    def _fetch(self, req, callbacks):
+        parse = urlparse(req.url)
+        path = parse.path or '/'
+        if parse.query:
+            path += '?' + parse.query
+        pool = self.get_pool(parse.scheme, parse.hostname, parse.port)
+        headers = dict(req.req_headers or {})
+        body = req.req_body
+        if body is not None and not isinstance(body, bytes):
+            body = body.encode('utf-8')
+        method = req._method
+        if method is None:
+            method = 'GET' if body is None else 'POST'
+
+        conn, reused = pool.get()
+        try:
+            try:
+                conn.request(method, path, body, headers)
+                resp = conn.getresponse()
+            except (RemoteDisconnected, ConnectionError, HTTPException):
+                # the server may have closed an idle keep-alive connection,
+                # retry once on a fresh one
+                conn.close()
+                if not reused or method not in IDEMPOTENT_METHODS:
+                    raise
+                conn = pool.new_connection()
+                conn.request(method, path, body, headers)
+                resp = conn.getresponse()
+            body = req.open_body()
+            try:
+                self._read(req, resp, body, callbacks['progress'])
+            finally:
+                result = req.close_body(body, resp.getheader('content-type'),
+                                        self.json_decoder)
+        except Exception:
+            conn.close()
+            raise
+        if resp.will_close:
+            conn.close()
+        else:
+            pool.put(conn)
+        resp_headers = dict(resp.getheaders())
+        return resp.status, resp_headers, result
+
+    def _read(self, req, resp, body, on_progress):
+        if on_progress is None and req.file_path is None:
+            body.write(resp.read())
+            return
+        total_size = int(resp.getheader('content-length', -1))
+        self._dispatch(on_progress, req, 0, total_size)
+        bytes_so_far = 0
+        while True:
+            chunk = resp.read(self.chunk_size)
+            if not chunk:
+                break
+            body.write(chunk)
+            bytes_so_far += len(chunk)
+            self._dispatch(on_progress, req, bytes_so_far, total_size)
+
+
+class AsyncConnectionPool(object):
+    """
+    Keep-alive asyncio stream connections for a single scheme/host/port.
+
+    **Attributes:**
+        **maxsize** (int): Maximum number of connections open at once, further
+        requests wait for a connection to be released.
+
+        **closed** (bool): True once **close** was called, connections
+        released afterwards are closed instead of kept.
+    """
+
+    def __init__(self, scheme, host, port, maxsize, context=None):
+        if scheme not in ('http', 'https'):
+            raise ValueError('No connection class for scheme {}'.format(
+                scheme))
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        if port is None:
+            self.port = 443 if scheme == 'https' else 80
+        self.maxsize = maxsize
+        self.context = context
+        self.closed = False
+        self._idle = deque()
+        self._semaphore = asyncio.Semaphore(maxsize)
+
+    async def open_connection(self):
+        context = None
+        if self.scheme == 'https':
+            context = self.context
+            if context is None:
+                context = ssl.create_default_context()
+        return await asyncio.open_connection(self.host, self.port,
+                                             ssl=context)
+
+    async def acquire(self):
+        """
+        Waits for a free connection slot and returns a tuple of
+        (reader, writer, reused).
+        """
+        await self._semaphore.acquire()
+        while self._idle:
+            reader, writer = self._idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer, True
+            writer.close()
+        try:
+            reader, writer = await self.open_connection()
+        except BaseException:
+            self._semaphore.release()
+            raise
+        return reader, writer, False
+
+    def release(self, reader, writer, keep_alive):
+        if (keep_alive and not self.closed and
+                len(self._idle) < self.maxsize):
+            self._idle.append((reader, writer))
+        else:
+            writer.close()
+        self._semaphore.release()
+
+    def close(self):
+        self.closed = True
+        while self._idle:
+            self._idle.pop()[1].close()
+
+
+class AsyncioTransport(PodiumTransport):
+    """
+    Transport that performs requests as tasks on the running asyncio event
+    loop using non-blocking streams, so thousands of requests can be in
+    flight without a thread each. Connections are kept alive and reused per
+    host. Callbacks are invoked on the event loop.
+
+    **request** must be called while an event loop is running, usually from
+    within a coroutine.
+
+    Kwargs:
+        pool_size (int): Maximum number of connections open at once per
+        host. Defaults to 10.
+
+        timeout (float): Timeout in seconds for each request. Defaults to
+        None.
+
+        chunk_size (int): Size of the chunks read from the response when
+        reporting progress or writing to a file. Defaults to 65536.
+
+        ssl_context (SSLContext): Context used for https connections.
+        Defaults to ssl.create_default_context().
+
+        json_decoder (str): Name of the decoder, see
+        **podium_api.jsondecode.get_json_decoder**. Defaults to the fastest
+        available.
+
+    """
+
+    def __init__(self, pool_size=10, timeout=None, chunk_size=65536,
+                 ssl_context=None, json_decoder=None):
+        self.json_decoder = get_json_decoder(json_decoder)
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.ssl_context = ssl_context
+        self._pools = {}
+        self._tasks = set()
+
+    def get_pool(self, scheme, host, port):
+        """
+        Returns the AsyncConnectionPool for the scheme/host/port, creating
+        it if necessary.
+        """
+        key = (scheme, host, port)
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = AsyncConnectionPool(scheme, host, port, self.pool_size,
+                                       context=self.ssl_context)
+            self._pools[key] = pool
+        return pool
+
+    def close(self):
+        """
+        Closes all idle connections, the connections in use are closed once
+        their request completed.
+        """
+        for pool in self._pools.values():
+            pool.close()
+        self._pools = {}
+
+    def request(self, url, method="GET", body=None, headers=None,
+                on_success=None, on_failure=None, on_error=None,
+                on_redirect=None, on_progress=None, file_path=None):
+        req = TransportRequest(url, method, body, headers,
+                               file_path=file_path)
+        callbacks = {'success': on_success, 'failure': on_failure,
+                     'error': on_error, 'redirect': on_redirect,
+                     'progress': on_progress}
+        task = asyncio.get_running_loop().create_task(
+            self._run(req, callbacks))
+        # the loop only keeps weak references to its tasks
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return req
+
+    def call_later(self, delay, callback):
+        return asyncio.get_running_loop().call_later(delay, callback)
+
+    def run_in_worker(self, func, on_done, on_error):
+        loop = asyncio.get_running_loop()
+        loop.run_in_executor(None, self._worker(
+            func, loop.call_soon_threadsafe, on_done, on_error))
+
+    async def _run(self, req, callbacks):
+        try:
+            fetch = self._fetch(req, callbacks['progress'])
+            if self.timeout is not None:
+                fetch = asyncio.wait_for(fetch, self.timeout)
+            status, resp_headers, result = await fetch
+        except Exception as e:
+            self._fail(req, callbacks, e)
+        else:
+            self._complete(req, callbacks, status, resp_headers, result)
+
+    def _build_message(self, req, parse, method):
+        path = parse.path or '/'
+        if parse.query:
+            path += '?' + parse.query
+        body = req.req_body
+        if body is not None and not isinstance(body, bytes):
+            body = body.encode('utf-8')
+        headers = dict(req.req_headers or {})
+        headers.setdefault('Host', parse.netloc)
+        if body is not None or method in ('POST', 'PUT', 'PATCH'):
+            headers['Content-Length'] = str(len(body or b''))
+        lines = ['{} {} HTTP/1.1'.format(method, path)]
+        lines.extend('{}: {}'.format(key, value)
+                     for key, value in headers.items())
+        message = ('\r\n'.join(lines) + '\r\n\r\n').encode('utf-8')
+        if body:
+            message += body
+        return message
+
+    async def _fetch(self, req, on_progress):
+        parse = urlparse(req.url)
+        method = req._method
+        if method is None:
+            method = 'GET' if req.req_body is None else 'POST'
+        pool = self.get_pool(parse.scheme, parse.hostname, parse.port)
+        message = self._build_message(req, parse, method)
+        reader, writer, reused = await pool.acquire()
+        keep_alive = False
+        try:
+            try:
+                writer.write(message)
+                await writer.drain()
+                response = await self._read_response(reader, req, method,
+                                                     on_progress)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # the server may have closed an idle keep-alive connection,
+                # retry once on a fresh one
+                writer.close()
+                if not reused or method not in IDEMPOTENT_METHODS:
+                    raise
+                reader, writer = await pool.open_connection()
+                writer.write(message)
+                await writer.drain()
+                response = await self._read_response(reader, req, method,
+                                                     on_progress)
+            status, resp_headers, result, keep_alive = response
+        finally:
+            pool.release(reader, writer, keep_alive)
+        return status, resp_headers, result
+
+    async def _read_response(self, reader, req, method, on_progress):
+        while True:
+            head = await reader.readuntil(b'\r\n\r\n')
+            lines = head.decode('iso-8859-1').split('\r\n')
+            version, status = lines[0].split(' ', 2)[:2]
+            status = int(status)
+            # skip interim responses such as 100 Continue
+            if not 100 <= status < 200:
+                break
+        resp_headers = {}
+        for line in lines[1:]:
+            if line:
+                key, value = line.split(':', 1)
+                resp_headers[key.strip()] = value.strip()
+        lower = dict((key.lower(), value)
+                     for key, value in resp_headers.items())
+        keep_alive = version == 'HTTP/1.1' and \
+            lower.get('connection', '').lower() != 'close'
+        body = req.open_body()
+        try:
+            if method == 'HEAD' or status in (204, 304):
+                pass
+            elif 'chunked' in lower.get('transfer-encoding', '').lower():
+                await self._read_chunked(reader, req, body, on_progress)
+            elif 'content-length' in lower:
+                await self._read_length(reader, int(lower['content-length']),
+                                        req, body, on_progress)
+            else:
+                body.write(await reader.read())
+                keep_alive = False
+        finally:
+            result = req.close_body(body, lower.get('content-type'),
+                                    self.json_decoder)
+        return status, resp_headers, result, keep_alive
+
+    async def _read_length(self, reader, length, req, body, on_progress):
+        if on_progress is None and req.file_path is None:
+            body.write(await reader.readexactly(length))
+            return
+        if on_progress is not None:
+            on_progress(req, 0, length)
+        bytes_so_far = 0
+        while bytes_so_far < length:
+            chunk = await reader.readexactly(
+                min(self.chunk_size, length - bytes_so_far))
+            body.write(chunk)
+            bytes_so_far += len(chunk)
+            if on_progress is not None:
+                on_progress(req, bytes_so_far, length)
+
+    async def _read_chunked(self, reader, req, body, on_progress):
+        if on_progress is not None:
+            on_progress(req, 0, -1)
+        bytes_so_far = 0
+        while True:
+            size_line = await reader.readuntil(b'\r\n')
+            size = int(size_line.split(b';', 1)[0].strip(), 16)
+            if size == 0:
+                # discard any trailers
+                while (await reader.readuntil(b'\r\n')) != b'\r\n':
+                    pass
+                break
+            body.write(await reader.readexactly(size))
+            await reader.readexactly(2)
+            bytes_so_far += size
+            if on_progress is not None:
+                on_progress(req, bytes_so_far, -1)
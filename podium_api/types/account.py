@@ -25,6 +25,9 @@ class PodiumAccount(object):
         **exports_uri** (str): URI to account's telemetry exports
     """
 
+    __slots__ = ('account_id', 'username', 'email', 'devices_uri',
+                 'exports_uri', 'streams_uri', 'user_uri', 'events_uri')
+
     def __init__(self, account_id, username, email, devices_uri, exports_uri,
                  streams_uri, user_uri, events_uri):
         self.account_id = account_id
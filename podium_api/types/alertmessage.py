@@ -1,5 +1,8 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+from podium_api.types.identity import identity
+
+
 class PodiumAlertMessage(object):
     """
     Object that represents an Alert Message
@@ -24,6 +27,10 @@ class PodiumAlertMessage(object):
         
         **user_uri** (str): URI of the user this alertmessage belongs to
     """
+    __slots__ = ('alertmessage_id', 'uri', 'send_time', 'ack_time', 'message',
+                 'priority', 'sender_id', 'eventdevice_uri', 'device_uri',
+                 'user_uri', '__weakref__')
+
     def __init__(self, alertmessage_id, uri, send_time, ack_time, message, priority, sender_id, eventdevice_uri, device_uri, user_uri):
         self.alertmessage_id = alertmessage_id
         self.uri = uri
@@ -48,14 +55,15 @@ def get_alertmessage_from_json(json):
         AlertMessage: The AlertMessage object for the data.
         
     """
-    return PodiumAlertMessage(json['id'],
-                        json['URI'],
-                        json['send_time'],
-                        json['ack_time'],
-                        json['message'],
-                        json['priority'],
-                        json['sender_id'],
-                        json['eventdevice_uri'],
-                        json['device_uri'],
-                        json['user_uri']
-                        )
+    alertmessage = PodiumAlertMessage(json['id'],
+                                json['URI'],
+                                json['send_time'],
+                                json['ack_time'],
+                                json['message'],
+                                json['priority'],
+                                json['sender_id'],
+                                json['eventdevice_uri'],
+                                json['device_uri'],
+                                json['user_uri']
+                                )
+    return identity(alertmessage, json)
@@ -1,9 +1,75 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+from types import MappingProxyType
+
+# token headers kept per application before the cache is emptied
+MAX_CACHED_TOKENS = 64
+
 
 class PodiumApplication():
 
-    def __init__(self, app_id, app_secret, podium_url=None):
+    def __init__(self, app_id, app_secret, podium_url=None, transport=None,
+                 cache=None, coalesce_requests=False,
+                 retry_policy=None, throttle=None, circuit_breaker=None,
+                 lazy_payloads=False, identity_map=None):
         self.app_id = app_id
         self.app_secret = app_secret
         self.podium_url = 'https://podium.live' if podium_url is None else podium_url
+        self.transport = transport
+        self.cache = cache
+        self.coalesce_requests = coalesce_requests
+        self.retry_policy = retry_policy
+        self.throttle = throttle
+        self.circuit_breaker = circuit_breaker
+        self.lazy_payloads = lazy_payloads
+        self.identity_map = identity_map
+        self._token_headers = {}
+        self._basic_header = None
+
+    def json_header_token(self, token):
+        """
+        Returns the read only header authenticating requests with token, the
+        same mapping for every request made with the same token.
+
+        Args:
+            token (str): The OAuth2 token of the user.
+
+        Return:
+            MappingProxyType: The header.
+
+        """
+        header = self._token_headers.get(token)
+        if header is None:
+            if len(self._token_headers) >= MAX_CACHED_TOKENS:
+                self._token_headers.clear()
+            header = MappingProxyType({
+                "Content-Type": "application/x-www-form-urlencoded",
+                "Authorization": "Bearer {}".format(token),
+                "Accept": "application/json"})
+            self._token_headers[token] = header
+        return header
+
+    def json_header(self):
+        """
+        Returns the read only header authenticating requests with the app_id
+        and app_secret.
+
+        Return:
+            MappingProxyType: The header.
+
+        """
+        credentials = (self.app_id, self.app_secret)
+        cached = self._basic_header
+        if cached is None or cached[0] != credentials:
+            cached = (credentials, MappingProxyType({
+                "Content-Type": "application/x-www-form-urlencoded",
+                "Authorization": "Basic {}:{}".format(*credentials),
+                "Accept": "application/json"}))
+            self._basic_header = cached
+        return cached[1]
+
+    def forget_token(self, token):
+        """
+        Drops the cached header of token, once it was revoked or replaced.
+        """
+        self._token_headers.pop(token, None)
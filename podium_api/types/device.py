@@ -1,5 +1,8 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+from podium_api.types.identity import identity
+
+
 class PodiumDevice(object):
     """
     Object that represents a Device.
@@ -17,6 +20,9 @@ class PodiumDevice(object):
         **private** (bool): Is the event only viewable to creator?
     """
 
+    __slots__ = ('device_id', 'uri', 'serial', 'name', 'private',
+                 '__weakref__')
+
     def __init__(self, device_id, uri, serial, name, private):
         self.device_id = device_id
         self.uri = uri
@@ -35,5 +41,6 @@ def get_device_from_json(json):
     Return:
         PodiumEvent: The PodiumEvent object for this data.
     """
-    return PodiumDevice(json['id'], json['URI'], json.get('serial', None),
-                        json.get('name', None), json.get('private', None))
+    device = PodiumDevice(json['id'], json['URI'], json.get('serial', None),
+                          json.get('name', None), json.get('private', None))
+    return identity(device, json)
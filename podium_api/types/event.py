@@ -1,5 +1,8 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+from podium_api.types.identity import identity
+
+
 class PodiumEvent(object):
     """
     Object that represents an Event.
@@ -27,6 +30,10 @@ class PodiumEvent(object):
         **user_avatar_url** (str): URL for user avatar
     """
 
+    __slots__ = ('event_id', 'uri', 'devices_uri', 'title', 'start_time',
+                 'end_time', 'venue_uri', 'venue_id', 'private', 'user_uri',
+                 'user_avatar_url', '__weakref__')
+
     def __init__(self, event_id, uri, devices_uri, title, start_time,
                  end_time, venue_uri, venue_id, private, user_uri, user_avatar_url):
         self.event_id = event_id
@@ -52,9 +59,10 @@ def get_event_from_json(json):
     Return:
         PodiumEvent: The PodiumEvent object for this data.
     """
-    return PodiumEvent(json['id'], json['URI'], json.get('devices_uri', None),
-                       json.get('title', None), json.get('start_time', None),
-                       json.get('end_time', None),
-                       json.get('venue_uri', None), json.get('venue_id', None),
-                       json.get('private', None),
-                       json.get('user_uri', None), json.get('user_avatar_url', None))
+    event = PodiumEvent(json['id'], json['URI'], json.get('devices_uri', None),
+                        json.get('title', None), json.get('start_time', None),
+                        json.get('end_time', None),
+                        json.get('venue_uri', None), json.get('venue_id', None),
+                        json.get('private', None),
+                        json.get('user_uri', None), json.get('user_avatar_url', None))
+    return identity(event, json)
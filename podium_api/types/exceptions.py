@@ -13,3 +13,20 @@ class NoEndpointOrIdsProvided(Exception):
     without providing an endpoint or required ids.
     """
     pass
+
+
+class PodiumRequestFailed(Exception):
+    """This exception is raised by the awaitable requests of
+    podium_api.asyncapi when a request fails or errors.
+
+    **Attributes:**
+        **failure_type** (str): The failure type that would have been passed
+        to a failure_callback, such as 'error' or 'failure'.
+
+        **result** (object): The result or exception of the request.
+    """
+
+    def __init__(self, failure_type, result):
+        super(PodiumRequestFailed, self).__init__(failure_type, result)
+        self.failure_type = failure_type
+        self.result = result
@@ -17,6 +17,9 @@ class PodiumFriendship(object):
         **friend_uri** (str): URI to user being followed.
 
     """
+    __slots__ = ('friendship_id', 'user_id', 'user_uri', 'friend_id',
+                 'friend_uri')
+
     def __init__(self, friendship_id, user_id, user_uri, friend_id,
                  friend_uri):
         self.friendship_id = friendship_id
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Identity map making the get_*_from_json converters return the same instance
+for the same URI. Enable it by passing an IdentityMap to
+**podium_api.register_podium_application**.
+
+Objects are only weakly referenced, an object no longer used by the
+application is collected and the next response creates a new one. When a
+newer representation of an object arrives the existing instance is updated
+in place with the fields that representation holds, a partial or not
+expanded representation leaves the other attributes as they are.
+"""
+import threading
+import weakref
+import podium_api
+
+
+def slot_names(cls):
+    """
+    Returns the names of the attributes stored in the slots of cls.
+    """
+    return [name for name in cls.__slots__ if name != '__weakref__']
+
+
+class IdentityMap(object):
+    """
+    Weak mapping of (class, uri) to the object representing it.
+
+    Kwargs:
+        on_change (function): Called when an object was updated in place
+        with different values, will have the signature:
+            on_change(obj (object), changed (list))
+        changed holds the names of the attributes that changed. Defaults to
+        None.
+
+    **Attributes:**
+        **hits** (int): Number of objects converted that were already in
+        the map.
+
+        **changes** (int): Number of objects updated with different values.
+    """
+
+    def __init__(self, on_change=None):
+        self.on_change = on_change
+        self.hits = 0
+        self.changes = 0
+        self._objects = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._objects)
+
+    def get(self, cls, uri):
+        """
+        Returns the object of cls for uri, None if there is none.
+        """
+        return self._objects.get((cls, uri))
+
+    def clear(self):
+        with self._lock:
+            self._objects.clear()
+
+    def merge(self, obj, fields=None):
+        """
+        Returns the instance mapped to obj's class and uri, updated with the
+        attributes of obj, or obj itself if there is none yet.
+
+        Kwargs:
+            fields (iterable): Names of the attributes obj's representation
+            held, the others are not merged. Defaults to None, every
+            attribute.
+        """
+        key = (type(obj), obj.uri)
+        names = slot_names(type(obj))
+        if fields is not None:
+            fields = set(fields)
+            names = [name for name in names if name in fields]
+        changed = []
+        with self._lock:
+            existing = self._objects.get(key)
+            if existing is None:
+                self._objects[key] = obj
+                return obj
+            self.hits += 1
+            for name in names:
+                value = getattr(obj, name)
+                if getattr(existing, name) != value:
+                    setattr(existing, name, value)
+                    changed.append(name)
+            if changed:
+                self.changes += 1
+        if changed and self.on_change is not None:
+            self.on_change(existing, changed)
+        return existing
+
+
+def get_identity_map():
+    """
+    Returns the IdentityMap provided to
+    **podium_api.register_podium_application**, or None.
+    """
+    app = podium_api.get_podium_application()
+    if app is not None:
+        return app.identity_map
+    return None
+
+
+def identity(obj, json=None):
+    """
+    Returns the instance the registered IdentityMap holds for obj, see
+    **IdentityMap.merge**, or obj if there is no IdentityMap or obj has no
+    uri.
+
+    Kwargs:
+        json (dict): The json obj was converted from, only the attributes
+        named like one of its keys are merged. Defaults to None, every
+        attribute.
+    """
+    identity_map = get_identity_map()
+    if identity_map is None or obj.uri is None:
+        return obj
+    return identity_map.merge(obj, None if json is None else json.keys())
@@ -1,5 +1,8 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+from podium_api.types.identity import identity
+
+
 class PodiumLap(object):
     """
     Object that represents a Lap.
@@ -19,6 +22,9 @@ class PodiumLap(object):
 
     """
 
+    __slots__ = ('uri', 'raw_data_uri', 'lap_number', 'end_time',
+                 'aggregates', 'lap_time', '__weakref__')
+
     def __init__(self, uri, raw_data_uri, lap_number, end_time,
                  aggregates, lap_time):
         self.uri = uri
@@ -39,6 +45,7 @@ def get_lap_from_json(json):
     Return:
         PodiumEvent: The PodiumEvent object for this data.
     """
-    return PodiumLap(json["URI"], json["raw_data_uri"], json['lap_number'],
-                     json['end_time'], json.get('aggregates', None),
-                     json['lap_time'])
+    lap = PodiumLap(json["URI"], json["raw_data_uri"], json['lap_number'],
+                    json['end_time'], json.get('aggregates', None),
+                    json['lap_time'])
+    return identity(lap, json)
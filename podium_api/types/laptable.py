@@ -0,0 +1,269 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Columnar representation of laps for analysis. Requires numpy, which is an
+optional dependency of podium_api, an ImportError is raised when a LapTable
+is built without it.
+"""
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+AGGREGATE_STATS = ('min', 'max', 'avg')
+
+
+def require_numpy():
+    if np is None:
+        raise ImportError("LapTable requires numpy, install it with "
+                          "'pip install numpy'")
+
+
+class LapTable(object):
+    """
+    Laps stored column by column in numpy arrays, one row per lap in the
+    order the laps were received.
+
+    **Attributes:**
+        **uri** (numpy.ndarray): URI of each lap.
+
+        **lap_number** (numpy.ndarray): Lap numbers as int64.
+
+        **lap_time** (numpy.ndarray): Lap times in minutes as float64.
+
+        **end_time** (numpy.ndarray): Time each lap ended, as returned by the
+        api.
+
+        **channels** (dict): For each aggregate channel name a dict of
+        'min', 'max' and 'avg' float64 arrays. Laps without an aggregate for
+        a channel hold NaN.
+    """
+
+    __slots__ = ('uri', 'lap_number', 'lap_time', 'end_time', 'channels')
+
+    def __init__(self, uri, lap_number, lap_time, end_time, channels):
+        require_numpy()
+        self.uri = np.asarray(uri)
+        self.lap_number = np.asarray(lap_number, dtype=np.int64)
+        self.lap_time = np.asarray(lap_time, dtype=np.float64)
+        self.end_time = np.asarray(end_time)
+        self.channels = channels
+
+    def __len__(self):
+        return len(self.lap_number)
+
+    def column(self, channel, stat='max'):
+        """
+        Returns the array of one aggregate of a channel.
+
+        Args:
+            channel (str): Name of the channel.
+
+        Kwargs:
+            stat (str): One of 'min', 'max' or 'avg'. Defaults to 'max'.
+
+        Return:
+            numpy.ndarray: The aggregate for every lap.
+
+        """
+        return self.channels[channel][stat]
+
+    def best_lap(self):
+        """
+        Returns the fastest lap.
+
+        Return:
+            tuple: (lap_number (int), lap_time (float)), None if there are
+            no lap times.
+
+        """
+        if not len(self) or np.isnan(self.lap_time).all():
+            return None
+        index = np.nanargmin(self.lap_time)
+        return int(self.lap_number[index]), float(self.lap_time[index])
+
+    def percentile(self, channel, q, stat='max'):
+        """
+        Returns the q-th percentile of an aggregate of channel over all laps,
+        ignoring laps without it.
+
+        Args:
+            channel (str): Name of the channel.
+
+            q (float or list): Percentile or percentiles between 0 and 100.
+
+        Kwargs:
+            stat (str): One of 'min', 'max' or 'avg'. Defaults to 'max'.
+
+        Return:
+            float or numpy.ndarray: The percentile, one per q if q is a list.
+
+        """
+        return np.nanpercentile(self.column(channel, stat), q)
+
+    def channel_max(self, channel):
+        """
+        Returns the highest value of channel over all laps.
+        """
+        return float(np.nanmax(self.column(channel, 'max')))
+
+    def channel_min(self, channel):
+        """
+        Returns the lowest value of channel over all laps.
+        """
+        return float(np.nanmin(self.column(channel, 'min')))
+
+    def rolling_average(self, window, channel=None, stat='avg'):
+        """
+        Returns the average over the last window laps for every lap.
+
+        Args:
+            window (int): Number of laps averaged.
+
+        Kwargs:
+            channel (str): Channel to average, the lap time is averaged if
+            None. Defaults to None.
+
+            stat (str): Aggregate of channel averaged. Defaults to 'avg'.
+
+        Return:
+            numpy.ndarray: len(self) - window + 1 averages, the first is
+            the average of the first window laps.
+
+        """
+        values = self.lap_time if channel is None else self.column(channel,
+                                                                   stat)
+        if window < 1 or window > len(values):
+            return np.empty(0)
+        sums = np.cumsum(np.insert(values, 0, 0.0))
+        return (sums[window:] - sums[:-window]) / window
+
+    def select(self, mask):
+        """
+        Returns a new LapTable with the rows where mask, a boolean array or
+        index array, is True.
+        """
+        channels = {name: {stat: values[mask]
+                           for stat, values in stats.items()}
+                    for name, stats in self.channels.items()}
+        return LapTable(self.uri[mask], self.lap_number[mask],
+                        self.lap_time[mask], self.end_time[mask], channels)
+
+    def filter_laps(self, first=None, last=None):
+        """
+        Returns a new LapTable with the laps numbered from first to last,
+        both included.
+
+        Kwargs:
+            first (int): First lap number kept, no lower limit if None.
+
+            last (int): Last lap number kept, no upper limit if None.
+
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if first is not None:
+            mask &= self.lap_number >= first
+        if last is not None:
+            mask &= self.lap_number <= last
+        return self.select(mask)
+
+
+def iter_aggregates(aggregates):
+    """
+    Yields (channel, stats (dict)) for the aggregates of a lap. Accepts
+    either a dict of channel name to stats or a list of stats dicts naming
+    their channel with a 'channel' or 'name' key. Anything else is skipped.
+    """
+    if isinstance(aggregates, dict):
+        for channel, stats in aggregates.items():
+            if isinstance(stats, dict):
+                yield channel, stats
+    elif aggregates:
+        for stats in aggregates:
+            if isinstance(stats, dict):
+                channel = stats.get('channel', stats.get('name'))
+                if channel is not None:
+                    yield channel, stats
+
+
+def to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def build_lap_table(rows):
+    """
+    rows is an iterable of (uri, lap_number, lap_time, end_time, aggregates)
+    tuples.
+    """
+    require_numpy()
+    uris, lap_numbers, lap_times, end_times, aggregates = [], [], [], [], []
+    for uri, lap_number, lap_time, end_time, lap_aggregates in rows:
+        uris.append(uri)
+        lap_numbers.append(int(lap_number))
+        lap_times.append(to_float(lap_time))
+        end_times.append(end_time)
+        aggregates.append(lap_aggregates)
+    count = len(uris)
+    channels = {}
+    for row, lap_aggregates in enumerate(aggregates):
+        for channel, stats in iter_aggregates(lap_aggregates):
+            if channel not in channels:
+                channels[channel] = {stat: np.full(count, np.nan)
+                                     for stat in AGGREGATE_STATS}
+            for stat in AGGREGATE_STATS:
+                channels[channel][stat][row] = to_float(stats.get(stat))
+    return LapTable(uris, lap_numbers, lap_times, end_times, channels)
+
+
+def get_lap_table_from_json(json):
+    """
+    Returns a LapTable from the list of lap json dicts received from podium
+    api, without creating a PodiumLap for each of them.
+
+    Args:
+        json (list): List of lap dicts from REST api
+
+    Return:
+        LapTable: The LapTable for this data.
+    """
+    return build_lap_table((lap['URI'], lap['lap_number'], lap['lap_time'],
+                            lap['end_time'], lap.get('aggregates', None))
+                           for lap in json)
+
+
+def get_lap_table_from_laps(laps):
+    """
+    Returns a LapTable from a list of PodiumLap.
+    """
+    return build_lap_table((lap.uri, lap.lap_number, lap.lap_time,
+                            lap.end_time, lap.aggregates) for lap in laps)
+
+
+def concatenate_lap_tables(tables):
+    """
+    Returns a single LapTable with the rows of every table in order, for
+    example to join the pages of a paged request.
+    """
+    require_numpy()
+    tables = list(tables)
+    if not tables:
+        return LapTable([], [], [], [], {})
+    names = []
+    for table in tables:
+        names.extend(name for name in table.channels if name not in names)
+    channels = {}
+    for name in names:
+        channels[name] = {
+            stat: np.concatenate([table.channels[name][stat]
+                                  if name in table.channels
+                                  else np.full(len(table), np.nan)
+                                  for table in tables])
+            for stat in AGGREGATE_STATS}
+    return LapTable(np.concatenate([table.uri for table in tables]),
+                    np.concatenate([table.lap_number for table in tables]),
+                    np.concatenate([table.lap_time for table in tables]),
+                    np.concatenate([table.end_time for table in tables]),
+                    channels)
@@ -1,5 +1,10 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+try:
+    from collections.abc import Sequence
+except ImportError:
+    from collections import Sequence
+import podium_api
 from podium_api.types.event import get_event_from_json
 from podium_api.types.friendship import get_friendship_from_json
 from podium_api.types.user import get_user_from_json
@@ -14,7 +19,8 @@ class PodiumPagedResponse(object):
     Object that represents data returned from a paged request.
 
     **Attributes:**
-        **payload** (list): The data returned for this page.
+        **payload** (list): The data returned for this page, a LazyPayload
+        if the response was created lazily.
 
         **total** (int): The total number of events found.
 
@@ -27,6 +33,8 @@ class PodiumPagedResponse(object):
         mirror the web api.
     """
 
+    __slots__ = ('payload', 'total', 'next_uri', 'prev_uri', 'payload_name')
+
     def __init__(self, payload, total, next_uri, prev_uri, payload_name=None):
         self.payload = payload
         self.total = total
@@ -35,12 +43,72 @@ class PodiumPagedResponse(object):
         self.payload_name = payload_name
 
     def __getattr__(self, name):
-        if name == self.payload_name:
+        # payload_name is looked up before it is set when unpickling
+        if name != 'payload_name' and name == self.payload_name:
             return self.payload
         else:
             raise AttributeError()
 
 
+_MISSING = object()
+
+
+class LazyPayload(Sequence):
+    """
+    Read only sequence view of the payload dicts of a page that converts an
+    item the first time it is accessed, and then keeps the object.
+
+    **Attributes:**
+        **raw** (list): The payload dicts, read them directly to avoid
+        creating the objects.
+    """
+
+    __slots__ = ('raw', '_convert', '_items')
+
+    def __init__(self, raw, convert):
+        self.raw = raw
+        self._convert = convert
+        self._items = [_MISSING] * len(raw)
+
+    def __len__(self):
+        return len(self.raw)
+
+    def __reduce__(self):
+        # the converted items are not kept, they are created again on access
+        return (LazyPayload, (self.raw, self._convert))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        item = self._items[index]
+        if item is _MISSING:
+            item = self._items[index] = self._convert(self.raw[index])
+        return item
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __repr__(self):
+        return 'LazyPayload({} items, {} converted)'.format(
+            len(self), self.converted())
+
+    def converted(self):
+        """
+        Returns the number of items converted so far.
+        """
+        return sum(item is not _MISSING for item in self._items)
+
+
 PAYLOAD_NAME_TO_OBJECT = {
     'events': get_event_from_json,
     'friendships': get_friendship_from_json,
@@ -53,7 +121,8 @@ PAYLOAD_NAME_TO_OBJECT = {
 }
 
 
-def get_paged_response_from_json(json, payload_name):
+def get_paged_response_from_json(json, payload_name, payload_func=None,
+                                 lazy=None):
     """
     Returns a PodiumPagedResponse object from the json dict received from
     podium api.
@@ -65,11 +134,29 @@ def get_paged_response_from_json(json, payload_name):
         Will be used to determine the object the data gets converted into.
         The "payload" attr will also be returned with lookup by payload_name.
 
+    Kwargs:
+        payload_func (function): If not None it is called with the list of
+        payload dicts and its return value becomes the payload, instead of
+        converting each dict. Defaults to None.
+
+        lazy (bool): If True the payload is a LazyPayload converting each
+        dict on first access. Defaults to the lazy_payloads setting of the
+        registered application.
+
     Return:
         PodiumPagedResponse: The PodiumPagedResponse object for the data.
     """
-    conversion_func = PAYLOAD_NAME_TO_OBJECT[payload_name]
-    data = [conversion_func(x) for x in json[payload_name]]
+    if lazy is None:
+        app = podium_api.get_podium_application()
+        lazy = app is not None and app.lazy_payloads
+    if payload_func is not None:
+        data = payload_func(json[payload_name])
+    elif lazy:
+        data = LazyPayload(json[payload_name],
+                           PAYLOAD_NAME_TO_OBJECT[payload_name])
+    else:
+        conversion_func = PAYLOAD_NAME_TO_OBJECT[payload_name]
+        data = [conversion_func(x) for x in json[payload_name]]
     return PodiumPagedResponse(data, json['total'], json.get('nextURI', None),
                                json.get('prevURI', None),
                                payload_name=payload_name)
@@ -1,5 +1,6 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+from podium_api.types.identity import identity
 
 
 class Racestat(object):
@@ -44,6 +45,13 @@ class Racestat(object):
         **user_uri** (str): URI of the user this racestat belongs to        
     """
 
+    __slots__ = ('racestat_id', 'uri', 'comp_number', 'comp_class',
+                 'total_laps', 'last_lap_time', 'position_overall',
+                 'position_in_class', 'comp_number_ahead',
+                 'comp_number_behind', 'gap_to_ahead', 'gap_to_behind',
+                 'laps_to_ahead', 'laps_to_behind', 'fc_flag', 'comp_flag',
+                 'eventdevice_uri', 'device_uri', 'user_uri', '__weakref__')
+
     def __init__(self, racestat_id, uri, comp_number, comp_class, total_laps, last_lap_time,
                  position_overall, position_in_class, comp_number_ahead, comp_number_behind,
                  gap_to_ahead, gap_to_behind, laps_to_ahead, laps_to_behind,
@@ -80,11 +88,12 @@ def get_racestat_from_json(json):
     Return:
         Racestat: The Racestat object for the data.
     """
-    return Racestat(json['id'], json['URI'], json['comp_number'], json['comp_class'],
-                         json['total_laps'], json['last_lap_time'],
-                         json['position_overall'], json['position_in_class'],
-                         json['comp_number_ahead'], json['comp_number_behind'],
-                         json['gap_to_ahead'], json['gap_to_behind'],
-                         json['laps_to_ahead'], json['laps_to_behind'],
-                         json['fc_flag'], json['comp_flag'],
-                         json['eventdevice_uri'], json['device_uri'], json['user_uri'])
+    racestat = Racestat(json['id'], json['URI'], json['comp_number'], json['comp_class'],
+                             json['total_laps'], json['last_lap_time'],
+                             json['position_overall'], json['position_in_class'],
+                             json['comp_number_ahead'], json['comp_number_behind'],
+                             json['gap_to_ahead'], json['gap_to_behind'],
+                             json['laps_to_ahead'], json['laps_to_behind'],
+                             json['fc_flag'], json['comp_flag'],
+                             json['eventdevice_uri'], json['device_uri'], json['user_uri'])
+    return identity(racestat, json)
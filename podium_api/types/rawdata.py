@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+On disk store of the logged telemetry of a lap, one file of float64
+samples per channel. Channels are opened as numpy memory maps so sessions
+larger than the available memory can be analyzed. Reading channels requires
+numpy, which is an optional dependency of podium_api.
+"""
+import csv
+import json
+import os
+from array import array
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+INDEX_FILE = 'channels.json'
+ROWS_PER_FLUSH = 8192
+
+
+class LapRawData(object):
+    """
+    Telemetry of a lap stored in directory.
+
+    **Attributes:**
+        **directory** (str): Directory holding the channel files.
+
+        **channels** (list): Names of the channels, in log order.
+
+        **units** (dict): Units of each channel, None when not logged.
+
+        **samples** (int): Number of samples of every channel. Samples a
+        channel did not log are NaN.
+    """
+
+    __slots__ = ('directory', 'channels', 'units', 'samples', '_maps')
+
+    def __init__(self, directory, channels, units, samples):
+        self.directory = directory
+        self.channels = channels
+        self.units = units
+        self.samples = samples
+        self._maps = {}
+
+    def __len__(self):
+        return self.samples
+
+    def channel_path(self, name):
+        return os.path.join(self.directory,
+                            'channel_{}.f64'.format(self.channels.index(name)))
+
+    def channel(self, name):
+        """
+        Returns the samples of a channel without reading them into memory.
+
+        Args:
+            name (str): Name of the channel.
+
+        Return:
+            numpy.memmap: Read only float64 array of the samples.
+
+        """
+        if np is None:
+            raise ImportError("LapRawData.channel requires numpy, install "
+                              "it with 'pip install numpy'")
+        if name not in self._maps:
+            if not self.samples:
+                return np.empty(0)
+            self._maps[name] = np.memmap(self.channel_path(name),
+                                         dtype=np.float64, mode='r',
+                                         shape=(self.samples,))
+        return self._maps[name]
+
+
+def parse_header(field):
+    """
+    Returns (name, units) from a RaceCapture log header field such as
+    '"Speed"|"mph"|0|150|10', or a plain channel name.
+    """
+    parts = [part.strip().strip('"') for part in field.split('|')]
+    units = parts[1] if len(parts) > 1 and parts[1] else None
+    return parts[0], units
+
+
+def to_sample(value):
+    try:
+        return float(value)
+    except ValueError:
+        return float('nan')
+
+
+def get_lap_raw_data_from_csv(csv_path, directory):
+    """
+    Converts a raw data csv into a LapRawData stored in directory. The csv is
+    read one row at a time, so memory use does not depend on its size.
+
+    Args:
+        csv_path (str): The csv downloaded from a lap's raw_data_uri.
+
+        directory (str): Directory the channel files are written to, created
+        if needed.
+
+    Return:
+        LapRawData: The LapRawData for this data.
+    """
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    with open(csv_path, newline='') as csv_file:
+        reader = csv.reader(csv_file)
+        header = next(reader, [])
+        channels, units = [], {}
+        for field in header:
+            name, unit = parse_header(field)
+            channels.append(name)
+            units[name] = unit
+        raw_data = LapRawData(directory, channels, units, 0)
+        files = [open(raw_data.channel_path(name), 'wb') for name in channels]
+        try:
+            buffers = [array('d') for name in channels]
+            nan = float('nan')
+            for row in reader:
+                if not row:
+                    continue
+                for index, values in enumerate(buffers):
+                    value = row[index] if index < len(row) else ''
+                    values.append(to_sample(value) if value else nan)
+                raw_data.samples += 1
+                if raw_data.samples % ROWS_PER_FLUSH == 0:
+                    for values, channel_file in zip(buffers, files):
+                        values.tofile(channel_file)
+                        del values[:]
+            for values, channel_file in zip(buffers, files):
+                values.tofile(channel_file)
+        finally:
+            for channel_file in files:
+                channel_file.close()
+    with open(os.path.join(directory, INDEX_FILE), 'w') as index_file:
+        json.dump({'channels': channels, 'units': units,
+                   'samples': raw_data.samples}, index_file)
+    return raw_data
+
+
+def open_lap_raw_data(directory):
+    """
+    Returns the LapRawData previously stored in directory by
+    **get_lap_raw_data_from_csv**.
+    """
+    with open(os.path.join(directory, INDEX_FILE)) as index_file:
+        index = json.load(index_file)
+    return LapRawData(directory, index['channels'], index['units'],
+                      index['samples'])
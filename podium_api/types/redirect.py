@@ -9,6 +9,8 @@ class PodiumRedirect(object):
 
         **type** (str): Type of object. Can be 'event', 'device', 'eventdevice'
     """
+    __slots__ = ('location', 'object_type')
+
     def __init__(self, location, object_type):
         self.location = location
         self.object_type = object_type
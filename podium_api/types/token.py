@@ -11,12 +11,33 @@ class PodiumToken(object):
         **token_type** (string): The type of token issued.
 
         **created** (int): The time created.register_podium_application.
+
+        **expires_in** (int): Seconds the token is valid for after created,
+        None if it does not expire.
+
+        **refresh_token** (string): Token to request a new token with once
+        this one expires, None if the server issued none.
     """
 
-    def __init__(self, token, token_type, created):
+    __slots__ = ('token', 'token_type', 'created', 'expires_in',
+                 'refresh_token')
+
+    def __init__(self, token, token_type, created, expires_in=None,
+                 refresh_token=None):
         self.token = token
         self.token_type = token_type
         self.created = created
+        self.expires_in = expires_in
+        self.refresh_token = refresh_token
+
+    @property
+    def expires_at(self):
+        """
+        Time the token expires at, None if it does not expire.
+        """
+        if self.expires_in is None or self.created is None:
+            return None
+        return self.created + self.expires_in
 
 def get_token_from_json(json):
     """
@@ -29,4 +50,14 @@ def get_token_from_json(json):
         PodiumToken: The PodiumToken object for the data.
     """
     return PodiumToken(json['access_token'], json['token_type'],
-                       json['created_at'])
+                       json['created_at'], json.get('expires_in', None),
+                       json.get('refresh_token', None))
+
+
+def get_json_from_token(token):
+    """
+    Returns the json dict **get_token_from_json** creates token from.
+    """
+    return {'access_token': token.token, 'token_type': token.token_type,
+            'created_at': token.created, 'expires_in': token.expires_in,
+            'refresh_token': token.refresh_token}
@@ -1,5 +1,7 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+from podium_api.types.identity import identity
+
 
 class PodiumUser(object):
     """
@@ -31,6 +33,11 @@ class PodiumUser(object):
         by the user this attr will have a value, otherwise None. Defaults to
         None.
     """
+    __slots__ = ('user_id', 'uri', 'username', 'description', 'avatar_url',
+                 'profile_image_url', 'links', 'friendships_uri',
+                 'followers_uri', 'friendship_uri', 'events_uri', 'venues_uri',
+                 '__weakref__')
+
     def __init__(self, user_id, uri, username, description, avatar_url, profile_image_url,
                  links, friendships_uri, followers_uri, friendship_uri, events_uri,
                  venues_uri):
@@ -58,7 +65,7 @@ def get_user_from_json(json):
     Return:
         PodiumUser: The PodiumUser object for the data.
     """
-    return PodiumUser(json['id'],
+    user = PodiumUser(json['id'],
                       json['URI'],
                       json['username'],
                       json['description'],
@@ -71,3 +78,4 @@ def get_user_from_json(json):
                       json['events_uri'],
                       json['venues_uri']
                       )
+    return identity(user, json)
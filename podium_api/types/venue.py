@@ -1,5 +1,7 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+from podium_api.types.identity import identity
+
 
 class PodiumVenue(object):
     """
@@ -12,6 +14,11 @@ class PodiumVenue(object):
 
         **name** (string): The Venue's name.
     """
+    __slots__ = ('venue_id', 'uri', 'events_uri', 'updated', 'created',
+                 'name', 'centerpoint', 'country_code', 'configuration',
+                 'track_map_array', 'start_finish', 'finish', 'sector_points',
+                 'length', '__weakref__')
+
     def __init__(self, venue_id, uri, events_uri, updated, created,
                  name,
                  centerpoint,
@@ -48,18 +55,19 @@ def get_venue_from_json(json):
     Return:
         PodiumVenue: The PodiumVenue object for the data.
     """
-    return PodiumVenue(json['id'],
-                      json['URI'],
-                      json['events_uri'],
-                      json['updated'],
-                      json['created'],
-                      json.get('name', None),
-                      json.get('centerpoint', None),
-                      json.get('country_code', None),
-                      json.get('configuration', None),
-                      json.get('track_map_array', None),
-                      json.get('start_finish', None),
-                      json.get('finish', None),
-                      json.get('sector_points', None),
-                      json.get('length', None)
-                      )
+    venue = PodiumVenue(json['id'],
+                       json['URI'],
+                       json['events_uri'],
+                       json['updated'],
+                       json['created'],
+                       json.get('name', None),
+                       json.get('centerpoint', None),
+                       json.get('country_code', None),
+                       json.get('configuration', None),
+                       json.get('track_map_array', None),
+                       json.get('start_finish', None),
+                       json.get('finish', None),
+                       json.get('sector_points', None),
+                       json.get('length', None)
+                       )
+    return identity(venue, json)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Watches the current livestreams and reports what changed between polls, so
+a spectator list can be updated instead of rebuilt on every refresh.
+"""
+import threading
+from podium_api.asyncreq import ScheduledCall
+from podium_api.eventdevices import make_livestreams_get
+from podium_api.paging import iterate_all
+from podium_api.sync import fingerprint
+
+
+class LivestreamChanges(object):
+    """
+    Differences between two snapshots of the livestreams.
+
+    **Attributes:**
+        **added** (list): Eventdevices that started streaming.
+
+        **removed** (list): Eventdevices no longer streaming, as they were
+        last seen.
+
+        **changed** (list): Eventdevices whose attributes changed.
+    """
+
+    __slots__ = ('added', 'removed', 'changed')
+
+    def __init__(self):
+        self.added = []
+        self.removed = []
+        self.changed = []
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+    __nonzero__ = __bool__
+
+
+class LivestreamWatcher(object):
+    """
+    Requests every page of the livestreams each interval and calls
+    change_callback with the differences to the previous snapshot, compared
+    by eventdevice_id. Nothing is called when a poll found no change.
+
+    Args:
+        token (PodiumToken): The authentication token for this session.
+
+        change_callback (function): Called after a poll found changes, will
+        have the signature:
+            on_change(changes (LivestreamChanges))
+
+    Kwargs:
+        interval (float): Seconds between the end of a poll and the next.
+        Defaults to 10.
+
+        per_page (int): Number per page of results, max of 100. Defaults to
+        100.
+
+        window (int): Maximum number of page requests made at once. Defaults
+        to 4.
+
+        failure_callback (function): Called when a poll failed, the snapshot
+        is then left unchanged. Will have the signature:
+            on_failure(failure_type (string), result (dict), data (dict))
+        Defaults to None.
+
+    **Attributes:**
+        **snapshot** (dict): The eventdevices streaming at the last poll by
+        eventdevice_id.
+
+        **polls** (int): Number of polls completed.
+    """
+
+    def __init__(self, token, change_callback, interval=10.0, per_page=100,
+                 window=4, failure_callback=None):
+        self.token = token
+        self.change_callback = change_callback
+        self.interval = interval
+        self.per_page = per_page
+        self.window = window
+        self.failure_callback = failure_callback
+        self.snapshot = {}
+        self.polls = 0
+        self._fingerprints = {}
+        self._running = False
+        self._polling = False
+        self._timer = ScheduledCall(self._on_timer)
+        self._lock = threading.Lock()
+
+    def start(self):
+        """
+        Polls now and then every interval until **stop** is called.
+        """
+        with self._lock:
+            self._running = True
+        self.poll()
+
+    def stop(self):
+        with self._lock:
+            self._running = False
+        self._timer.cancel()
+
+    def poll(self):
+        """
+        Polls now unless a poll is in progress.
+
+        Return:
+            bool: False if a poll was already in progress.
+
+        """
+        with self._lock:
+            if self._polling:
+                return False
+            self._polling = True
+        eventdevices = []
+
+        def on_done(fetch):
+            self._apply(eventdevices)
+            self._finish()
+
+        def on_failure(failure_type, result, data):
+            if self.failure_callback is not None:
+                self.failure_callback(failure_type, result, data)
+            self._finish()
+
+        iterate_all(make_livestreams_get, self.token, per_page=self.per_page,
+                    window=self.window, item_callback=eventdevices.append,
+                    done_callback=on_done, failure_callback=on_failure)
+        return True
+
+    def diff(self, eventdevices):
+        """
+        Makes eventdevices the snapshot and returns the LivestreamChanges
+        from the previous one.
+        """
+        changes = LivestreamChanges()
+        snapshot = {}
+        fingerprints = {}
+        for eventdevice in eventdevices:
+            key = eventdevice.eventdevice_id
+            if key in snapshot:
+                # listed twice when the list changed between two pages
+                continue
+            current = fingerprint(eventdevice)
+            previous = self._fingerprints.get(key)
+            if previous is None:
+                changes.added.append(eventdevice)
+            elif previous != current:
+                changes.changed.append(eventdevice)
+            snapshot[key] = eventdevice
+            fingerprints[key] = current
+        changes.removed = [eventdevice for key, eventdevice
+                           in self.snapshot.items() if key not in snapshot]
+        self.snapshot = snapshot
+        self._fingerprints = fingerprints
+        return changes
+
+    def _apply(self, eventdevices):
+        self.polls += 1
+        changes = self.diff(eventdevices)
+        if changes:
+            self.change_callback(changes)
+
+    def _finish(self):
+        with self._lock:
+            self._polling = False
+            running = self._running
+        if running:
+            self._timer.schedule(self.interval)
+
+    def _on_timer(self):
+        with self._lock:
+            running = self._running
+        if running:
+            self.poll()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Transport doubles shared by the tests, nothing is sent over the network.
+"""
+from podium_api.transport import PodiumTransport, TransportRequest
+
+
+class FakeTimer(object):
+    """
+    A call scheduled with **FakeTransport.call_later**.
+    """
+
+    def __init__(self, delay, callback):
+        self.delay = delay
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class FakeTransport(PodiumTransport):
+    """
+    Records the requests made and the calls scheduled, the test answers
+    them with **respond** and **error** and runs the calls with
+    **fire_timers**. **run_in_worker** runs the work right away.
+
+    Kwargs:
+        immediate (bool): If True call_later makes the call right away
+        instead of recording it. Defaults to False.
+
+        resp_headers (dict): The response headers used when **respond** is
+        not given any. Defaults to None, no headers.
+
+    **Attributes:**
+        **requests** (list): The TransportRequests made, in order.
+
+        **timers** (list): The FakeTimers not fired yet.
+
+        **delays** (list): The delay of every call_later.
+    """
+
+    def __init__(self, immediate=False, resp_headers=None):
+        self.immediate = immediate
+        self.resp_headers = resp_headers
+        self.requests = []
+        self.timers = []
+        self.delays = []
+
+    def request(self, url, method="GET", body=None, headers=None,
+                file_path=None, **callbacks):
+        req = TransportRequest(url, method, body, headers,
+                               file_path=file_path)
+        req.callbacks = callbacks
+        self.requests.append(req)
+        return req
+
+    def call_later(self, delay, callback):
+        self.delays.append(delay)
+        timer = FakeTimer(delay, callback)
+        if self.immediate:
+            callback()
+        else:
+            self.timers.append(timer)
+        return timer
+
+    def run_in_worker(self, func, on_done, on_error):
+        try:
+            result = func()
+        except Exception as error:
+            on_error(error)
+        else:
+            on_done(result)
+
+    @property
+    def scheduled(self):
+        return [timer for timer in self.timers if not timer.cancelled]
+
+    def fire_timers(self):
+        timers, self.timers = self.timers, []
+        for timer in timers:
+            if not timer.cancelled:
+                timer.callback()
+
+    def respond(self, req, status=200, result=None, resp_headers=None):
+        req._resp_status = status
+        if resp_headers is None:
+            resp_headers = self.resp_headers
+        req._resp_headers = dict(resp_headers or {})
+        if result is None:
+            result = {}
+        if status in (302, 304):
+            req.callbacks['on_redirect'](req, '')
+        elif status >= 400:
+            req.callbacks['on_failure'](req, result)
+        else:
+            req.callbacks['on_success'](req, result)
+
+    def error(self, req, error='connection refused'):
+        req.callbacks['on_error'](req, error)
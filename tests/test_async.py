@@ -2,9 +2,10 @@ import unittest
 import podium_api
 from podium_api.async import (get_json_header, make_request,
                               make_request_default,
-                              make_request_custom_success)
+                              make_request_custom_success, ScheduledCall)
 from podium_api.types.exceptions import PodiumApplicationNotRegistered
 from mock import patch, Mock
+from tests.fakes import FakeTransport
 try:
     from urllib.parse import urlencode
 except:
@@ -342,6 +343,47 @@ class TestMakeRequest(unittest.TestCase):
         progress_cb.assert_called_with(req, 0, 10, {"test": "testdata"})
 
 
+class TestScheduledCall(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = FakeTransport()
+        podium_api.register_podium_application('test_id', 'test_secret',
+                                               transport=self.transport)
+        self.callback = Mock()
+        self.call = ScheduledCall(self.callback)
+
+    def tearDown(self):
+        podium_api.unregister_podium_application()
+
+    def test_schedule(self):
+        self.assertTrue(self.call.schedule(1.0))
+        self.assertFalse(self.call.schedule(2.0))
+        self.assertTrue(self.call.scheduled)
+        self.transport.fire_timers()
+        self.callback.assert_called_once_with()
+        self.assertFalse(self.call.scheduled)
+
+    def test_cancel(self):
+        self.call.schedule(1.0)
+        self.call.cancel()
+        self.assertTrue(self.transport.timers[0].cancelled)
+        self.assertFalse(self.call.scheduled)
+
+    def test_cancel_while_arming(self):
+        call_later = self.transport.call_later
+
+        def cancel_first(delay, callback):
+            self.call.cancel()
+            return call_later(delay, callback)
+
+        with patch.object(self.transport, 'call_later', cancel_first):
+            self.call.schedule(1.0)
+        self.assertTrue(self.transport.timers[0].cancelled)
+        self.assertFalse(self.call.scheduled)
+        self.transport.timers[0].callback()
+        self.callback.assert_not_called()
+
+
 class TestGetJsonHeader(unittest.TestCase):
 
     def test_get_header(self):
@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import podium_api
+from podium_api.asyncapi import AsyncPodiumAPI, login
+from podium_api.transport import AsyncConnectionPool, AsyncioTransport
+from podium_api.types.exceptions import PodiumRequestFailed
+from podium_api.types.token import PodiumToken
+from mock import Mock, patch
+
+
+EVENT_JSON = {'id': 1, 'URI': '/api/v1/events/1', 'title': 'test event'}
+
+
+class PodiumTestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        self.server.connections += 1
+
+    def send_json(self, status, payload, chunked=False):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        if chunked:
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for i in range(0, len(body), 10):
+                chunk = body[i:i + 10]
+                self.wfile.write('{:x}\r\n'.format(len(chunk)).encode())
+                self.wfile.write(chunk + b'\r\n')
+            self.wfile.write(b'0\r\n\r\n')
+        else:
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def read_body(self):
+        length = int(self.headers.get('Content-Length', 0))
+        return self.rfile.read(length).decode('utf-8')
+
+    def do_GET(self):
+        self.server.headers.append(dict(self.headers))
+        if self.path.startswith('/api/v1/events/1'):
+            self.send_json(200, {'event': EVENT_JSON})
+        elif self.path.startswith('/api/v1/events'):
+            self.send_json(200, {'total': 1, 'events': [EVENT_JSON]},
+                           chunked=True)
+        else:
+            self.send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        body = self.read_body()
+        if self.path == '/oauth/token':
+            self.send_json(200, {'access_token': 'test_token',
+                                 'token_type': 'bearer',
+                                 'created_at': 1})
+        else:
+            self.server.bodies.append(body)
+            self.send_response(302)
+            self.send_header('location', '/api/v1/events/2')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+
+class TestAsyncPodiumAPI(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), PodiumTestHandler)
+        self.server.connections = 0
+        self.server.headers = []
+        self.server.bodies = []
+        self.server_thread = threading.Thread(
+            target=self.server.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+        self.url = 'http://127.0.0.1:{}'.format(self.server.server_port)
+        podium_api.register_podium_application('test_id', 'test_secret',
+                                               podium_url=self.url)
+        self.token = PodiumToken('test_token', 'test_type', 1)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        podium_api.unregister_podium_application()
+
+    def run_async(self, coro):
+        return asyncio.run(coro)
+
+    def test_events_list(self):
+        async def run():
+            podium = AsyncPodiumAPI(self.token)
+            result = await podium.events.list(per_page=10)
+            podium.close()
+            return result
+        result = self.run_async(run())
+        self.assertEqual(result.total, 1)
+        self.assertEqual(result.events[0].event_id, 1)
+        self.assertEqual(result.events[0].title, 'test event')
+        self.assertEqual(self.server.headers[0]['Authorization'],
+                         'Bearer test_token')
+
+    def test_event_get(self):
+        async def run():
+            podium = AsyncPodiumAPI(self.token)
+            result = await podium.events.get(self.url + '/api/v1/events/1')
+            podium.close()
+            return result
+        result = self.run_async(run())
+        self.assertEqual(result.uri, '/api/v1/events/1')
+
+    def test_event_create(self):
+        async def run():
+            podium = AsyncPodiumAPI(self.token)
+            result = await podium.events.create('title', 'start', 'end')
+            podium.close()
+            return result
+        result = self.run_async(run())
+        self.assertEqual(result.location, '/api/v1/events/2')
+        self.assertEqual(result.object_type, 'event')
+        self.assertTrue('event%5Btitle%5D=title' in self.server.bodies[0])
+
+    def test_failure_raises(self):
+        async def run():
+            podium = AsyncPodiumAPI(self.token)
+            try:
+                await podium.events.get(self.url + '/missing')
+            finally:
+                podium.close()
+        with self.assertRaises(PodiumRequestFailed) as context:
+            self.run_async(run())
+        self.assertEqual(context.exception.failure_type, 'failure')
+        self.assertEqual(context.exception.result, {'error': 'not found'})
+
+    def test_error_raises(self):
+        async def run():
+            podium = AsyncPodiumAPI(self.token)
+            await podium.events.get('http://127.0.0.1:1/api/v1/events/1')
+        with self.assertRaises(PodiumRequestFailed) as context:
+            self.run_async(run())
+        self.assertEqual(context.exception.failure_type, 'error')
+
+    def test_concurrent_requests_share_connections(self):
+        async def run():
+            podium = AsyncPodiumAPI(self.token,
+                                    transport=AsyncioTransport(pool_size=2))
+            results = await asyncio.gather(*[
+                podium.events.get(self.url + '/api/v1/events/1')
+                for i in range(20)])
+            podium.close()
+            return results
+        results = self.run_async(run())
+        self.assertEqual(len(results), 20)
+        self.assertTrue(self.server.connections <= 2)
+
+    def test_login(self):
+        close = AsyncioTransport.close
+        with patch.object(AsyncioTransport, 'close', autospec=True,
+                          side_effect=close) as transport_close:
+            result = self.run_async(login('user', 'password'))
+        self.assertEqual(result.token, 'test_token')
+        # the transport created for the call is closed
+        self.assertEqual(transport_close.call_count, 1)
+
+    def test_release_after_close(self):
+        async def run():
+            pool = AsyncConnectionPool('http', '127.0.0.1', None, 2)
+            await pool._semaphore.acquire()
+            pool.close()
+            writer = Mock()
+            pool.release(Mock(), writer, True)
+            return pool, writer
+        pool, writer = self.run_async(run())
+        self.assertTrue(writer.close.called)
+        self.assertEqual(len(pool._idle), 0)
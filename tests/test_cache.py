@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import podium_api
+from podium_api.asyncreq import using_stale_callback
+from podium_api.cache import ResponseCache
+from podium_api.events import (make_event_get, make_event_update,
+                               make_events_get)
+from podium_api.paging import fetch_all
+from podium_api.types.token import PodiumToken
+from mock import Mock
+from tests.fakes import FakeTransport
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = FakeTransport(immediate=True)
+        self.cache = ResponseCache(max_entries=2)
+        podium_api.register_podium_application('test_id', 'test_secret',
+                                               transport=self.transport,
+                                               cache=self.cache)
+        self.token = PodiumToken('test_token', 'test_type', 1)
+        self.event_json = {'event': {'id': 1, 'URI': 'test/events/1',
+                                     'title': 'test'}}
+
+    def tearDown(self):
+        podium_api.unregister_podium_application()
+
+    def get_event(self, uri='test/events/1'):
+        success_cb = Mock()
+        make_event_get(self.token, uri, success_callback=success_cb)
+        return success_cb
+
+    def test_not_modified_uses_cached_object(self):
+        first_cb = self.get_event()
+        self.transport.respond(self.transport.requests[0], 200,
+                               self.event_json, {'ETag': '"abc"'})
+        event = first_cb.call_args[0][0]
+        self.assertEqual(event.title, 'test')
+
+        second_cb = self.get_event()
+        req = self.transport.requests[1]
+        self.assertEqual(req.req_headers['If-None-Match'], '"abc"')
+        self.assertEqual(req.req_headers['Authorization'],
+                         'Bearer test_token')
+        self.transport.respond(req, 304, '')
+        second_cb.assert_called_with(event)
+
+    def test_last_modified(self):
+        self.get_event()
+        self.transport.respond(self.transport.requests[0], 200,
+                               self.event_json,
+                               {'Last-Modified': 'Mon, 27 Jun 2016'})
+        self.get_event()
+        self.assertEqual(
+            self.transport.requests[1].req_headers['If-Modified-Since'],
+            'Mon, 27 Jun 2016')
+
+    def test_changed_response_replaces_entry(self):
+        self.get_event()
+        self.transport.respond(self.transport.requests[0], 200,
+                               self.event_json, {'ETag': '"abc"'})
+        second_cb = self.get_event()
+        self.event_json['event']['title'] = 'new'
+        self.transport.respond(self.transport.requests[1], 200,
+                               self.event_json, {'ETag': '"def"'})
+        self.assertEqual(second_cb.call_args[0][0].title, 'new')
+        self.get_event()
+        self.assertEqual(
+            self.transport.requests[2].req_headers['If-None-Match'], '"def"')
+
+    def test_fresh_entry_skips_request(self):
+        podium_api.register_podium_application(
+            'test_id', 'test_secret', transport=self.transport,
+            cache=ResponseCache(ttl_policy=[(r'test/events', 60)]))
+        first_cb = self.get_event()
+        self.transport.respond(self.transport.requests[0], 200,
+                               self.event_json)
+        second_cb = self.get_event()
+        self.assertEqual(len(self.transport.requests), 1)
+        second_cb.assert_called_with(first_cb.call_args[0][0])
+
+    def test_no_validators_not_cached(self):
+        self.get_event()
+        self.transport.respond(self.transport.requests[0], 200,
+                               self.event_json)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_lru_eviction(self):
+        for i in range(3):
+            self.get_event('test/events/{}'.format(i))
+            self.transport.respond(self.transport.requests[i], 200,
+                                   self.event_json, {'ETag': str(i)})
+        self.assertEqual(len(self.cache), 2)
+        self.get_event('test/events/0')
+        self.assertFalse(
+            'If-None-Match' in self.transport.requests[3].req_headers)
+
+    def test_get_without_callback_keeps_entry(self):
+        self.get_event()
+        self.transport.respond(self.transport.requests[0], 200,
+                               self.event_json, {'ETag': '"abc"'})
+        make_event_get(self.token, 'test/events/1')
+        self.assertFalse(
+            'If-None-Match' in self.transport.requests[1].req_headers)
+        self.assertEqual(len(self.cache), 1)
+
+    def test_update_invalidates(self):
+        self.get_event()
+        self.transport.respond(self.transport.requests[0], 200,
+                               self.event_json, {'ETag': '"abc"'})
+        make_event_update(self.token, 'test/events/1', title='new')
+        self.assertEqual(len(self.cache), 0)
+
+
+class TestServeStale(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = FakeTransport(immediate=True)
+        podium_api.register_podium_application(
+            'test_id', 'test_secret', transport=self.transport,
+            cache=ResponseCache(serve_stale=True))
+        self.token = PodiumToken('test_token', 'test_type', 1)
+
+    def tearDown(self):
+        podium_api.unregister_podium_application()
+
+    def events_json(self, title):
+        return {'events': [{'id': i, 'URI': 'test/events/{}'.format(i),
+                            'title': title} for i in (1, 2)],
+                'total': 2}
+
+    def test_stale_callback(self):
+        make_event_get(self.token, 'test/events/1', success_callback=Mock())
+        self.transport.respond(self.transport.requests[0], 200,
+                               {'event': {'id': 1, 'URI': 'test/events/1',
+                                          'title': 'test'}},
+                               {'ETag': '"abc"'})
+        stale_cb = Mock()
+        success_cb = Mock()
+        with using_stale_callback(stale_cb):
+            make_event_get(self.token, 'test/events/1',
+                           success_callback=success_cb)
+        self.assertEqual(stale_cb.call_args[0][0].title, 'test')
+        self.assertFalse(success_cb.called)
+        self.transport.respond(self.transport.requests[1], 304)
+        success_cb.assert_called_once_with(stale_cb.call_args[0][0])
+
+    def test_paged_consumer_changed_response(self):
+        fetch_all(make_events_get, self.token, per_page=2,
+                  success_callback=Mock())
+        self.transport.respond(self.transport.requests[0], 200,
+                               self.events_json('old'), {'ETag': '"a"'})
+        success_cb = Mock()
+        fetch_all(make_events_get, self.token, per_page=2,
+                  success_callback=success_cb)
+        self.assertFalse(success_cb.called)
+        self.transport.respond(self.transport.requests[1], 200,
+                               self.events_json('new'), {'ETag': '"b"'})
+        success_cb.assert_called_once()
+        items = success_cb.call_args[0][0]
+        self.assertEqual([event.title for event in items], ['new', 'new'])
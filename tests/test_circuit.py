@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import podium_api
+from podium_api.asyncreq import make_request, make_request_default
+from podium_api.circuit import (CircuitBreaker, CircuitOpenRequest, CLOSED,
+                                OPEN, HALF_OPEN)
+from podium_api.throttle import QueuedRequest, RequestThrottle
+from mock import Mock, patch
+from tests.fakes import FakeTransport
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def test_family_for(self):
+        breaker = CircuitBreaker(patterns=[r'/api/v1/livestreams'])
+        self.assertEqual(
+            breaker.family_for('https://podium.live/api/v1/livestreams?a=1'),
+            r'/api/v1/livestreams')
+        self.assertEqual(
+            breaker.family_for(
+                'https://podium.live/api/v1/events/12/racestats'),
+            '/api/v1/events/{id}/racestats')
+        self.assertEqual(
+            breaker.family_for('https://podium.live/api/v1/events/12'),
+            '/api/v1/events/{id}')
+
+    @patch('podium_api.circuit.time.monotonic')
+    def test_states(self, monotonic):
+        monotonic.return_value = 100.0
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10)
+        breaker.record('a', True)
+        breaker.record('a', False)
+        breaker.record('a', True)
+        self.assertEqual(breaker.state('a'), CLOSED)
+        breaker.record('a', True)
+        self.assertEqual(breaker.state('a'), OPEN)
+        self.assertFalse(breaker.allow('a'))
+        self.assertTrue(breaker.allow('b'))
+        self.assertEqual(breaker.retry_in('a'), 10)
+        monotonic.return_value = 110.0
+        self.assertEqual(breaker.state('a'), HALF_OPEN)
+        self.assertTrue(breaker.allow('a'))
+        self.assertFalse(breaker.allow('a'))
+        breaker.record('a', True)
+        self.assertEqual(breaker.state('a'), OPEN)
+        monotonic.return_value = 120.0
+        self.assertTrue(breaker.allow('a'))
+        breaker.record('a', False)
+        self.assertEqual(breaker.state('a'), CLOSED)
+
+    @patch('podium_api.circuit.time.monotonic')
+    def test_probes_all_succeed(self, monotonic):
+        monotonic.return_value = 100.0
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10,
+                                 half_open_probes=2)
+        breaker.record('a', True)
+        monotonic.return_value = 110.0
+        self.assertTrue(breaker.allow('a'))
+        self.assertTrue(breaker.allow('a'))
+        self.assertFalse(breaker.allow('a'))
+        breaker.record('a', False)
+        self.assertEqual(breaker.state('a'), HALF_OPEN)
+        breaker.record('a', False)
+        self.assertEqual(breaker.state('a'), CLOSED)
+
+    @patch('podium_api.circuit.time.monotonic')
+    def test_probe_timeout(self, monotonic):
+        monotonic.return_value = 100.0
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10,
+                                 probe_timeout=5)
+        breaker.record('a', True)
+        monotonic.return_value = 110.0
+        self.assertTrue(breaker.allow('a'))
+        monotonic.return_value = 114.0
+        self.assertEqual(breaker.state('a'), HALF_OPEN)
+        # the probe never completed
+        monotonic.return_value = 115.0
+        self.assertEqual(breaker.state('a'), OPEN)
+        self.assertFalse(breaker.allow('a'))
+        self.assertEqual(breaker.retry_in('a'), 10)
+        monotonic.return_value = 125.0
+        self.assertTrue(breaker.allow('a'))
+
+    @patch('podium_api.circuit.time.monotonic')
+    def test_release(self, monotonic):
+        monotonic.return_value = 100.0
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+        breaker.record('a', True)
+        monotonic.return_value = 110.0
+        self.assertTrue(breaker.allow('a'))
+        self.assertFalse(breaker.allow('a'))
+        breaker.release('a')
+        self.assertTrue(breaker.allow('a'))
+
+    def test_is_failure(self):
+        breaker = CircuitBreaker()
+        self.assertTrue(breaker.is_failure(error=True))
+        self.assertTrue(breaker.is_failure(status=503))
+        self.assertFalse(breaker.is_failure(status=404))
+        self.assertFalse(breaker.is_failure(status=200))
+
+
+class TestCircuitRequests(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = FakeTransport()
+        self.breaker = CircuitBreaker(failure_threshold=2)
+        podium_api.register_podium_application('test_id', 'test_secret',
+                                               transport=self.transport,
+                                               circuit_breaker=self.breaker)
+
+    def tearDown(self):
+        podium_api.unregister_podium_application()
+
+    def test_trips_and_fails_fast(self):
+        url = 'https://podium.live/api/v1/events/1/racestats'
+        self.transport.respond(make_request(url), 503)
+        self.transport.error(make_request(url))
+        self.assertEqual(len(self.transport.requests), 2)
+        failure_cb = Mock()
+        req = make_request_default(
+            'https://podium.live/api/v1/events/2/racestats',
+            failure_callback=failure_cb)
+        self.assertTrue(isinstance(req, CircuitOpenRequest))
+        self.assertEqual(len(self.transport.requests), 2)
+        self.assertFalse(failure_cb.called)
+        self.transport.fire_timers()
+        failure_type, result, data = failure_cb.call_args[0]
+        self.assertEqual(failure_type, 'circuit_open')
+        self.assertEqual(result['family'], '/api/v1/events/{id}/racestats')
+        other = make_request('https://podium.live/api/v1/account')
+        self.assertFalse(isinstance(other, CircuitOpenRequest))
+
+    def test_success_resets(self):
+        url = 'https://podium.live/api/v1/livestreams'
+        self.transport.respond(make_request(url), 503)
+        success_cb = Mock()
+        self.transport.respond(make_request(url, on_success=success_cb), 200)
+        self.assertTrue(success_cb.called)
+        self.transport.respond(make_request(url), 503)
+        self.assertEqual(self.breaker.state('/api/v1/livestreams'), CLOSED)
+
+    @patch('podium_api.circuit.time.monotonic')
+    def test_cancelled_probe_released(self, monotonic):
+        monotonic.return_value = 100.0
+        podium_api.register_podium_application(
+            'test_id', 'test_secret', transport=self.transport,
+            circuit_breaker=self.breaker,
+            throttle=RequestThrottle(max_in_flight=1))
+        family = '/api/v1/livestreams'
+        self.breaker.record(family, True)
+        self.breaker.record(family, True)
+        monotonic.return_value = 200.0
+        first = make_request('https://podium.live/api/v1/account')
+        probe = make_request('https://podium.live/api/v1/livestreams')
+        self.assertTrue(isinstance(probe, QueuedRequest))
+        probe.cancel()
+        self.transport.respond(first)
+        probe = make_request('https://podium.live/api/v1/livestreams')
+        self.assertFalse(isinstance(probe, CircuitOpenRequest))
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import threading
+import unittest
+import podium_api
+from podium_api.client import PodiumClient
+from podium_api.events import make_event_get, make_events_get
+from podium_api.login import make_login_post
+from podium_api.types.identity import IdentityMap
+from podium_api.types.token import PodiumToken
+from mock import Mock
+from tests.fakes import FakeTransport
+
+
+class TestPodiumClient(unittest.TestCase):
+
+    def setUp(self):
+        self.default_transport = FakeTransport(immediate=True)
+        podium_api.register_podium_application(
+            'prod_id', 'prod_secret', transport=self.default_transport)
+        self.transport = FakeTransport(immediate=True)
+        self.client = PodiumClient('staging_id', 'staging_secret',
+                                   podium_url='https://staging.test',
+                                   transport=self.transport)
+        self.token = PodiumToken('test_token', 'test_type', 1)
+
+    def tearDown(self):
+        podium_api.unregister_podium_application()
+
+    def test_call(self):
+        self.client.call(make_events_get, self.token)
+        self.assertEqual(self.default_transport.requests, [])
+        req = self.transport.requests[0]
+        self.assertTrue(req.url.startswith('https://staging.test/api/v1/'))
+        self.assertIs(podium_api.get_podium_application(),
+                      podium_api.PODIUM_APP)
+
+    def test_credentials(self):
+        with self.client.activate():
+            make_login_post('user', 'pass')
+        req = self.transport.requests[0]
+        self.assertEqual(req.req_headers['Authorization'],
+                         'Basic staging_id:staging_secret')
+        make_login_post('user', 'pass')
+        req = self.default_transport.requests[0]
+        self.assertEqual(req.req_headers['Authorization'],
+                         'Basic prod_id:prod_secret')
+
+    def test_response_handled_with_client(self):
+        identity_map = IdentityMap()
+        client = PodiumClient('staging_id', 'staging_secret',
+                              transport=self.transport,
+                              identity_map=identity_map)
+        success_callback = Mock()
+        client.call(make_event_get, self.token, 'test/events/1',
+                    success_callback=success_callback)
+        # the response arrives outside of the call
+        self.transport.respond(self.transport.requests[0], 200,
+                               {'event': {'id': 1, 'URI': 'test/events/1'}})
+        event = success_callback.call_args[0][0]
+        self.assertIs(identity_map.get(type(event), 'test/events/1'), event)
+
+    def test_threads(self):
+        other = PodiumClient('other_id', 'other_secret',
+                             podium_url='https://other.test',
+                             transport=FakeTransport(immediate=True))
+        urls = {}
+
+        def run(client):
+            req = client.call(make_events_get, self.token)
+            urls[client] = req.url
+
+        threads = [threading.Thread(target=run, args=(client,))
+                   for client in (self.client, other)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(urls[self.client].startswith('https://staging.test'))
+        self.assertTrue(urls[other].startswith('https://other.test'))
+
+    def test_from_application(self):
+        client = PodiumClient.from_application(podium_api.PODIUM_APP)
+        self.assertEqual(client.podium_url, 'https://podium.live')
+        client.call(make_events_get, self.token)
+        self.assertEqual(len(self.default_transport.requests), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import podium_api
+from podium_api import asyncreq
+from podium_api.events import make_event_get, make_event_update
+from podium_api.types.token import PodiumToken
+from mock import Mock
+from tests.fakes import FakeTransport
+
+
+class TestCoalescing(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = FakeTransport()
+        podium_api.register_podium_application('test_id', 'test_secret',
+                                               transport=self.transport,
+                                               coalesce_requests=True)
+        self.token = PodiumToken('test_token', 'test_type', 1)
+        self.event_json = {'event': {'id': 1, 'URI': 'test/events/1',
+                                     'title': 'test'}}
+
+    def tearDown(self):
+        podium_api.unregister_podium_application()
+        asyncreq._in_flight.clear()
+
+    def test_identical_gets_share_request(self):
+        first_cb = Mock()
+        second_cb = Mock()
+        first = make_event_get(self.token, 'test/events/1',
+                               success_callback=first_cb)
+        second = make_event_get(self.token, 'test/events/1',
+                                success_callback=second_cb)
+        self.assertEqual(len(self.transport.requests), 1)
+        self.assertTrue(first is second)
+        self.transport.respond(first, 200, self.event_json)
+        self.assertEqual(first_cb.call_args[0][0].title, 'test')
+        self.assertEqual(second_cb.call_args[0][0].title, 'test')
+
+    def test_failure_fanned_out_with_own_data(self):
+        first_cb = Mock()
+        second_cb = Mock()
+        req = make_event_get(self.token, 'test/events/1',
+                             failure_callback=first_cb)
+        make_event_get(self.token, 'test/events/1', failure_callback=second_cb)
+        self.transport.respond(req, 404, {'error': 'not found'})
+        self.assertEqual(first_cb.call_args[0][:2],
+                         ('failure', {'error': 'not found'}))
+        self.assertEqual(first_cb.call_args[0][2]['failure_callback'],
+                         first_cb)
+        self.assertEqual(second_cb.call_args[0][2]['failure_callback'],
+                         second_cb)
+
+    def test_different_requests_not_shared(self):
+        make_event_get(self.token, 'test/events/1')
+        make_event_get(self.token, 'test/events/1', expand=False)
+        make_event_get(PodiumToken('other_token', 'test_type', 1),
+                       'test/events/1')
+        self.assertEqual(len(self.transport.requests), 3)
+
+    def test_completed_request_not_shared(self):
+        req = make_event_get(self.token, 'test/events/1')
+        self.transport.respond(req, 200, self.event_json)
+        make_event_get(self.token, 'test/events/1')
+        self.assertEqual(len(self.transport.requests), 2)
+
+    def test_updates_not_shared(self):
+        make_event_update(self.token, 'test/events/1', title='new')
+        make_event_update(self.token, 'test/events/1', title='new')
+        self.assertEqual(len(self.transport.requests), 2)
+
+    def test_disabled_by_default(self):
+        podium_api.register_podium_application('test_id', 'test_secret',
+                                               transport=self.transport)
+        make_event_get(self.token, 'test/events/1')
+        make_event_get(self.token, 'test/events/1')
+        self.assertEqual(len(self.transport.requests), 2)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import podium_api
+from podium_api.cache import ResponseCache
+from podium_api.laps import make_laps_get
+from podium_api.paging import fetch_all
+from podium_api.types.lap import get_lap_from_json
+from podium_api.types.laptable import (
+    np, LapTable, get_lap_table_from_json, get_lap_table_from_laps,
+    concatenate_lap_tables
+    )
+from podium_api.types.token import PodiumToken
+from mock import Mock
+from tests.fakes import FakeTransport
+
+
+def make_lap_json(lap_number, lap_time, speed_max=None):
+    aggregates = []
+    if speed_max is not None:
+        aggregates.append({'channel': 'Speed', 'min': 0.0,
+                           'max': speed_max, 'avg': speed_max / 2})
+    aggregates.append({'channel': 'RPM', 'min': 1000, 'max': 7000,
+                       'avg': 5000 + lap_number})
+    return {'URI': 'test/laps/{}'.format(lap_number),
+            'raw_data_uri': 'test/laps/{}/data'.format(lap_number),
+            'lap_number': str(lap_number), 'end_time': 'testtime',
+            'aggregates': aggregates, 'lap_time': lap_time}
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class TestLapTable(unittest.TestCase):
+
+    def setUp(self):
+        self.laps_json = [make_lap_json(1, 1.6, 100.0),
+                          make_lap_json(2, 1.4, 120.0),
+                          make_lap_json(3, 1.5),
+                          make_lap_json(4, 1.45, 110.0)]
+        self.table = get_lap_table_from_json(self.laps_json)
+
+    def test_columns(self):
+        self.assertEqual(len(self.table), 4)
+        self.assertEqual(self.table.lap_number.tolist(), [1, 2, 3, 4])
+        self.assertEqual(self.table.lap_time.dtype, np.float64)
+        self.assertEqual(sorted(self.table.channels), ['RPM', 'Speed'])
+        self.assertTrue(np.isnan(self.table.column('Speed')[2]))
+
+    def test_from_laps(self):
+        laps = [get_lap_from_json(lap) for lap in self.laps_json]
+        table = get_lap_table_from_laps(laps)
+        self.assertEqual(table.lap_time.tolist(),
+                         self.table.lap_time.tolist())
+        self.assertEqual(table.uri[0], 'test/laps/1')
+
+    def test_best_lap(self):
+        self.assertEqual(self.table.best_lap(), (2, 1.4))
+        self.assertEqual(get_lap_table_from_json([]).best_lap(), None)
+
+    def test_channel_queries(self):
+        self.assertEqual(self.table.channel_max('Speed'), 120.0)
+        self.assertEqual(self.table.channel_min('RPM'), 1000.0)
+        self.assertEqual(self.table.percentile('Speed', 50), 110.0)
+        self.assertEqual(self.table.percentile('RPM', 100, stat='avg'),
+                         5004.0)
+
+    def test_rolling_average(self):
+        averages = self.table.rolling_average(2)
+        self.assertEqual(len(averages), 3)
+        self.assertAlmostEqual(averages[0], 1.5)
+        self.assertAlmostEqual(averages[2], 1.475)
+        self.assertEqual(
+            self.table.rolling_average(3, channel='RPM').tolist(),
+            [5002.0, 5003.0])
+        self.assertEqual(len(self.table.rolling_average(5)), 0)
+
+    def test_filter_laps(self):
+        table = self.table.filter_laps(2, 3)
+        self.assertEqual(table.lap_number.tolist(), [2, 3])
+        self.assertEqual(table.best_lap(), (2, 1.4))
+        self.assertEqual(self.table.filter_laps(first=4).lap_number.tolist(),
+                         [4])
+
+    def test_concatenate(self):
+        other = get_lap_table_from_json([{'URI': 'test/laps/5',
+                                          'lap_number': 5,
+                                          'end_time': 'testtime',
+                                          'lap_time': 1.3}])
+        table = concatenate_lap_tables([self.table, other])
+        self.assertEqual(len(table), 5)
+        self.assertEqual(table.best_lap(), (5, 1.3))
+        self.assertTrue(np.isnan(table.column('Speed')[4]))
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class TestLapsGetAsTable(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = FakeTransport(immediate=True)
+        self.cache = ResponseCache()
+        podium_api.register_podium_application('test_id', 'test_secret',
+                                               transport=self.transport,
+                                               cache=self.cache)
+        self.token = PodiumToken('test_token', 'test_type', 1)
+        self.laps_json = {'total': 2, 'laps': [make_lap_json(1, 1.6, 100.0),
+                                               make_lap_json(2, 1.4, 120.0)]}
+
+    def tearDown(self):
+        podium_api.unregister_podium_application()
+
+    def test_laps_get_as_table(self):
+        success_cb = Mock()
+        make_laps_get(self.token, 'test/laps', as_table=True,
+                      success_callback=success_cb)
+        self.transport.respond(self.transport.requests[0], 200,
+                               self.laps_json)
+        paged_response = success_cb.call_args[0][0]
+        self.assertEqual(paged_response.total, 2)
+        self.assertEqual(paged_response.laps.best_lap(), (2, 1.4))
+
+    def test_table_not_cached(self):
+        make_laps_get(self.token, 'test/laps', success_callback=Mock())
+        self.transport.respond(self.transport.requests[0], 200,
+                               self.laps_json, {'ETag': '"a"'})
+        self.assertEqual(len(self.cache), 1)
+        success_cb = Mock()
+        make_laps_get(self.token, 'test/laps', as_table=True,
+                      success_callback=success_cb)
+        req = self.transport.requests[1]
+        self.assertFalse('If-None-Match' in req.req_headers)
+        self.transport.respond(req, 200, self.laps_json, {'ETag': '"a"'})
+        self.assertTrue(isinstance(success_cb.call_args[0][0].laps,
+                                   LapTable))
+        # the cached list of laps is kept for the plain requests
+        plain_cb = Mock()
+        make_laps_get(self.token, 'test/laps', success_callback=plain_cb)
+        self.transport.respond(self.transport.requests[2], 304)
+        self.assertEqual(len(plain_cb.call_args[0][0].laps), 2)
+        self.assertFalse(isinstance(plain_cb.call_args[0][0].laps,
+                                    LapTable))
+
+    def test_paging_rejected(self):
+        with self.assertRaises(ValueError):
+            fetch_all(make_laps_get, self.token, endpoint='test/laps',
+                      as_table=True)
+        self.assertEqual(self.transport.requests, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import unittest
+import podium_api
+from podium_api.events import make_event_create, make_event_update
+from podium_api.events import make_event_get
+from podium_api.outbox import WriteBehindQueue
+from podium_api.types.redirect import PodiumRedirect
+from podium_api.types.token import PodiumToken
+from mock import Mock
+from tests.fakes import FakeTransport
+
+
+class TestWriteBehindQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'outbox.db')
+        self.transport = FakeTransport(
+            resp_headers={'location': 'test/events/1'})
+        podium_api.register_podium_application('test_id', 'test_secret',
+                                               transport=self.transport)
+        self.token = PodiumToken('test_token', 'test_type', 1)
+        self.queues = []
+
+    def tearDown(self):
+        podium_api.unregister_podium_application()
+        for queue in self.queues:
+            queue.close()
+        shutil.rmtree(self.directory)
+
+    def make_queue(self, **kwargs):
+        queue = WriteBehindQueue(self.path, self.token, **kwargs)
+        self.queues.append(queue)
+        return queue
+
+    def submit_event(self, queue, title, **kwargs):
+        return queue.submit(make_event_create, title, '2016-01-01',
+                            '2016-01-02', **kwargs)
+
+    def test_redirect_delivered(self):
+        queue = self.make_queue()
+        redirect_callback = Mock()
+        key = self.submit_event(queue, 'race',
+                                redirect_callback=redirect_callback)
+        self.assertEqual(len(self.transport.requests), 1)
+        req = self.transport.requests[0]
+        self.assertEqual(req.req_headers['Idempotency-Key'], key)
+        self.assertEqual(len(queue), 1)
+        self.transport.respond(req, 302)
+        redirect = redirect_callback.call_args[0][0]
+        self.assertIsInstance(redirect, PodiumRedirect)
+        self.assertEqual(redirect.location, 'test/events/1')
+        self.assertEqual(len(queue), 0)
+
+    def test_update_success_delivered(self):
+        queue = self.make_queue()
+        success_callback = Mock()
+        queue.submit(make_event_update, 'test/events/1', title='renamed',
+                     success_callback=success_callback)
+        self.transport.respond(self.transport.requests[0], 200, {})
+        success_callback.assert_called_with({}, 'test/events/1')
+
+    def test_in_order_bounded(self):
+        queue = self.make_queue(max_in_flight=2)
+        for title in ('a', 'b', 'c'):
+            self.submit_event(queue, title)
+        self.assertEqual(len(self.transport.requests), 2)
+        self.assertEqual([req.req_body.split('title%5D=')[1][0]
+                          for req in self.transport.requests], ['a', 'b'])
+        self.transport.respond(self.transport.requests[1], 302)
+        self.assertEqual(len(self.transport.requests), 3)
+        self.assertIn('title%5D=c', self.transport.requests[2].req_body)
+        self.assertEqual(len(queue), 2)
+
+    def test_duplicate_key_ignored(self):
+        queue = self.make_queue()
+        self.submit_event(queue, 'race', idempotency_key='abc')
+        self.submit_event(queue, 'race', idempotency_key='abc')
+        self.assertEqual(len(queue), 1)
+        self.assertEqual(len(self.transport.requests), 1)
+
+    def test_error_pauses_and_retries(self):
+        queue = self.make_queue(max_in_flight=2)
+        redirect_callback = Mock()
+        key = self.submit_event(queue, 'race',
+                                redirect_callback=redirect_callback)
+        self.transport.error(self.transport.requests[0])
+        self.assertTrue(queue.paused)
+        self.submit_event(queue, 'later')
+        self.assertEqual(len(self.transport.requests), 1)
+        self.transport.fire_timers()
+        self.assertFalse(queue.paused)
+        self.assertEqual(len(self.transport.requests), 3)
+        retry = self.transport.requests[1]
+        self.assertEqual(retry.req_headers['Idempotency-Key'], key)
+        self.transport.respond(retry, 302)
+        self.assertTrue(redirect_callback.called)
+
+    def test_rejected_dropped(self):
+        queue = self.make_queue(max_attempts=2)
+        failure_callback = Mock()
+        self.submit_event(queue, 'race', failure_callback=failure_callback)
+        self.transport.respond(self.transport.requests[0], 422, {})
+        self.assertFalse(failure_callback.called)
+        self.transport.fire_timers()
+        self.transport.respond(self.transport.requests[1], 422, {})
+        self.assertEqual(failure_callback.call_args[0][0], 'failure')
+        self.assertEqual(len(queue), 0)
+
+    def test_replayed_after_restart(self):
+        queue = self.make_queue()
+        key = self.submit_event(queue, 'race')
+        queue.close()
+        success_callback = Mock()
+        queue = self.make_queue(success_callback=success_callback)
+        self.assertEqual(queue.pending(), [(key, 'event_create')])
+        queue.flush()
+        req = self.transport.requests[1]
+        self.assertEqual(req.req_headers['Idempotency-Key'], key)
+        self.transport.respond(req, 302)
+        redirect = success_callback.call_args[0][0]
+        self.assertEqual(redirect.location, 'test/events/1')
+        self.assertEqual(len(queue), 0)
+
+    def test_not_queueable(self):
+        queue = self.make_queue()
+        self.assertRaises(ValueError, queue.submit, make_event_get,
+                          'test/events/1')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import asyncio
+import unittest
+from podium_api.paging import iterate_all, fetch_all
+from podium_api.asyncapi import AsyncPodiumEventsAPI
+from podium_api.types.paged_response import PodiumPagedResponse
+from podium_api.types.token import PodiumToken
+from mock import Mock
+
+
+def make_page(start, per_page, total):
+    items = list(range(start, min(start + per_page, total)))
+    return PodiumPagedResponse(items, total, None, None,
+                               payload_name='events')
+
+
+class FakeListRequest(object):
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, token, *args, **kwargs):
+        self.calls.append(kwargs)
+
+    def respond(self, index, total):
+        kwargs = self.calls[index]
+        kwargs['success_callback'](make_page(kwargs['start'],
+                                             kwargs['per_page'], total))
+
+
+class TestIterateAll(unittest.TestCase):
+
+    def setUp(self):
+        self.token = PodiumToken('test_token', 'test_type', 1)
+        self.request = FakeListRequest()
+        self.items = []
+
+    def test_pages_requested_concurrently(self):
+        fetch = iterate_all(self.request, self.token, per_page=10, window=3,
+                            item_callback=self.items.append)
+        self.assertEqual(len(self.request.calls), 1)
+        self.request.respond(0, 55)
+        self.assertEqual(fetch.total, 55)
+        self.assertEqual([c['start'] for c in self.request.calls],
+                         [0, 10, 20, 30])
+        self.assertEqual(self.items, list(range(10)))
+
+    def test_items_delivered_in_order(self):
+        done_cb = Mock()
+        iterate_all(self.request, self.token, 'test/endpoint', per_page=10,
+                    window=2, item_callback=self.items.append,
+                    done_callback=done_cb)
+        self.request.respond(0, 35)
+        # second page arrives before the first outstanding page
+        self.request.respond(2, 35)
+        self.assertEqual(self.items, list(range(10)))
+        # the window is full until the earlier page arrives
+        self.assertEqual(len(self.request.calls), 3)
+        self.request.respond(1, 35)
+        self.assertEqual(self.items, list(range(30)))
+        self.assertEqual(len(self.request.calls), 4)
+        self.assertFalse(done_cb.called)
+        self.request.respond(3, 35)
+        self.assertEqual(self.items, list(range(35)))
+        self.assertTrue(done_cb.called)
+
+    def test_server_page_size_used(self):
+        iterate_all(self.request, self.token, per_page=10,
+                    item_callback=self.items.append)
+        kwargs = self.request.calls[0]
+        kwargs['success_callback'](make_page(0, 5, 12))
+        self.assertEqual([c['start'] for c in self.request.calls],
+                         [0, 5, 10])
+
+    def test_failure_stops_fetch(self):
+        failure_cb = Mock()
+        fetch = iterate_all(self.request, self.token, per_page=10,
+                            item_callback=self.items.append,
+                            failure_callback=failure_cb)
+        self.request.respond(0, 30)
+        self.request.calls[1]['failure_callback']('failure', {}, {})
+        self.request.respond(2, 30)
+        failure_cb.assert_called_with('failure', {}, {})
+        self.assertTrue(fetch.failed)
+        self.assertEqual(self.items, list(range(10)))
+
+    def test_fetch_all(self):
+        success_cb = Mock()
+        fetch_all(self.request, self.token, per_page=10,
+                  success_callback=success_cb)
+        self.request.respond(0, 25)
+        self.request.respond(1, 25)
+        self.request.respond(2, 25)
+        success_cb.assert_called_with(list(range(25)))
+
+    def test_fetch_all_empty(self):
+        success_cb = Mock()
+        fetch_all(self.request, self.token, success_callback=success_cb)
+        self.request.respond(0, 0)
+        success_cb.assert_called_with([])
+
+    def test_first_page_given(self):
+        success_cb = Mock()
+        fetch_all(self.request, self.token, per_page=10,
+                  success_callback=success_cb,
+                  first_page=make_page(0, 10, 15))
+        self.assertEqual([call['start'] for call in self.request.calls],
+                         [10])
+        self.request.respond(0, 15)
+        success_cb.assert_called_with(list(range(15)))
+
+
+class TestAsyncIterateAll(unittest.TestCase):
+
+    def test_iterate_all(self):
+        starts = []
+        api = AsyncPodiumEventsAPI(PodiumToken('test_token', 'test_type', 1),
+                                   None)
+
+        async def fake_list(start=None, per_page=None):
+            starts.append(start)
+            # later pages finish first
+            await asyncio.sleep(0.01 * (100 - start) / 100.0)
+            return make_page(start, per_page, 95)
+        api.list = fake_list
+
+        items = asyncio.run(api.fetch_all(per_page=20, window=2))
+        self.assertEqual(items, list(range(95)))
+        self.assertEqual(sorted(starts), [0, 20, 40, 60, 80])
@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+from urllib.parse import parse_qs
+import podium_api
+from podium_api.publisher import RacestatPublisher
+from podium_api.types.token import PodiumToken
+from mock import Mock
+from tests.fakes import FakeTransport
+
+
+def make_racestat(device_id, position=1):
+    return {'device_id': device_id, 'comp_number': str(device_id),
+            'comp_class': 'GT', 'total_laps': 10, 'last_lap_time': 1.5,
+            'position_overall': position, 'position_in_class': position,
+            'comp_number_ahead': '', 'comp_number_behind': '',
+            'gap_to_ahead': 0.5, 'gap_to_behind': 0.5, 'laps_to_ahead': 0,
+            'laps_to_behind': 0, 'fc_flag': 0, 'comp_flag': 0}
+
+
+def sent_device_ids(req):
+    body = parse_qs(req.req_body)
+    return sorted(int(values[0]) for key, values in body.items()
+                  if key.endswith('[device_id]'))
+
+
+class TestRacestatPublisher(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = FakeTransport(
+            resp_headers={'location': 'test/racestats'})
+        podium_api.register_podium_application('test_id', 'test_secret',
+                                               transport=self.transport)
+        self.token = PodiumToken('test_token', 'test_type', 1)
+
+    def tearDown(self):
+        podium_api.unregister_podium_application()
+
+    def test_flush_on_interval(self):
+        publisher = RacestatPublisher(self.token, chunk_size=10)
+        publisher.publish(1, make_racestat(1))
+        publisher.publish(1, make_racestat(2))
+        self.assertEqual(len(self.transport.requests), 0)
+        self.assertEqual(publisher.queue_depth, 2)
+        self.assertEqual(len(self.transport.timers), 1)
+        self.transport.fire_timers()
+        req = self.transport.requests[0]
+        self.assertEqual(req.url,
+                         'https://podium.live/api/v1/events/1/racestats')
+        self.assertEqual(sent_device_ids(req), [1, 2])
+        self.assertEqual(publisher.queue_depth, 0)
+        self.transport.respond(req, 302)
+        self.assertEqual(publisher.sent, 2)
+        self.assertEqual(publisher.in_flight, 0)
+        self.assertEqual(len(publisher.flush_latencies), 1)
+        self.assertTrue(publisher.flush_latency >= 0)
+
+    def test_success_response(self):
+        publisher = RacestatPublisher(self.token, max_in_flight=1)
+        publisher.publish(1, make_racestat(1))
+        publisher.flush()
+        self.assertEqual(publisher.in_flight, 1)
+        publisher.publish(1, make_racestat(2))
+        publisher.flush()
+        self.assertEqual(len(self.transport.requests), 1)
+        self.transport.respond(self.transport.requests[0], 200, {})
+        self.assertEqual(publisher.sent, 1)
+        self.assertEqual(publisher.in_flight, 0)
+        self.transport.fire_timers()
+        self.assertEqual(sent_device_ids(self.transport.requests[1]), [2])
+
+    def test_coalesces_per_car(self):
+        publisher = RacestatPublisher(self.token)
+        publisher.publish(1, make_racestat(1, position=2))
+        publisher.publish(1, make_racestat(1, position=1))
+        publisher.publish(2, make_racestat(1, position=5))
+        self.assertEqual(publisher.queue_depth, 2)
+        self.assertEqual(publisher.coalesced, 1)
+        publisher.flush()
+        body = parse_qs(self.transport.requests[0].req_body)
+        self.assertEqual(body['racestat[0][position_overall]'], ['1'])
+        self.assertTrue(self.transport.requests[1].url.endswith(
+            '/events/2/racestats'))
+
+    def test_flush_size_chunks(self):
+        publisher = RacestatPublisher(self.token, chunk_size=2, flush_size=4,
+                                      max_in_flight=1)
+        for device_id in range(1, 5):
+            publisher.publish(1, make_racestat(device_id))
+        self.assertEqual(len(self.transport.requests), 1)
+        self.assertEqual(sent_device_ids(self.transport.requests[0]), [1, 2])
+        self.assertEqual(publisher.queue_depth, 2)
+        publisher.publish(1, make_racestat(3, position=9))
+        self.assertEqual(publisher.queue_depth, 2)
+        self.transport.respond(self.transport.requests[0], 302)
+        self.assertEqual(len(self.transport.requests), 1)
+        self.transport.fire_timers()
+        self.assertEqual(sent_device_ids(self.transport.requests[1]), [3, 4])
+
+    def test_failure(self):
+        failure_cb = Mock()
+        publisher = RacestatPublisher(self.token,
+                                      failure_callback=failure_cb)
+        racestat = make_racestat(1)
+        publisher.publish(1, racestat)
+        publisher.flush()
+        self.transport.respond(self.transport.requests[0], 422,
+                               {'error': 'invalid'})
+        failure_cb.assert_called_with('failure', {'error': 'invalid'},
+                                      {'event_id': 1,
+                                       'racestats': [racestat]})
+        self.assertEqual(publisher.failed, 1)
+        self.assertEqual(publisher.in_flight, 0)
+
+    def test_close_cancels_timer(self):
+        publisher = RacestatPublisher(self.token)
+        publisher.publish(1, make_racestat(1))
+        publisher.close()
+        self.assertTrue(self.transport.timers[0].cancelled)
+
+    def test_unchanged_skipped(self):
+        publisher = RacestatPublisher(self.token)
+        publisher.publish(1, make_racestat(1))
+        publisher.publish(1, make_racestat(2))
+        publisher.flush()
+        self.transport.respond(self.transport.requests[0], 302)
+        publisher.publish(1, make_racestat(1))
+        publisher.publish(1, make_racestat(2, position=3))
+        publisher.flush()
+        self.assertEqual(len(self.transport.requests), 2)
+        self.assertEqual(sent_device_ids(self.transport.requests[1]), [2])
+        self.assertEqual(publisher.unchanged, 1)
+        publisher.publish(1, make_racestat(1))
+        publisher.flush()
+        self.assertEqual(len(self.transport.requests), 2)
+
+    def test_partial_updates(self):
+        publisher = RacestatPublisher(self.token, partial_updates=True)
+        publisher.publish(1, make_racestat(1))
+        publisher.flush()
+        self.transport.respond(self.transport.requests[0], 302)
+        racestat = make_racestat(1, position=2)
+        racestat['total_laps'] = 11
+        publisher.publish(1, racestat)
+        publisher.flush()
+        body = parse_qs(self.transport.requests[1].req_body)
+        self.assertEqual(sorted(body),
+                         ['racestat[0][device_id]',
+                          'racestat[0][position_in_class]',
+                          'racestat[0][position_overall]',
+                          'racestat[0][total_laps]'])
+
+    def test_failure_resends_in_full(self):
+        publisher = RacestatPublisher(self.token, partial_updates=True)
+        publisher.publish(1, make_racestat(1))
+        publisher.flush()
+        self.transport.respond(self.transport.requests[0], 302)
+        publisher.publish(1, make_racestat(1, position=2))
+        publisher.flush()
+        self.transport.respond(self.transport.requests[1], 500, {})
+        publisher.publish(1, make_racestat(1, position=2))
+        publisher.flush()
+        body = parse_qs(self.transport.requests[2].req_body,
+                        keep_blank_values=True)
+        self.assertEqual(len(body), 15)
+
+    def test_unacknowledged_resent(self):
+        publisher = RacestatPublisher(self.token)
+        publisher.publish(1, make_racestat(1))
+        publisher.flush()
+        publisher.publish(1, make_racestat(1))
+        publisher.flush()
+        self.assertEqual(len(self.transport.requests), 2)
+        self.transport.respond(self.transport.requests[0], 500, {})
+        self.transport.respond(self.transport.requests[1], 302)
+        publisher.publish(1, make_racestat(1))
+        publisher.flush()
+        self.assertEqual(len(self.transport.requests), 2)
+        self.assertEqual(publisher.unchanged, 1)
+
+    def test_delta_disabled(self):
+        publisher = RacestatPublisher(self.token, delta=False)
+        for i in range(2):
+            publisher.publish(1, make_racestat(1))
+            publisher.flush()
+        self.assertEqual(len(self.transport.requests), 2)
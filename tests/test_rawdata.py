@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import unittest
+import podium_api
+from podium_api.laps import make_lap_raw_data_get
+from podium_api.types import rawdata
+from podium_api.types.rawdata import (
+    np, get_lap_raw_data_from_csv, open_lap_raw_data
+    )
+from podium_api.types.token import PodiumToken
+from mock import patch, Mock
+from tests.fakes import FakeTransport
+
+RAW_CSV = ('"Interval"|"ms"|0|0|1,"Speed"|"mph"|0|150|10,RPM\r\n'
+           '0,45.5,3000\r\n'
+           '10,,3100\r\n'
+           '20,46.5\r\n')
+
+
+class TestLapRawData(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.directory, 'raw_data.csv')
+        with open(self.csv_path, 'w', newline='') as csv_file:
+            csv_file.write(RAW_CSV)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_header(self):
+        raw_data = get_lap_raw_data_from_csv(
+            self.csv_path, os.path.join(self.directory, 'lap'))
+        self.assertEqual(raw_data.channels, ['Interval', 'Speed', 'RPM'])
+        self.assertEqual(raw_data.units, {'Interval': 'ms', 'Speed': 'mph',
+                                          'RPM': None})
+        self.assertEqual(len(raw_data), 3)
+
+    @unittest.skipIf(np is None, 'numpy is not installed')
+    def test_channels_memory_mapped(self):
+        directory = os.path.join(self.directory, 'lap')
+        raw_data = get_lap_raw_data_from_csv(self.csv_path, directory)
+        speed = raw_data.channel('Speed')
+        self.assertTrue(isinstance(speed, np.memmap))
+        self.assertEqual(speed[0], 45.5)
+        self.assertTrue(np.isnan(speed[1]))
+        self.assertTrue(np.isnan(raw_data.channel('RPM')[2]))
+        reopened = open_lap_raw_data(directory)
+        self.assertEqual(reopened.channel('Interval').tolist(),
+                         [0.0, 10.0, 20.0])
+
+    @unittest.skipIf(np is None, 'numpy is not installed')
+    def test_flushes_in_blocks(self):
+        with patch.object(rawdata, 'ROWS_PER_FLUSH', 2):
+            raw_data = get_lap_raw_data_from_csv(
+                self.csv_path, os.path.join(self.directory, 'lap'))
+        self.assertEqual(raw_data.channel('RPM')[:2].tolist(),
+                         [3000.0, 3100.0])
+
+    def test_make_lap_raw_data_get(self):
+        transport = FakeTransport()
+        podium_api.register_podium_application('test_id', 'test_secret',
+                                               transport=transport)
+        self.addCleanup(podium_api.unregister_podium_application)
+        token = PodiumToken('test_token', 'test_type', 1)
+        success_cb = Mock()
+        directory = os.path.join(self.directory, 'download')
+        make_lap_raw_data_get(token, 'test/laps/1/data', directory,
+                              success_callback=success_cb)
+        req = transport.requests[0]
+        self.assertEqual(os.path.dirname(req.file_path), directory)
+        make_lap_raw_data_get(token, 'test/laps/1/data', directory)
+        self.assertNotEqual(transport.requests[1].file_path, req.file_path)
+        self.assertEqual(req.req_headers['Accept'], 'text/csv')
+        shutil.copy(self.csv_path, req.file_path)
+        with patch.object(transport, 'run_in_worker',
+                          wraps=transport.run_in_worker) as run_in_worker:
+            transport.respond(req, 200, req.file_path)
+        self.assertTrue(run_in_worker.called)
+        raw_data = success_cb.call_args[0][0]
+        self.assertEqual(len(raw_data), 3)
+        self.assertFalse(os.path.exists(req.file_path))
+
+    def test_conversion_error(self):
+        transport = FakeTransport()
+        podium_api.register_podium_application('test_id', 'test_secret',
+                                               transport=transport)
+        self.addCleanup(podium_api.unregister_podium_application)
+        failure_cb = Mock()
+        make_lap_raw_data_get(PodiumToken('test_token', 'test_type', 1),
+                              'test/laps/1/data',
+                              os.path.join(self.directory, 'download'),
+                              failure_callback=failure_cb)
+        # the csv was never written
+        req = transport.requests[0]
+        os.remove(req.file_path)
+        transport.respond(req, 200, req.file_path)
+        self.assertEqual(failure_cb.call_args[0][0], 'error')
+        self.assertTrue(isinstance(failure_cb.call_args[0][1], IOError))
+
+    def test_failure_body(self):
+        transport = FakeTransport()
+        podium_api.register_podium_application('test_id', 'test_secret',
+                                               transport=transport)
+        self.addCleanup(podium_api.unregister_podium_application)
+        failure_cb = Mock()
+        make_lap_raw_data_get(PodiumToken('test_token', 'test_type', 1),
+                              'test/laps/1/data',
+                              os.path.join(self.directory, 'download'),
+                              failure_callback=failure_cb)
+        req = transport.requests[0]
+        with open(req.file_path, 'wb') as csv_file:
+            csv_file.write(b'{"error": "not found"}')
+        transport.respond(req, 404, req.file_path,
+                          {'Content-Type': 'application/json'})
+        self.assertEqual(failure_cb.call_args[0][0], 'failure')
+        self.assertEqual(failure_cb.call_args[0][1], {'error': 'not found'})
+        self.assertFalse(os.path.exists(req.file_path))
@@ -1,5 +1,8 @@
 import unittest
 import podium_api
+from podium_api.asyncreq import get_json_header, get_json_header_token
+from podium_api.types.exceptions import PodiumApplicationNotRegistered
+from podium_api.types.token import PodiumToken
 
 
 class TestRegisterApplication(unittest.TestCase):
@@ -11,3 +14,48 @@ class TestRegisterApplication(unittest.TestCase):
 
     def tearDown(self):
         podium_api.unregister_podium_application()
+
+
+class TestJsonHeaders(unittest.TestCase):
+
+    def setUp(self):
+        podium_api.register_podium_application('test_id', 'test_secret')
+        self.token = PodiumToken('test_token', 'test_type', 1)
+
+    def tearDown(self):
+        podium_api.unregister_podium_application()
+
+    def test_token_header_shared(self):
+        header = get_json_header_token(self.token)
+        self.assertEqual(header['Authorization'], 'Bearer test_token')
+        self.assertIs(get_json_header_token(self.token), header)
+        with self.assertRaises(TypeError):
+            header['Accept'] = 'text/csv'
+
+    def test_token_change(self):
+        header = get_json_header_token(self.token)
+        self.token.token = 'new_token'
+        new_header = get_json_header_token(self.token)
+        self.assertEqual(new_header['Authorization'], 'Bearer new_token')
+        self.assertEqual(header['Authorization'], 'Bearer test_token')
+        podium_api.PODIUM_APP.forget_token('new_token')
+        self.assertIsNot(get_json_header_token(self.token), new_header)
+
+    def test_basic_header(self):
+        header = get_json_header()
+        self.assertEqual(header['Authorization'], 'Basic test_id:test_secret')
+        self.assertIs(get_json_header(), header)
+        podium_api.PODIUM_APP.app_secret = 'other_secret'
+        self.assertEqual(get_json_header()['Authorization'],
+                         'Basic test_id:other_secret')
+
+    def test_per_application(self):
+        header = get_json_header_token(self.token)
+        podium_api.register_podium_application('other_id', 'other_secret')
+        self.assertIsNot(get_json_header_token(self.token), header)
+
+    def test_not_registered(self):
+        podium_api.unregister_podium_application()
+        self.assertRaises(PodiumApplicationNotRegistered,
+                          get_json_header_token, self.token)
+        self.assertRaises(PodiumApplicationNotRegistered, get_json_header)
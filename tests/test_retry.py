@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import podium_api
+from podium_api.asyncreq import using_retry_policy, make_request
+from podium_api.events import make_event_get, make_event_update
+from podium_api.retry import RetryPolicy, parse_retry_after
+from podium_api.types.token import PodiumToken
+from mock import Mock
+from tests.fakes import FakeTransport
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def test_backoff(self):
+        policy = RetryPolicy(backoff_base=1, backoff_max=5, jitter=0)
+        self.assertEqual([policy.backoff(i) for i in range(1, 6)],
+                         [1, 2, 4, 5, 5])
+        policy = RetryPolicy(backoff_base=1, jitter=1)
+        for i in range(20):
+            self.assertTrue(0 <= policy.backoff(2) <= 2)
+
+    def test_should_retry(self):
+        policy = RetryPolicy(max_attempts=2)
+        self.assertTrue(policy.should_retry(1, status=503))
+        self.assertFalse(policy.should_retry(1, status=404))
+        self.assertTrue(policy.should_retry(1, error=True))
+        self.assertFalse(policy.should_retry(2, status=503))
+        self.assertFalse(RetryPolicy(retry_errors=False).should_retry(
+            1, error=True))
+
+    def test_methods(self):
+        self.assertTrue(RetryPolicy().applies_to('GET'))
+        self.assertFalse(RetryPolicy().applies_to('POST'))
+        self.assertTrue(RetryPolicy(methods=('GET', 'post')).applies_to(
+            'POST'))
+
+    def test_retry_after(self):
+        self.assertEqual(parse_retry_after('7'), 7.0)
+        self.assertEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'),
+                         0.0)
+        self.assertEqual(parse_retry_after('soon'), None)
+        policy = RetryPolicy()
+        self.assertEqual(policy.delay(1, {'retry-after': '12'}), 12.0)
+        self.assertTrue(policy.delay(1, {}) <= 0.5)
+
+    def test_retry_after_clamped(self):
+        policy = RetryPolicy()
+        self.assertEqual(policy.delay(1, {'retry-after': '86400'}), 30.0)
+        policy = RetryPolicy(retry_after_max=60)
+        self.assertEqual(policy.delay(1, {'retry-after': '86400'}), 60.0)
+        self.assertEqual(policy.delay(1, {'retry-after': '12'}), 12.0)
+
+
+class TestRetries(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = FakeTransport()
+        self.policy = RetryPolicy(max_attempts=3, jitter=0)
+        podium_api.register_podium_application('test_id', 'test_secret',
+                                               transport=self.transport,
+                                               retry_policy=self.policy)
+        self.token = PodiumToken('test_token', 'test_type', 1)
+        self.event_json = {'event': {'id': 1, 'URI': 'test/events/1',
+                                     'title': 'test'}}
+
+    def tearDown(self):
+        podium_api.unregister_podium_application()
+
+    def respond(self, status, result=None, resp_headers=None):
+        self.transport.respond(self.transport.requests[-1], status, result,
+                               resp_headers)
+
+    def error(self, error):
+        self.transport.error(self.transport.requests[-1], error)
+
+    def test_retries_then_succeeds(self):
+        success_cb = Mock()
+        failure_cb = Mock()
+        make_event_get(self.token, 'test/events/1',
+                       success_callback=success_cb,
+                       failure_callback=failure_cb)
+        self.respond(503, {})
+        self.transport.fire_timers()
+        self.error(IOError('timeout'))
+        self.transport.fire_timers()
+        self.respond(200, self.event_json)
+        self.assertEqual(len(self.transport.requests), 3)
+        self.assertEqual(self.transport.delays, [0.5, 1.0])
+        self.assertEqual(success_cb.call_args[0][0].title, 'test')
+        self.assertFalse(failure_cb.called)
+
+    def test_gives_up(self):
+        failure_cb = Mock()
+        make_event_get(self.token, 'test/events/1',
+                       failure_callback=failure_cb)
+        for i in range(2):
+            self.respond(502, {})
+            self.transport.fire_timers()
+        self.respond(502, {'error': 'bad gateway'})
+        self.assertEqual(len(self.transport.requests), 3)
+        failure_type, result, data = failure_cb.call_args[0]
+        self.assertEqual(failure_type, 'failure')
+        self.assertEqual(data['retry_count'], 2)
+
+    def test_not_retried_status(self):
+        failure_cb = Mock()
+        make_event_get(self.token, 'test/events/1',
+                       failure_callback=failure_cb)
+        self.respond(404, {})
+        self.assertEqual(failure_cb.call_args[0][2]['retry_count'], 0)
+        self.assertEqual(self.transport.scheduled, [])
+
+    def test_honors_retry_after(self):
+        make_event_get(self.token, 'test/events/1')
+        self.respond(429, {}, {'Retry-After': '10'})
+        self.assertEqual(self.transport.delays, [10.0])
+
+    def test_post_opt_in(self):
+        make_event_update(self.token, 'test/events/1', title='new')
+        self.respond(503, {})
+        self.assertEqual(self.transport.scheduled, [])
+        with using_retry_policy(RetryPolicy(methods=('GET', 'PUT'))):
+            make_event_update(self.token, 'test/events/1', title='new')
+        self.respond(503, {})
+        self.assertEqual(len(self.transport.scheduled), 1)
+
+    def test_per_call(self):
+        with using_retry_policy(None):
+            make_event_get(self.token, 'test/events/1')
+        self.respond(503, {})
+        self.assertEqual(self.transport.scheduled, [])
+        make_request('test/events/1', retry_policy=RetryPolicy(
+            max_attempts=1))
+        self.respond(503, {})
+        self.assertEqual(self.transport.scheduled, [])
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import unittest
+import podium_api
+from podium_api.asyncreq import using_stale_callback
+from podium_api.events import make_event_get
+from podium_api.sqlitecache import SQLiteResponseCache
+from podium_api.types.token import PodiumToken
+from mock import Mock, patch
+from tests.fakes import FakeTransport
+
+
+class TestSQLiteResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'cache.db')
+        self.transport = FakeTransport(immediate=True)
+        self.token = PodiumToken('test_token', 'test_type', 1)
+        self.event_json = {'event': {'id': 1, 'URI': 'test/events/1',
+                                     'title': 'test'}}
+        self.caches = []
+
+    def tearDown(self):
+        podium_api.unregister_podium_application()
+        for cache in self.caches:
+            cache.close()
+        shutil.rmtree(self.directory)
+
+    def register(self, **kwargs):
+        cache = SQLiteResponseCache(self.path, **kwargs)
+        self.caches.append(cache)
+        podium_api.register_podium_application('test_id', 'test_secret',
+                                               transport=self.transport,
+                                               cache=cache)
+        return cache
+
+    def get_event(self, stale_cb=None):
+        success_cb = Mock()
+        with using_stale_callback(stale_cb):
+            make_event_get(self.token, 'test/events/1',
+                           success_callback=success_cb)
+        return success_cb
+
+    def test_survives_restart(self):
+        self.register()
+        self.get_event()
+        self.transport.respond(self.transport.requests[0], 200,
+                               self.event_json, {'ETag': '"abc"'})
+        # a new cache on the same file, as after restarting the app
+        self.register(serve_stale=True)
+        stale_cb = Mock()
+        success_cb = self.get_event(stale_cb)
+        self.assertEqual(stale_cb.call_args[0][0].title, 'test')
+        self.assertFalse(success_cb.called)
+        req = self.transport.requests[1]
+        self.assertEqual(req.req_headers['If-None-Match'], '"abc"')
+        self.transport.respond(req, 304, '')
+        self.assertEqual(success_cb.call_count, 1)
+        self.assertEqual(success_cb.call_args[0][0].title, 'test')
+
+    def test_changed_response_after_stale(self):
+        self.register(serve_stale=True)
+        self.get_event()
+        self.transport.respond(self.transport.requests[0], 200,
+                               self.event_json, {'ETag': '"abc"'})
+        stale_cb = Mock()
+        success_cb = self.get_event(stale_cb)
+        self.transport.respond(
+            self.transport.requests[1], 200,
+            {'event': {'id': 1, 'URI': 'test/events/1', 'title': 'new'}},
+            {'ETag': '"def"'})
+        self.assertEqual(stale_cb.call_args[0][0].title, 'test')
+        self.assertEqual(success_cb.call_count, 1)
+        self.assertEqual(success_cb.call_args[0][0].title, 'new')
+
+    def test_stale_not_served_by_default(self):
+        self.register()
+        self.get_event()
+        self.transport.respond(self.transport.requests[0], 200,
+                               self.event_json, {'ETag': '"abc"'})
+        self.register()
+        stale_cb = Mock()
+        self.get_event(stale_cb)
+        self.assertFalse(stale_cb.called)
+
+    def test_authorization_hashed(self):
+        cache = self.register()
+        cache.store(('test/events/1', 'secret token'), {'ETag': '"a"'},
+                    ('args',))
+        self.assertEqual(cache.get(('test/events/1', 'secret token')).args,
+                         ('args',))
+        self.assertEqual(cache.get(('test/events/1', 'other')), None)
+        with open(self.path, 'rb') as db_file:
+            self.assertFalse(b'secret token' in db_file.read())
+
+    @patch('podium_api.sqlitecache.time.time')
+    def test_eviction(self, wall_time):
+        cache = self.register(max_entries=2)
+        for i in range(3):
+            wall_time.return_value = 100.0 + i
+            cache.store(('url/{}'.format(i), None), {'ETag': '"a"'}, (i,))
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get(('url/0', None)), None)
+        wall_time.return_value = 110.0
+        cache.get(('url/1', None))
+        wall_time.return_value = 111.0
+        cache.max_bytes = cache.size - 1
+        cache.store(('url/3', None), {'ETag': '"a"'}, (3,))
+        self.assertEqual(cache.get(('url/2', None)), None)
+        self.assertNotEqual(cache.get(('url/3', None)), None)
+
+    def test_invalidate(self):
+        cache = self.register()
+        cache.store(('test/events/1', None), {'ETag': '"a"'}, (1,))
+        cache.store(('test/events/10', None), {'ETag': '"a"'}, (1,))
+        cache.store(('test/venues/1', None), {'ETag': '"a"'}, (1,))
+        cache.invalidate('test/events/1')
+        self.assertEqual(len(cache), 1)
+        cache.invalidate()
+        self.assertEqual(len(cache), 0)
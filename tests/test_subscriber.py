@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+from urllib.parse import parse_qs, urlparse
+import podium_api
+from podium_api.subscriber import AlertMessageSubscriber
+from podium_api.types.token import PodiumToken
+from mock import Mock
+from tests.fakes import FakeTransport
+
+
+def make_message(alertmessage_id):
+    return {'id': alertmessage_id,
+            'URI': 'test/alertmessages/{}'.format(alertmessage_id),
+            'send_time': '2016-01-01T00:00:{:02d}Z'.format(alertmessage_id),
+            'ack_time': None, 'message': 'box', 'priority': 1,
+            'sender_id': 1, 'eventdevice_uri': None, 'device_uri': None,
+            'user_uri': None}
+
+
+def make_page(ids, total=None):
+    # newest first, like the api
+    ids = sorted(ids, reverse=True)
+    return {'alertmessages': [make_message(i) for i in ids],
+            'total': len(ids) if total is None else total,
+            'nextURI': None if total is None else 'test/next',
+            'prevURI': None}
+
+
+def request_start(req):
+    return int(parse_qs(urlparse(req.url).query).get('start', ['0'])[0])
+
+
+class TestAlertMessageSubscriber(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = FakeTransport()
+        podium_api.register_podium_application('test_id', 'test_secret',
+                                               transport=self.transport)
+        self.token = PodiumToken('test_token', 'test_type', 1)
+        self.received = []
+
+    def tearDown(self):
+        podium_api.unregister_podium_application()
+
+    def on_message(self, event_id, device_id, alertmessage):
+        self.received.append(alertmessage.alertmessage_id)
+
+    def make_subscriber(self, **kwargs):
+        subscriber = AlertMessageSubscriber(self.token, self.on_message,
+                                            **kwargs)
+        subscriber.subscribe(1, 2)
+        subscriber.start()
+        return subscriber
+
+    def last_request(self):
+        return self.transport.requests[-1]
+
+    def test_first_poll_sets_cursor(self):
+        self.make_subscriber()
+        req = self.last_request()
+        self.assertIn('/events/1/devices/2/alertmessages', req.url)
+        self.transport.respond(req, 200, make_page([1, 2]))
+        self.assertEqual(self.received, [])
+        self.transport.fire_timers()
+        self.transport.respond(self.last_request(), 200,
+                               make_page([1, 2, 3, 4]))
+        self.assertEqual(self.received, [3, 4])
+
+    def test_history(self):
+        self.make_subscriber(history=True)
+        self.transport.respond(self.last_request(), 200, make_page([2, 1]))
+        self.assertEqual(self.received, [1, 2])
+
+    def test_deduplicates(self):
+        self.make_subscriber(history=True)
+        self.transport.respond(self.last_request(), 200, make_page([1]))
+        self.transport.fire_timers()
+        self.transport.respond(self.last_request(), 200, make_page([1]))
+        self.transport.fire_timers()
+        self.transport.respond(self.last_request(), 200, make_page([1, 2]))
+        self.assertEqual(self.received, [1, 2])
+
+    def test_seen_bounded(self):
+        subscriber = self.make_subscriber(history=True, max_seen=2)
+        self.transport.respond(self.last_request(), 200,
+                               make_page([1, 2, 3, 4]))
+        self.transport.fire_timers()
+        self.transport.respond(self.last_request(), 200,
+                               make_page([1, 2, 3, 4, 5]))
+        self.assertEqual(self.received, [1, 2, 3, 4, 5])
+        subscription = subscriber.subscribe(1, 2)
+        self.assertEqual(sorted(subscription.seen), [4, 5])
+
+    def test_pages_until_cursor(self):
+        subscriber = self.make_subscriber(per_page=2)
+        self.transport.respond(self.last_request(), 200, make_page([1, 2]))
+        self.transport.fire_timers()
+        # 3 new messages, the first page holds 5 and 4
+        self.transport.respond(self.last_request(), 200,
+                               make_page([4, 5], total=5))
+        self.assertEqual(self.received, [])
+        self.assertEqual(request_start(self.last_request()), 2)
+        self.transport.respond(self.last_request(), 200,
+                               make_page([2, 3], total=5))
+        self.assertEqual(self.received, [3, 4, 5])
+        self.assertEqual(subscriber.requests, 3)
+
+    def test_adaptive_interval(self):
+        subscriber = self.make_subscriber(min_interval=1, max_interval=4,
+                                          history=True)
+        self.transport.respond(self.last_request(), 200, make_page([]))
+        self.assertEqual(self.transport.timers[-1].delay, 2)
+        for i in range(2):
+            self.transport.fire_timers()
+            self.transport.respond(self.last_request(), 200, make_page([]))
+        self.assertEqual(subscriber.interval, 4)
+        self.transport.fire_timers()
+        self.transport.respond(self.last_request(), 200, make_page([1]))
+        self.assertEqual(self.transport.timers[-1].delay, 1)
+
+    def test_failure_backs_off(self):
+        failure_callback = Mock()
+        subscriber = self.make_subscriber(failure_callback=failure_callback)
+        self.last_request().callbacks['on_error'](self.last_request(), 'x')
+        self.assertEqual(failure_callback.call_args[0][0], 'error')
+        self.assertEqual(subscriber.interval, 2)
+        self.assertEqual(len(self.transport.timers), 1)
+
+    def test_stop(self):
+        subscriber = self.make_subscriber()
+        self.transport.respond(self.last_request(), 200, make_page([]))
+        subscriber.stop()
+        self.assertTrue(self.transport.timers[0].cancelled)
+
+    def test_unsubscribe(self):
+        subscriber = self.make_subscriber(history=True)
+        subscriber.unsubscribe(1, 2)
+        self.transport.respond(self.last_request(), 200, make_page([1]))
+        self.assertEqual(self.received, [])
+        self.transport.fire_timers()
+        self.assertEqual(len(self.transport.requests), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import unittest
+from podium_api.sync import (SyncEngine, load_sync_store, EVENTS, DEVICES,
+                             EVENTDEVICES)
+from podium_api.types.account import PodiumAccount
+from podium_api.types.device import get_device_from_json
+from podium_api.types.event import get_event_from_json
+from podium_api.types.eventdevice import get_eventdevice_from_json
+from podium_api.types.paged_response import PodiumPagedResponse
+from podium_api.types.token import PodiumToken
+from mock import Mock, patch
+
+
+def event(i, title='Event', end_time=None):
+    return get_event_from_json({'id': i, 'URI': 'events/{}'.format(i),
+                                'devices_uri': 'events/{}/devices'.format(i),
+                                'title': title, 'end_time': end_time})
+
+
+def device(i, name='Device'):
+    return get_device_from_json({'id': i, 'URI': 'devices/{}'.format(i),
+                                 'name': name})
+
+
+def eventdevice(event_id, i):
+    return get_eventdevice_from_json(
+        {'id': i, 'URI': 'events/{}/devices/{}'.format(event_id, i)})
+
+
+class FakeServer(object):
+    """
+    List request function answering right away from collections, a dict of
+    endpoint to list of objects.
+    """
+
+    def __init__(self):
+        self.collections = {}
+        self.calls = []
+
+    def __call__(self, token, endpoint=None, start=None, per_page=None,
+                 success_callback=None, failure_callback=None):
+        self.calls.append((endpoint, start))
+        items = self.collections.get(endpoint, [])
+        success_callback(PodiumPagedResponse(
+            items[start:start + per_page], len(items), None, None))
+
+
+class TestSyncEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeServer()
+        patchers = [patch('podium_api.sync.make_events_get', self.server),
+                    patch('podium_api.sync.make_devices_get', self.server),
+                    patch('podium_api.sync.make_eventdevices_get',
+                          self.server)]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.account = PodiumAccount(1, 'user', 'email', 'account/devices',
+                                     None, None, None, 'account/events')
+        self.server.collections = {
+            'account/events': [event(i) for i in range(5)],
+            'account/devices': [device(i) for i in range(2)],
+        }
+        for i in range(5):
+            self.server.collections['events/{}/devices'.format(i)] = [
+                eventdevice(i, 0), eventdevice(i, 1)]
+        self.engine = SyncEngine(PodiumToken('token', 'type', 1),
+                                 self.account, per_page=2)
+
+    def sync(self, **kwargs):
+        done_cb = Mock()
+        self.server.calls = []
+        self.engine.sync(done_callback=done_cb, **kwargs)
+        self.assertFalse(self.engine.syncing)
+        return done_cb.call_args[0][0]
+
+    def test_initial_sync(self):
+        result = self.sync()
+        self.assertEqual(len(result.added[EVENTS]), 5)
+        self.assertEqual(len(result.added[DEVICES]), 2)
+        self.assertEqual(len(result.added[EVENTDEVICES]), 10)
+        self.assertEqual(len(self.engine.store.events), 5)
+        self.assertEqual(
+            len(self.engine.store.eventdevices_of(event(3))), 2)
+
+    def test_unchanged_sync_requests_first_pages_only(self):
+        for i in range(5):
+            self.server.collections['events/{}/devices'.format(i)].append(
+                eventdevice(i, 2))
+        self.sync()
+        result = self.sync()
+        self.assertFalse(result.has_changes())
+        self.assertEqual(sorted(self.server.calls),
+                         [('account/devices', 0), ('account/events', 0)] +
+                         [('events/{}/devices'.format(i), 0)
+                          for i in range(5)])
+
+    def test_eventdevice_added_to_unchanged_event(self):
+        self.sync()
+        self.server.collections['events/2/devices'].insert(
+            0, eventdevice(2, 7))
+        result = self.sync()
+        self.assertFalse(result.added[EVENTS] or result.changed[EVENTS])
+        self.assertEqual([e.uri for e in result.added[EVENTDEVICES]],
+                         ['events/2/devices/7'])
+        self.assertEqual(len(self.engine.store.eventdevices_of(event(2))), 3)
+
+    def test_changes(self):
+        self.sync()
+        events = self.server.collections['account/events']
+        events[0] = event(0, title='Renamed')
+        del events[4]
+        events.insert(0, event(5))
+        self.server.collections['events/5/devices'] = [eventdevice(5, 0)]
+        result = self.sync()
+        self.assertEqual([e.uri for e in result.added[EVENTS]], ['events/5'])
+        self.assertEqual([e.title for e in result.changed[EVENTS]],
+                         ['Renamed'])
+        self.assertEqual([e.uri for e in result.removed[EVENTS]],
+                         ['events/4'])
+        self.assertEqual(len(result.added[EVENTDEVICES]), 1)
+        self.assertEqual(len(result.removed[EVENTDEVICES]), 2)
+        self.assertFalse(result.added[DEVICES] or result.changed[DEVICES])
+        # only the first page of the unchanged event's eventdevices
+        self.assertEqual([call for call in self.server.calls
+                          if call[0] == 'events/1/devices'],
+                         [('events/1/devices', 0)])
+
+    def test_old_events_not_checked(self):
+        events = self.server.collections['account/events']
+        for i in range(4):
+            events[i] = event(i, end_time='2001-05-20T16:00:00Z')
+        self.sync()
+        events[1] = event(1, title='Renamed', end_time='2001-05-20T16:00:00Z')
+        result = self.sync()
+        self.assertEqual([e.uri for e in result.changed[EVENTS]],
+                         ['events/1'])
+        # the changed event and the one without an end_time
+        self.assertEqual(sorted(call for call in self.server.calls
+                                if call[0].startswith('events/')),
+                         [('events/1/devices', 0), ('events/4/devices', 0)])
+
+    def test_periodic_full_sync(self):
+        self.sync()
+        self.assertFalse(self.engine.needs_full_sync())
+        self.engine.store.last_full_sync -= 3600
+        self.assertTrue(self.engine.needs_full_sync())
+        self.sync()
+        self.assertTrue(('events/1/devices', 0) in self.server.calls)
+        self.assertFalse(self.engine.needs_full_sync())
+        self.engine.full_interval = None
+        self.engine.store.last_full_sync -= 7200
+        self.assertFalse(self.engine.needs_full_sync())
+
+    def test_full_sync(self):
+        self.sync()
+        result = self.sync(full=True)
+        self.assertFalse(result.has_changes())
+        self.assertTrue(('events/1/devices', 0) in self.server.calls)
+
+    def test_failure(self):
+        failure_cb = Mock()
+
+        def fail(token, endpoint=None, failure_callback=None, **kwargs):
+            failure_callback('failure', {}, {})
+
+        with patch('podium_api.sync.make_devices_get', fail):
+            self.engine.sync(failure_callback=failure_cb)
+        failure_cb.assert_called_with('failure', {}, {})
+        self.assertFalse(self.engine.syncing)
+
+    def test_save_and_load(self):
+        self.sync()
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'store')
+            self.engine.store.save(path)
+            store = load_sync_store(path)
+        finally:
+            shutil.rmtree(directory)
+        self.assertEqual(sorted(store.events), sorted(
+            self.engine.store.events))
+        engine = SyncEngine(self.engine.token, self.account, store=store,
+                            per_page=2)
+        self.engine = engine
+        self.assertFalse(self.sync().has_changes())
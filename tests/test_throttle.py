@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+import podium_api
+from podium_api.asyncreq import make_request, using_priority
+from podium_api.throttle import (RequestThrottle, TokenBucket, QueuedRequest,
+                                 REALTIME, INTERACTIVE, BULK)
+from mock import Mock, patch
+from tests.fakes import FakeTransport
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    @patch('podium_api.throttle.time.monotonic')
+    def test_take(self, monotonic):
+        monotonic.return_value = 100.0
+        bucket = TokenBucket(2, 2)
+        self.assertEqual(bucket.take(), 0)
+        self.assertEqual(bucket.take(), 0)
+        self.assertEqual(bucket.take(), 0.5)
+        monotonic.return_value = 100.5
+        self.assertEqual(bucket.take(), 0)
+
+
+class TestRequestThrottle(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = FakeTransport()
+
+    def tearDown(self):
+        podium_api.unregister_podium_application()
+
+    def register(self, throttle):
+        podium_api.register_podium_application('test_id', 'test_secret',
+                                               transport=self.transport,
+                                               throttle=throttle)
+
+    def test_max_in_flight_fifo(self):
+        throttle = RequestThrottle(max_in_flight=2)
+        self.register(throttle)
+        success_cbs = [Mock() for i in range(4)]
+        reqs = [make_request('https://podium.live/test/{}'.format(i),
+                             on_success=success_cbs[i])
+                for i in range(4)]
+        self.assertEqual(len(self.transport.requests), 2)
+        self.assertTrue(isinstance(reqs[2], QueuedRequest))
+        self.assertEqual(throttle.queue_depth(), 2)
+        self.transport.respond(reqs[1])
+        self.assertTrue(success_cbs[1].called)
+        self.assertEqual(reqs[2].request, self.transport.requests[2])
+        self.assertEqual(self.transport.requests[2].url,
+                         'https://podium.live/test/2')
+        self.assertEqual(reqs[3].request, None)
+        self.transport.respond(reqs[0])
+        self.assertEqual(reqs[3].request.url, 'https://podium.live/test/3')
+        self.assertEqual(throttle.queue_depth(), 0)
+
+    def test_start_error(self):
+        throttle = RequestThrottle(max_in_flight=1)
+        self.register(throttle)
+        first = make_request('https://podium.live/a')
+        error_cb = Mock()
+        failing = make_request('ftp://podium.live/b', on_error=error_cb)
+        queued = make_request('https://podium.live/c')
+        request = self.transport.request
+
+        def fake_request(url, *args, **kwargs):
+            if url.startswith('ftp'):
+                raise ValueError('No connection class for scheme ftp')
+            return request(url, *args, **kwargs)
+
+        with patch.object(self.transport, 'request', fake_request):
+            self.transport.respond(first)
+        self.assertTrue(isinstance(failing.error, ValueError))
+        self.assertIs(error_cb.call_args[0][0], failing)
+        # the slot of the failed request went to the next one
+        self.assertEqual(queued.request.url, 'https://podium.live/c')
+        self.assertEqual(throttle.in_flight(
+            throttle.key_for('https://podium.live/c', None)), 1)
+
+    @patch('podium_api.throttle.time.monotonic')
+    def test_rate(self, monotonic):
+        monotonic.return_value = 100.0
+        self.register(RequestThrottle(rate=1))
+        for i in range(3):
+            make_request('https://podium.live/test/{}'.format(i))
+        self.assertEqual(len(self.transport.requests), 1)
+        self.assertEqual(self.transport.delays, [1.0])
+        monotonic.return_value = 101.0
+        self.transport.fire_timers()
+        self.assertEqual(len(self.transport.requests), 2)
+        self.assertEqual(len(self.transport.scheduled), 1)
+
+    def test_limits_per_host_and_token(self):
+        throttle = RequestThrottle(max_in_flight=1, per_token=True)
+        self.register(throttle)
+        make_request('https://podium.live/a', header={'Authorization': 'a'})
+        make_request('https://podium.live/b', header={'Authorization': 'b'})
+        make_request('https://other.live/a', header={'Authorization': 'a'})
+        make_request('https://podium.live/c', header={'Authorization': 'a'})
+        self.assertEqual(len(self.transport.requests), 3)
+        self.assertEqual(
+            throttle.queue_depth(('podium.live', 'a')), 1)
+
+    def test_cancel(self):
+        self.register(RequestThrottle(max_in_flight=1))
+        first = make_request('https://podium.live/a')
+        queued = make_request('https://podium.live/b')
+        queued.cancel()
+        self.transport.respond(first)
+        self.assertEqual(len(self.transport.requests), 1)
+
+
+class TestPriorities(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = FakeTransport()
+
+    def tearDown(self):
+        podium_api.unregister_podium_application()
+
+    def register(self, throttle):
+        podium_api.register_podium_application('test_id', 'test_secret',
+                                               transport=self.transport,
+                                               throttle=throttle)
+
+    def test_priority_for(self):
+        throttle = RequestThrottle()
+        self.assertEqual(throttle.priority_for(
+            'https://podium.live/api/v1/events/1/racestats'), REALTIME)
+        self.assertEqual(throttle.priority_for(
+            'https://podium.live/api/v1/alertmessages?per_page=10'),
+            REALTIME)
+        self.assertEqual(throttle.priority_for(
+            'https://podium.live/api/v1/events/1/devices/2/laps'), BULK)
+        self.assertEqual(throttle.priority_for(
+            'https://podium.live/api/v1/account'), INTERACTIVE)
+
+    def test_higher_class_first(self):
+        throttle = RequestThrottle(max_in_flight=1)
+        self.register(throttle)
+        first = make_request('https://podium.live/account')
+        bulk = make_request('https://podium.live/events/1/laps')
+        interactive = make_request('https://podium.live/account')
+        realtime = make_request('https://podium.live/events/1/racestats')
+        self.assertEqual(throttle.queue_depth(priority=BULK), 1)
+        self.transport.respond(first)
+        self.assertNotEqual(realtime.request, None)
+        self.assertEqual(interactive.request, None)
+        self.transport.respond(realtime.request)
+        self.assertNotEqual(interactive.request, None)
+        self.assertEqual(bulk.request, None)
+        self.transport.respond(interactive.request)
+        self.assertNotEqual(bulk.request, None)
+
+    def test_using_priority(self):
+        throttle = RequestThrottle(max_in_flight=1)
+        self.register(throttle)
+        make_request('https://podium.live/account')
+        with using_priority(BULK):
+            queued = make_request('https://podium.live/account')
+        self.assertEqual(queued.priority, BULK)
+        queued = make_request('https://podium.live/account',
+                              priority=REALTIME)
+        self.assertEqual(queued.priority, REALTIME)
+
+    def test_max_bulk_in_flight(self):
+        throttle = RequestThrottle(max_in_flight=3, max_bulk_in_flight=1)
+        self.register(throttle)
+        make_request('https://podium.live/events/1/laps')
+        make_request('https://podium.live/events/2/laps')
+        make_request('https://podium.live/events/1/racestats')
+        make_request('https://podium.live/events/2/racestats')
+        self.assertEqual(len(self.transport.requests), 3)
+        self.assertEqual(throttle.queue_depth(priority=BULK), 1)
+
+    @patch('podium_api.throttle.time.monotonic')
+    def test_latency_stats(self, monotonic):
+        monotonic.return_value = 100.0
+        throttle = RequestThrottle(max_in_flight=1)
+        self.register(throttle)
+        first = make_request('https://podium.live/events/1/racestats')
+        queued = make_request('https://podium.live/events/1/racestats')
+        monotonic.return_value = 101.0
+        self.transport.respond(first)
+        monotonic.return_value = 103.0
+        self.transport.respond(queued.request)
+        stats = throttle.latency_stats()
+        self.assertEqual(stats[REALTIME]['count'], 2)
+        self.assertEqual(stats[REALTIME]['mean_wait'], 0.5)
+        self.assertEqual(stats[REALTIME]['max_latency'], 3.0)
+        self.assertEqual(stats[BULK]['count'], 0)
+        self.assertEqual(stats[BULK]['mean_latency'], None)
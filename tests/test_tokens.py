@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import time
+import unittest
+from urllib.parse import parse_qs
+import podium_api
+from podium_api.asyncreq import get_json_header_token
+from podium_api.events import make_event_get
+from podium_api.tokens import MemoryTokenStore, TokenManager
+from podium_api.types.token import PodiumToken
+from mock import Mock
+from tests.fakes import FakeTransport
+
+
+def token_json(value, refresh_token='refresh', expires_in=7200,
+               created=None):
+    return {'access_token': value, 'token_type': 'bearer',
+            'created_at': int(time.time()) if created is None else created,
+            'expires_in': expires_in, 'refresh_token': refresh_token}
+
+
+class TestTokenManager(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = FakeTransport()
+        podium_api.register_podium_application('test_id', 'test_secret',
+                                               transport=self.transport)
+        self.store = MemoryTokenStore()
+
+    def tearDown(self):
+        podium_api.unregister_podium_application()
+
+    def make_manager(self, token=None, **kwargs):
+        if token is not None:
+            self.store.save(token)
+        return TokenManager(store=self.store, **kwargs)
+
+    def is_refresh(self, req):
+        return (req.url.endswith('/oauth/token') and
+                parse_qs(req.req_body)['grant_type'] == ['refresh_token'])
+
+    def test_login_stores_token(self):
+        manager = self.make_manager()
+        self.assertIsNone(manager.token)
+        success_callback = Mock()
+        manager.login('user', 'pass', success_callback=success_callback)
+        self.transport.respond(self.transport.requests[0], 200,
+                               token_json('first'))
+        self.assertEqual(manager.token.token, 'first')
+        self.assertEqual(manager.token.refresh_token, 'refresh')
+        self.assertIs(success_callback.call_args[0][0], manager.token)
+        self.assertEqual(self.store.load().token, 'first')
+        # refresh scheduled refresh_margin before the expiry
+        self.assertAlmostEqual(self.transport.timers[0].delay, 6900, -1)
+
+    def test_refresh_ahead_of_expiry(self):
+        token = PodiumToken('old', 'bearer', int(time.time()), 7200,
+                            'refresh')
+        manager = self.make_manager(token)
+        held = manager.token
+        self.transport.timers[0].callback()
+        req = self.transport.requests[0]
+        self.assertTrue(self.is_refresh(req))
+        self.assertEqual(parse_qs(req.req_body)['refresh_token'],
+                         ['refresh'])
+        self.transport.respond(req, 200, token_json('new', None))
+        # refreshed in place, the refresh_token is kept
+        self.assertIs(manager.token, held)
+        self.assertEqual(held.token, 'new')
+        self.assertEqual(held.refresh_token, 'refresh')
+        self.assertEqual(self.store.load().token, 'new')
+        self.assertEqual(get_json_header_token(held)['Authorization'],
+                         'Bearer new')
+
+    def test_expired_token_queues_calls(self):
+        token = PodiumToken('old', 'bearer', 0, 7200, 'refresh')
+        manager = self.make_manager(token)
+        success_callback = Mock()
+        self.assertIsNone(manager.call(make_event_get, 'test/events/1',
+                                       success_callback=success_callback))
+        self.assertEqual(len(self.transport.requests), 1)
+        self.assertTrue(self.is_refresh(self.transport.requests[0]))
+        manager.call(make_event_get, 'test/events/2')
+        self.transport.respond(self.transport.requests[0], 200,
+                               token_json('new'))
+        replays = self.transport.requests[1:]
+        self.assertEqual([req.url for req in replays],
+                         ['test/events/1?expand=True',
+                          'test/events/2?expand=True'])
+        self.assertEqual(replays[0].req_headers['Authorization'],
+                         'Bearer new')
+
+    def test_unauthorized_replayed(self):
+        token = PodiumToken('old', 'bearer', int(time.time()), None,
+                            'refresh')
+        manager = self.make_manager(token)
+        success_callback = Mock()
+        failure_callback = Mock()
+        manager.call(make_event_get, 'test/events/1',
+                     success_callback=success_callback,
+                     failure_callback=failure_callback)
+        self.transport.respond(self.transport.requests[0], 401, {})
+        self.assertFalse(failure_callback.called)
+        self.assertTrue(manager.refreshing)
+        self.transport.respond(self.transport.requests[1], 200,
+                               token_json('new'))
+        replay = self.transport.requests[2]
+        self.assertEqual(replay.req_headers['Authorization'], 'Bearer new')
+        self.transport.respond(replay, 200,
+                               {'event': {'id': 1, 'URI': 'test/events/1'}})
+        self.assertTrue(success_callback.called)
+
+    def test_unauthorized_replayed_once(self):
+        token = PodiumToken('old', 'bearer', int(time.time()), None,
+                            'refresh')
+        manager = self.make_manager(token)
+        failure_callback = Mock()
+        manager.call(make_event_get, 'test/events/1',
+                     failure_callback=failure_callback)
+        self.transport.respond(self.transport.requests[0], 401, {})
+        self.transport.respond(self.transport.requests[1], 200,
+                               token_json('new'))
+        self.transport.respond(self.transport.requests[2], 401, {})
+        self.assertEqual(failure_callback.call_args[0][0], 'failure')
+        self.assertEqual(len(self.transport.requests), 3)
+
+    def test_refresh_failure(self):
+        token = PodiumToken('old', 'bearer', 0, 7200, 'refresh')
+        expired_callback = Mock()
+        manager = self.make_manager(token, expired_callback=expired_callback)
+        failure_callback = Mock()
+        manager.call(make_event_get, 'test/events/1',
+                     failure_callback=failure_callback)
+        self.transport.respond(self.transport.requests[0], 401, {})
+        self.assertTrue(expired_callback.called)
+        self.assertEqual(failure_callback.call_args[0][0], 'failure')
+        self.assertFalse(manager.refreshing)
+
+    def test_no_refresh_token(self):
+        token = PodiumToken('old', 'bearer', 0, 7200)
+        expired_callback = Mock()
+        manager = self.make_manager(token, expired_callback=expired_callback)
+        manager.refresh()
+        self.assertEqual(expired_callback.call_args[0][1],
+                         {'error': 'no_refresh_token'})
+        self.assertEqual(len(self.transport.requests), 0)
+
+    def test_logout(self):
+        token = PodiumToken('old', 'bearer', int(time.time()), 7200,
+                            'refresh')
+        manager = self.make_manager(token)
+        manager.logout()
+        self.assertIsNone(manager.token)
+        self.assertIsNone(self.store.load())
+        self.assertTrue(self.transport.timers[0].cancelled)
+
+
+if __name__ == '__main__':
+    unittest.main()
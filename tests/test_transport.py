@@ -0,0 +1,269 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from http.client import RemoteDisconnected
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import podium_api
+from podium_api.asyncreq import make_request, make_request_default
+from podium_api.jsondecode import DECODERS, get_json_decoder
+from podium_api.transport import (PooledTransport, PodiumTransport,
+                                  UrlRequestTransport, DecodingUrlRequest,
+                                  decode_result)
+from mock import Mock, patch
+
+
+class PodiumTestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        self.server.connections += 1
+
+    def send_json(self, status, payload, extra_headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (extra_headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.startswith('/missing'):
+            self.send_json(404, {'error': 'not found'})
+        else:
+            self.send_json(200, {'path': self.path})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length).decode('utf-8')
+        self.send_json(201, {'body': body},
+                       extra_headers={'Location': '/api/v1/events/1'})
+
+    def do_PUT(self):
+        length = int(self.headers.get('Content-Length', 0))
+        self.rfile.read(length)
+        self.send_response(302)
+        self.send_header('Location', '/api/v1/events/1')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+
+class TestPooledTransport(unittest.TestCase):
+
+    def setUp(self):
+        self.server = HTTPServer(('127.0.0.1', 0), PodiumTestHandler)
+        self.server.connections = 0
+        self.server_thread = threading.Thread(
+            target=self.server.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+        self.url = 'http://127.0.0.1:{}'.format(self.server.server_port)
+        self.transport = PooledTransport(pool_size=2,
+                                         dispatch=lambda func: func())
+
+    def tearDown(self):
+        self.transport.close()
+        self.server.shutdown()
+        self.server.server_close()
+        podium_api.unregister_podium_application()
+
+    def test_success(self):
+        success_cb = Mock()
+        req = self.transport.request(self.url + '/api/v1/events?start=1',
+                                     on_success=success_cb)
+        req.wait(5)
+        success_cb.assert_called_with(req, {'path': '/api/v1/events?start=1'})
+        self.assertEqual(req.resp_status, 200)
+        self.assertTrue(req.is_finished)
+
+    def test_failure(self):
+        failure_cb = Mock()
+        req = self.transport.request(self.url + '/missing',
+                                     on_failure=failure_cb)
+        req.wait(5)
+        failure_cb.assert_called_with(req, {'error': 'not found'})
+
+    def test_redirect(self):
+        redirect_cb = Mock()
+        req = self.transport.request(self.url + '/api/v1/events/1',
+                                     method='PUT', body='event%5Btitle%5D=a',
+                                     on_redirect=redirect_cb)
+        req.wait(5)
+        redirect_cb.assert_called_with(req, b'')
+        self.assertEqual(req._resp_headers['Location'], '/api/v1/events/1')
+
+    def test_error(self):
+        error_cb = Mock()
+        req = self.transport.request('ftp://127.0.0.1/test',
+                                     on_error=error_cb)
+        req.wait(5)
+        self.assertTrue(isinstance(error_cb.call_args[0][1], ValueError))
+
+    def test_progress(self):
+        progress_cb = Mock()
+        req = self.transport.request(self.url + '/test',
+                                     on_progress=progress_cb)
+        req.wait(5)
+        total = len(json.dumps({'path': '/test'}))
+        progress_cb.assert_any_call(req, 0, total)
+        progress_cb.assert_called_with(req, total, total)
+
+    def test_file_path(self):
+        progress_cb = Mock()
+        file_path = os.path.join(tempfile.mkdtemp(), 'body')
+        req = self.transport.request(self.url + '/test', file_path=file_path,
+                                     on_progress=progress_cb)
+        req.wait(5)
+        self.assertEqual(req.result, file_path)
+        with open(file_path) as body:
+            self.assertEqual(json.loads(body.read()), {'path': '/test'})
+        shutil.rmtree(os.path.dirname(file_path))
+        total = len(json.dumps({'path': '/test'}))
+        progress_cb.assert_called_with(req, total, total)
+
+    def test_run_in_worker(self):
+        done = threading.Event()
+        results = []
+
+        def on_result(result):
+            results.append(result)
+            done.set()
+
+        self.transport.run_in_worker(threading.current_thread, on_result,
+                                     on_result)
+        self.assertTrue(done.wait(5))
+        self.assertIsNot(results[0], threading.current_thread())
+        done.clear()
+        self.transport.run_in_worker(lambda: 1 / 0, on_result, on_result)
+        self.assertTrue(done.wait(5))
+        self.assertTrue(isinstance(results[1], ZeroDivisionError))
+
+    def test_connections_reused(self):
+        for i in range(5):
+            req = self.transport.request(self.url + '/test/{}'.format(i))
+            req.wait(5)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_stale_connection(self):
+        stale = Mock()
+        stale.getresponse.side_effect = RemoteDisconnected('closed')
+        pool = self.transport.get_pool('http', '127.0.0.1',
+                                       self.server.server_port)
+        error_cb = Mock()
+        with patch.object(pool, 'get', return_value=(stale, True)):
+            req = self.transport.request(self.url + '/api/v1/events',
+                                         method='POST', body='a=1',
+                                         on_error=error_cb)
+            req.wait(5)
+        # the server may have handled the POST, it is not sent again
+        self.assertTrue(error_cb.called)
+        self.assertEqual(self.server.connections, 0)
+        success_cb = Mock()
+        with patch.object(pool, 'get', return_value=(stale, True)):
+            req = self.transport.request(self.url + '/test',
+                                         on_success=success_cb)
+            req.wait(5)
+        self.assertTrue(success_cb.called)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_make_request_uses_registered_transport(self):
+        podium_api.register_podium_application('test_id', 'test_secret',
+                                               podium_url=self.url,
+                                               transport=self.transport)
+        success_cb = Mock()
+        redirect_cb = Mock()
+        req = make_request_default(self.url + '/api/v1/events',
+                                   method='POST', body={'test1': 'test2'},
+                                   success_callback=success_cb,
+                                   redirect_callback=redirect_cb)
+        req.wait(5)
+        success_cb.assert_called_with({'body': 'test1=test2'},
+                                      {'success_callback': success_cb,
+                                       'failure_callback': None,
+                                       'progress_callback': None,
+                                       'redirect_callback': redirect_cb})
+
+
+class TestCustomTransport(unittest.TestCase):
+
+    def tearDown(self):
+        podium_api.unregister_podium_application()
+
+    def test_make_request_delegates(self):
+        transport = PodiumTransport()
+        transport.request = Mock()
+        podium_api.register_podium_application('test_id', 'test_secret',
+                                               transport=transport)
+        success_cb = Mock()
+        req = make_request('test/test', method='PUT', body={'test': 'test2'},
+                           params={'test3': 'test4'}, header={'a': 'b'},
+                           on_success=success_cb, data={'test': 'data'})
+        self.assertEqual(req, transport.request.return_value)
+        args, kwargs = transport.request.call_args
+        self.assertEqual(args[0], 'test/test?test3=test4')
+        self.assertEqual(kwargs['method'], 'PUT')
+        self.assertEqual(kwargs['body'], 'test=test2')
+        self.assertEqual(kwargs['headers'], {'a': 'b'})
+        kwargs['on_success'](req, {})
+        success_cb.assert_called_with(req, {}, {'test': 'data'})
+        self.assertEqual(kwargs['on_failure'], None)
+
+
+class TestJSONDecoding(unittest.TestCase):
+
+    def test_decoders(self):
+        body = json.dumps({'events': [{'id': 1, 'title': 'Test'}]})
+        for name in DECODERS:
+            self.assertEqual(
+                decode_result('application/json; charset=utf-8',
+                              body.encode('utf-8'), get_json_decoder(name)),
+                {'events': [{'id': 1, 'title': 'Test'}]})
+
+    def test_unknown_decoder(self):
+        self.assertRaises(ImportError, get_json_decoder, 'nojson')
+
+    def test_decode_result(self):
+        self.assertEqual(decode_result('text/plain', b'{"a": 1}'),
+                         b'{"a": 1}')
+        self.assertEqual(decode_result('text/plain', 'text'), 'text')
+        self.assertEqual(decode_result('application/json', b'not json'),
+                         'not json')
+        self.assertEqual(decode_result(None, b'\xff\xfe'), b'\xff\xfe')
+
+    @patch('podium_api.transport.DecodingUrlRequest')
+    def test_url_request_decoder(self, url_request):
+        decoder = Mock(return_value={'a': 1})
+        transport = UrlRequestTransport()
+        transport.json_decoder = decoder
+        success_cb = Mock()
+        transport.request('https://podium.live/test', on_success=success_cb)
+        kwargs = url_request.call_args[1]
+        self.assertTrue(kwargs['decode'])
+        self.assertIs(kwargs['json_decoder'], decoder)
+        self.assertIs(kwargs['on_success'], success_cb)
+        transport.request('https://podium.live/test', file_path='data.csv')
+        self.assertFalse(url_request.call_args[1]['decode'])
+
+    @unittest.skipIf(DecodingUrlRequest is None, 'kivy is not installed')
+    @patch('podium_api.transport.UrlRequest.start')
+    def test_url_request_decode_result(self, start):
+        decoder = Mock(return_value={'a': 1})
+        req = DecodingUrlRequest('https://podium.live/test',
+                                 json_decoder=decoder)
+        resp = Mock()
+        with patch.object(req, 'get_content_type',
+                          return_value='application/json; charset=utf-8'):
+            self.assertEqual(req.decode_result('{"a": 1}', resp), {'a': 1})
+        decoder.assert_called_with('{"a": 1}')
+        with patch.object(req, 'get_content_type', return_value='text/csv'):
+            self.assertEqual(req.decode_result('a,b', resp), 'a,b')
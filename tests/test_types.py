@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import gc
+import unittest
+from mock import Mock
+import podium_api
+from podium_api.types.account import PodiumAccount
+from podium_api.types.alertmessage import PodiumAlertMessage
+from podium_api.types.device import PodiumDevice, get_device_from_json
+from podium_api.types.identity import IdentityMap
+from podium_api.types.event import PodiumEvent
+from podium_api.types.eventdevice import (PodiumEventDevice,
+                                          get_eventdevice_from_json)
+from podium_api.types.friendship import PodiumFriendship
+from podium_api.types.lap import PodiumLap
+from podium_api.types.paged_response import (PodiumPagedResponse,
+                                             LazyPayload,
+                                             get_paged_response_from_json)
+from podium_api.types.racestat import Racestat
+from podium_api.types.redirect import PodiumRedirect
+from podium_api.types.token import PodiumToken
+from podium_api.types.user import PodiumUser
+from podium_api.types.venue import PodiumVenue
+
+TYPES = [PodiumAccount, PodiumAlertMessage, PodiumDevice, PodiumEvent,
+         PodiumEventDevice, PodiumFriendship, PodiumLap, PodiumPagedResponse,
+         Racestat, PodiumRedirect, PodiumToken, PodiumUser, PodiumVenue]
+
+
+class TestSlots(unittest.TestCase):
+
+    def test_no_instance_dict(self):
+        for cls in TYPES:
+            code = cls.__init__.__code__
+            args = code.co_varnames[1:code.co_argcount]
+            obj = cls(*args)
+            self.assertFalse(hasattr(obj, '__dict__'), cls.__name__)
+            for name in cls.__slots__:
+                self.assertTrue(hasattr(obj, name), name)
+
+    def test_paged_response_payload_name(self):
+        paged = PodiumPagedResponse(['a'], 1, None, None,
+                                    payload_name='events')
+        self.assertEqual(paged.events, ['a'])
+        self.assertRaises(AttributeError, getattr, paged, 'laps')
+
+
+class TestLazyPayload(unittest.TestCase):
+
+    def setUp(self):
+        self.json = {'eventdevices': [
+            {'id': i, 'URI': '/api/v1/events/1/devices/{}'.format(i),
+             'channels': [{'name': 'Speed'}]} for i in range(3)],
+            'total': 3}
+
+    def tearDown(self):
+        podium_api.unregister_podium_application()
+
+    def test_converts_on_access(self):
+        response = get_paged_response_from_json(self.json, 'eventdevices',
+                                                lazy=True)
+        payload = response.eventdevices
+        self.assertTrue(isinstance(payload, LazyPayload))
+        self.assertEqual(len(payload), 3)
+        self.assertEqual(payload.converted(), 0)
+        self.assertEqual(payload.raw[2]['URI'], '/api/v1/events/1/devices/2')
+        device = payload[1]
+        self.assertTrue(isinstance(device, PodiumEventDevice))
+        self.assertTrue(payload[1] is device)
+        self.assertTrue(device.channels is
+                        self.json['eventdevices'][1]['channels'])
+        self.assertEqual(payload.converted(), 1)
+        self.assertEqual([d.eventdevice_id for d in payload[-2:]], [1, 2])
+        self.assertEqual([d.eventdevice_id for d in payload], [0, 1, 2])
+        self.assertEqual(payload, list(payload))
+
+    def test_application_setting(self):
+        response = get_paged_response_from_json(self.json, 'eventdevices')
+        self.assertTrue(isinstance(response.payload, list))
+        podium_api.register_podium_application('test_id', 'test_secret',
+                                               lazy_payloads=True)
+        response = get_paged_response_from_json(self.json, 'eventdevices')
+        self.assertTrue(isinstance(response.payload, LazyPayload))
+        response = get_paged_response_from_json(self.json, 'eventdevices',
+                                                lazy=False)
+        self.assertTrue(isinstance(response.payload, list))
+
+
+class TestIdentityMap(unittest.TestCase):
+
+    def setUp(self):
+        self.on_change = Mock()
+        self.identity_map = IdentityMap(on_change=self.on_change)
+        podium_api.register_podium_application(
+            'test_id', 'test_secret', identity_map=self.identity_map)
+
+    def tearDown(self):
+        podium_api.unregister_podium_application()
+
+    def device_json(self, name):
+        return {'id': 1, 'URI': '/api/v1/devices/1', 'serial': '123',
+                'name': name, 'private': False}
+
+    def test_same_instance_updated(self):
+        device = get_device_from_json(self.device_json('Car'))
+        same = get_device_from_json(self.device_json('Car'))
+        self.assertTrue(same is device)
+        self.assertFalse(self.on_change.called)
+        renamed = get_device_from_json(self.device_json('Renamed'))
+        self.assertTrue(renamed is device)
+        self.assertEqual(device.name, 'Renamed')
+        self.on_change.assert_called_with(device, ['name'])
+        self.assertEqual(self.identity_map.hits, 2)
+        self.assertEqual(self.identity_map.changes, 1)
+
+    def test_partial_merge_keeps_fields(self):
+        eventdevice = get_eventdevice_from_json(
+            {'id': 1, 'URI': 'u/ed/1', 'channels': ['Speed', 'RPM'],
+             'name': 'Car', 'comp_number': '12'})
+        partial = get_eventdevice_from_json(
+            {'id': 1, 'URI': 'u/ed/1', 'comp_number': '7'})
+        self.assertTrue(partial is eventdevice)
+        self.assertEqual(eventdevice.channels, ['Speed', 'RPM'])
+        self.assertEqual(eventdevice.name, 'Car')
+        self.assertEqual(eventdevice.comp_number, '7')
+        self.on_change.assert_called_with(eventdevice, ['comp_number'])
+
+    def test_weak_references(self):
+        get_device_from_json(self.device_json('Car'))
+        gc.collect()
+        self.assertEqual(len(self.identity_map), 0)
+        self.assertEqual(self.identity_map.get(PodiumDevice,
+                                               '/api/v1/devices/1'), None)
+
+    def test_not_registered(self):
+        podium_api.unregister_podium_application()
+        device = get_device_from_json(self.device_json('Car'))
+        self.assertFalse(device is get_device_from_json(
+            self.device_json('Car')))
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+from urllib.parse import parse_qs, urlparse
+import podium_api
+from podium_api.types.token import PodiumToken
+from podium_api.watcher import LivestreamWatcher
+from mock import Mock
+from tests.fakes import FakeTransport
+
+
+def make_eventdevice(eventdevice_id, name='car'):
+    return {'id': eventdevice_id,
+            'URI': 'test/eventdevices/{}'.format(eventdevice_id),
+            'name': name}
+
+
+def make_page(eventdevices, total):
+    return {'eventdevices': eventdevices, 'total': total}
+
+
+class TestLivestreamWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = FakeTransport()
+        podium_api.register_podium_application('test_id', 'test_secret',
+                                               transport=self.transport)
+        self.token = PodiumToken('test_token', 'test_type', 1)
+        self.change_callback = Mock()
+        self.watcher = LivestreamWatcher(self.token, self.change_callback,
+                                         per_page=2)
+
+    def tearDown(self):
+        podium_api.unregister_podium_application()
+
+    def respond_all(self, eventdevices):
+        # answers the first page, then the remaining pages
+        total = len(eventdevices)
+        self.transport.respond(self.transport.requests[-1], 200,
+                               make_page(eventdevices[:2], total))
+        for req in list(self.transport.requests):
+            start = int(parse_qs(urlparse(req.url).query)['start'][0])
+            if start and req._resp_status is None:
+                self.transport.respond(
+                    req, 200, make_page(eventdevices[start:start + 2], total))
+
+    def last_changes(self):
+        return self.change_callback.call_args[0][0]
+
+    def ids(self, eventdevices):
+        return sorted(e.eventdevice_id for e in eventdevices)
+
+    def test_pages_and_diffs(self):
+        self.watcher.start()
+        self.assertIn('/api/v1/livestreams', self.transport.requests[0].url)
+        self.respond_all([make_eventdevice(i) for i in (1, 2, 3)])
+        self.assertEqual(len(self.transport.requests), 2)
+        changes = self.last_changes()
+        self.assertEqual(self.ids(changes.added), [1, 2, 3])
+        self.assertEqual(sorted(self.watcher.snapshot), [1, 2, 3])
+        self.transport.fire_timers()
+        self.respond_all([make_eventdevice(1), make_eventdevice(3, 'new'),
+                          make_eventdevice(4)])
+        changes = self.last_changes()
+        self.assertEqual(self.ids(changes.added), [4])
+        self.assertEqual(self.ids(changes.removed), [2])
+        self.assertEqual(self.ids(changes.changed), [3])
+
+    def test_no_change_not_reported(self):
+        self.watcher.start()
+        self.respond_all([make_eventdevice(1)])
+        self.transport.fire_timers()
+        self.respond_all([make_eventdevice(1)])
+        self.assertEqual(self.change_callback.call_count, 1)
+        self.assertEqual(self.watcher.polls, 2)
+
+    def test_failure_keeps_snapshot(self):
+        failure_callback = Mock()
+        self.watcher.failure_callback = failure_callback
+        self.watcher.start()
+        self.respond_all([make_eventdevice(1)])
+        self.transport.fire_timers()
+        req = self.transport.requests[-1]
+        req.callbacks['on_error'](req, 'x')
+        self.assertTrue(failure_callback.called)
+        self.assertEqual(list(self.watcher.snapshot), [1])
+        self.assertEqual(len(self.transport.timers), 1)
+
+    def test_poll_in_progress(self):
+        self.assertTrue(self.watcher.poll())
+        self.assertFalse(self.watcher.poll())
+        self.assertEqual(len(self.transport.requests), 1)
+
+    def test_stop(self):
+        self.watcher.start()
+        self.respond_all([])
+        self.watcher.stop()
+        self.assertTrue(self.transport.timers[0].cancelled)
+
+
+if __name__ == '__main__':
+    unittest.main()